@@ -5,13 +5,14 @@ from fastapi import APIRouter, Depends, HTTPException, status, Body
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from google.oauth2 import id_token
-from google.auth.transport import requests
 
 from app.database.db import get_db
 from app.database.models.user import User
 from app.schemas.user import Token, GoogleLogin, PasswordRecovery, PasswordReset
-from app.core.security import verify_password, create_access_token, get_password_hash
+from app.core.security import verify_password_async, create_user_access_token
+from app.core.principal_cache import principal_cache
+from app.core.google_auth import google_verifier
+from app.database.repository.user import UserRepository
 from settings import settings
 
 router = APIRouter(
@@ -30,14 +31,14 @@ async def login_access_token(
     result = await db.execute(select(User).where(User.email == form_data.username))
     user = result.scalars().first()
     
-    if not user or not user.hashed_password or not verify_password(form_data.password, user.hashed_password):
+    if not user or not user.hashed_password or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(status_code=400, detail="Incorrect email or password")
     
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     
     return {
-        "access_token": create_access_token(user.email),
+        "access_token": create_user_access_token(user),
         "token_type": "bearer",
     }
 
@@ -50,15 +51,8 @@ async def google_login(
     Login with Google.
     """
     try:
-        # Verify the token
-        id_info = id_token.verify_oauth2_token(
-            login_data.token, 
-            requests.Request(), 
-            settings.GOOGLE_CLIENT_ID
-        )
-
-        if id_info['iss'] not in ['accounts.google.com', 'https://accounts.google.com']:
-             raise ValueError('Wrong issuer.')
+        # Verify the token (assinatura checada localmente com JWKS em cache)
+        id_info = await google_verifier.verify(login_data.token)
 
         email = id_info.get('email')
         google_id = id_info.get('sub')
@@ -77,28 +71,25 @@ async def google_login(
     
     if not user:
         # Create user if not exists
-        user = User(
+        user = await UserRepository(db).create_from_google(
             email=email,
             full_name=name,
             google_id=google_id,
             avatar_url=picture,
-            is_active=True,
-            # hashed_password is None for Google users
         )
-        db.add(user)
         await db.commit()
-        await db.refresh(user)
     elif not user.google_id:
         # Link existing user to Google if not linked (optional logic)
         user.google_id = google_id
         db.add(user)
         await db.commit()
+        principal_cache.invalidate(user.email)
     
     if not user.is_active:
          raise HTTPException(status_code=400, detail="Inactive user")
 
     return {
-        "access_token": create_access_token(user.email),
+        "access_token": create_user_access_token(user),
         "token_type": "bearer",
     }
 
@@ -119,7 +110,7 @@ async def password_recovery(
 
     # Generate a reset token (reusing access token logic for simplicity in this demo)
     # In a real app, use a separate shorter-lived token specific for resets
-    reset_token = create_access_token(user.email)
+    reset_token = create_user_access_token(user)
     
     # MOCK EMAIL SENDING
     print(f"------------ MOCK EMAIL ------------")
@@ -144,6 +135,7 @@ async def reset_password(
     try:
         payload = jwt.decode(reset_data.token, settings.SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
+        token_version = payload.get("ver")
         if email is None:
              raise HTTPException(status_code=400, detail="Invalid token")
     except Exception:
@@ -155,8 +147,12 @@ async def reset_password(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    user.hashed_password = get_password_hash(reset_data.new_password)
-    db.add(user)
+    # Token de reset é de uso único: a troca de senha incrementa a versão
+    if token_version is not None and token_version != (user.token_version or 0):
+        raise HTTPException(status_code=400, detail="Invalid token")
+
+    await UserRepository(db).set_password(user, reset_data.new_password)
     await db.commit()
+    principal_cache.invalidate(user.email)
 
     return {"msg": "Password updated successfully"}
@@ -1,19 +1,38 @@
 from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Response, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from pydantic import ValidationError
+from sqlalchemy import inspect
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import ALGORITHM
+from app.core.principal_cache import principal_cache
+from app.core.token_denylist import token_denylist
 from app.database.db import get_db
 from app.database.models.user import User
 from app.schemas.user import TokenData
 from settings import settings
 from app.database.repository.user import UserRepository
+from app.database.repository.base import Page
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"/api/auth/login")
 
+def _principal_from_token(token_data: TokenData) -> User:
+    """
+    Monta o principal a partir das claims assinadas (modo stateless).
+
+    A instância é transiente: só id, email, flags e versão estão preenchidos.
+    Use `get_current_user_profile` quando o perfil completo for necessário.
+    """
+    return User(
+        id=token_data.user_id,
+        email=token_data.email,
+        is_active=token_data.is_active,
+        is_superuser=token_data.is_superuser,
+        token_version=token_data.token_version,
+    )
+
 async def get_current_user(
     db: AsyncSession = Depends(get_db),
     token: str = Depends(oauth2_scheme)
@@ -28,14 +47,47 @@ async def get_current_user(
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
-        token_data = TokenData(email=email)
+        token_data = TokenData(
+            email=email,
+            user_id=payload.get("uid"),
+            is_active=payload.get("act"),
+            is_superuser=payload.get("su"),
+            token_version=payload.get("ver"),
+        )
     except (JWTError, ValidationError):
         raise credentials_exception
-    
-    user_repo = UserRepository(db)
-    user = await user_repo.get_by_email(token_data.email)
-    
+
+    # Modo stateless: confia no principal assinado, salvo se a versão estiver
+    # (possivelmente) revogada, caso em que segue o caminho com banco abaixo.
+    stateless = (
+        settings.AUTH_STATELESS_TOKENS
+        and token_data.user_id is not None
+        and token_data.token_version is not None
+    )
+    if stateless and not token_denylist.might_be_revoked(token_data.user_id, token_data.token_version):
+        return _principal_from_token(token_data)
+
+    # Talvez revogado: o snapshot em cache pode ser anterior à revogação,
+    # então a decisão vem sempre do banco.
+    user = None if stateless else principal_cache.get(token_data.email)
+    if (
+        user is not None
+        and token_data.token_version is not None
+        and token_data.token_version != (user.token_version or 0)
+    ):
+        # O cache é por processo: a versão pode ter mudado em outro worker
+        # (troca de senha, desativação). Descarta o snapshot e decide pelo banco.
+        principal_cache.invalidate(token_data.email)
+        user = None
     if user is None:
+        user_repo = UserRepository(db)
+        user = await user_repo.get_by_email(token_data.email)
+        if user is None:
+            raise credentials_exception
+        principal_cache.set(token_data.email, user)
+
+    # Tokens emitidos antes de uma revogação (troca de senha, desativação)
+    if token_data.token_version is not None and token_data.token_version != (user.token_version or 0):
         raise credentials_exception
     return user
 
@@ -45,3 +97,33 @@ async def get_current_active_user(
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
+
+async def get_current_user_profile(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> User:
+    """
+    Usuário autenticado com o perfil completo.
+
+    No modo stateless o principal só carrega as claims do token; aqui o
+    registro é buscado no banco apenas quando necessário.
+    """
+    if not inspect(current_user).transient:
+        return current_user
+    user = await UserRepository(db).get(current_user.id)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    return user
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def paginated(response: Response, page: Page) -> list:
+    """
+    Devolve os itens da página e publica o cursor da próxima no header X-Next-Cursor.
+
+    O corpo continua sendo a lista (compatível com skip/limit); para seguir
+    por keyset, o cliente repete a chamada com `?cursor=<X-Next-Cursor>`.
+    """
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
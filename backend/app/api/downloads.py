@@ -0,0 +1,102 @@
+"""
+Respostas de download por streaming, com suporte a `Range` (RFC 9110).
+
+O arquivo passa do storage para o cliente em pedaços, sem ficar inteiro na
+memória do worker. Um `Range: bytes=...` com um único intervalo vira 206
+Partial Content só com os bytes pedidos (prévias, seek em vídeos); múltiplos
+intervalos ou cabeçalhos malformados são ignorados e o arquivo vai inteiro,
+como a RFC permite. Intervalos fora do arquivo respondem 416.
+"""
+import re
+from typing import Optional
+from urllib.parse import quote
+
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from app.services.async_storage import async_storage
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(Exception):
+    """O intervalo pedido não tem bytes dentro do arquivo."""
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    """
+    Interpreta um cabeçalho Range de intervalo único.
+
+    :param header: Valor do cabeçalho (ou None).
+    :param size: Tamanho do arquivo em bytes.
+    :return: (início, fim) inclusivos, ou None para enviar o arquivo inteiro.
+    :raises RangeNotSatisfiable: Se o intervalo começa depois do fim do arquivo.
+    """
+    if not header:
+        return None
+    match = _RANGE.match(header.strip().replace(" ", ""))
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+    first, last = match.groups()
+    if first == "":
+        # Sufixo: os últimos N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiable()
+        return max(size - length, 0), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable()
+    end = min(int(last), size - 1) if last else size - 1
+    return start, end
+
+
+async def stream_file_response(
+    key: str,
+    file_name: Optional[str],
+    range_header: Optional[str],
+    media_type: Optional[str] = None,
+) -> StreamingResponse:
+    """
+    Resposta de streaming de um arquivo do storage (200 inteiro ou 206 parcial).
+
+    :param key: Chave do arquivo no storage.
+    :param file_name: Nome sugerido no Content-Disposition.
+    :param range_header: Cabeçalho Range da requisição.
+    :param media_type: Content-Type; sem ele, usa o do storage.
+    :return: StreamingResponse com Accept-Ranges, Content-Length e, se parcial, Content-Range.
+    """
+    # Tamanho real do objeto: Content-Range e Content-Length dependem dele
+    metadata = await async_storage.get_file_metadata(key)
+    size = metadata["size"]
+    try:
+        byte_range = parse_range(range_header, size)
+    except RangeNotSatisfiable:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Intervalo solicitado fora do arquivo",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+
+    headers = {"Accept-Ranges": "bytes"}
+    if file_name:
+        headers["Content-Disposition"] = f"inline; filename*=UTF-8''{quote(file_name)}"
+    if byte_range is None:
+        chunks = await async_storage.open_stream(key)
+        headers["Content-Length"] = str(size)
+        status_code = status.HTTP_200_OK
+    else:
+        start, end = byte_range
+        chunks = await async_storage.open_stream(key, start, end)
+        headers["Content-Length"] = str(end - start + 1)
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+
+    return StreamingResponse(
+        chunks,
+        status_code=status_code,
+        media_type=media_type or metadata.get("content_type") or "application/octet-stream",
+        headers=headers,
+    )
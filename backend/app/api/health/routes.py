@@ -0,0 +1,26 @@
+from typing import Any
+from fastapi import APIRouter, Response, status
+
+from app.database.warmup import readiness
+
+router = APIRouter(
+    prefix="/health",
+    tags=["Health"],
+    include_in_schema=False,
+)
+
+@router.get("/live")
+async def liveness() -> Any:
+    """
+    O processo está de pé (não consulta o banco).
+    """
+    return {"status": "ok"}
+
+@router.get("/ready")
+async def readiness_probe(response: Response) -> Any:
+    """
+    Pronto para receber tráfego: 503 enquanto os pools de conexão aquecem.
+    """
+    if not readiness.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return readiness.status()
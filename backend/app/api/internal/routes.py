@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import hmac
+from typing import Any, Optional
+from fastapi import APIRouter, Header, HTTPException, status
+
+from app.core.metrics import registry
+from app.database.pool_metrics import pool_status
+from app.database.query_cache import query_cache
+from app.database.slow_query import slow_query_log
+from app.database.warmup import readiness
+from app.services.signed_urls import signed_urls
+from settings import settings
+
+router = APIRouter(
+    prefix="/internal",
+    tags=["Internal"],
+    include_in_schema=False,
+)
+
+def _check_token(x_metrics_token: Optional[str]) -> None:
+    # Sem token configurado, os endpoints internos não existem (fail closed)
+    if not settings.INTERNAL_METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not x_metrics_token or not hmac.compare_digest(
+        x_metrics_token.encode(), settings.INTERNAL_METRICS_TOKEN.encode()
+    ):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Acesso negado")
+
+@router.get("/metrics")
+async def get_metrics(
+    x_metrics_token: Optional[str] = Header(default=None),
+) -> Any:
+    """
+    Métricas in-process deste worker (pool de conexões, caches, hashing...).
+    """
+    _check_token(x_metrics_token)
+
+    return {
+        "pools": pool_status(),
+        "query_cache": query_cache.stats(),
+        "readiness": readiness.status(),
+        "signed_urls": signed_urls.stats(),
+        "metrics": registry.snapshot(),
+    }
+
+@router.get("/slow-queries")
+async def get_slow_queries(
+    x_metrics_token: Optional[str] = Header(default=None),
+) -> Any:
+    """
+    Planos EXPLAIN (ANALYZE, BUFFERS) capturados das queries lentas deste worker.
+    """
+    _check_token(x_metrics_token)
+    return {"plans": slow_query_log.recent()}
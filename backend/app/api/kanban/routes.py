@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, status, Depends, HTTPException
+from fastapi import APIRouter, status, Depends, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.database.db import get_db
-from app.api.deps import get_current_active_user
+from app.database.db import get_read_db
+from app.database.unit_of_work import UnitOfWork, get_uow
+from app.api.deps import get_current_active_user, paginated
 from app.database.models.user import User
 from app.database.models.workspace import Workspace
 from app.database.models.kanban_board import KanbanBoard
@@ -32,7 +33,7 @@ router = APIRouter(
 
 async def _get_workspace_or_404(workspace_id: int, db: AsyncSession) -> Workspace:
     repo = WorkspaceRepository(db)
-    workspace = await repo.get(workspace_id)
+    workspace = await repo.get_cached(workspace_id)
     if not workspace:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Workspace não encontrado")
     return workspace
@@ -50,65 +51,60 @@ async def _get_board_or_404(workspace_id: int, board_id: int, db: AsyncSession)
 async def create_kanban_board(
     workspace_id: int,
     kanban_in: KanbanBoardCreate,
-    db: AsyncSession = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow, scope="function"),
     current_user: User = Depends(get_current_active_user),
 ):
-    await _get_workspace_or_404(workspace_id, db)
-    board = KanbanBoard(
+    await _get_workspace_or_404(workspace_id, uow.session)
+    if kanban_in.columns:
+        columns_count = len(kanban_in.columns)
+    else:
+        columns_count = kanban_in.columns_count or 0
+    board = await KanbanBoardRepository(uow.session).create(KanbanBoard(
         workspace_id=workspace_id,
         name=kanban_in.name,
         description=kanban_in.description,
         status=kanban_in.status or KanbanStatus.ACTIVE,
-        columns_count=0,
+        columns_count=columns_count,
         cards_count=kanban_in.cards_count or 0,
         created_by_id=current_user.id,
         updated_by_id=current_user.id,
-    )
-    db.add(board)
-    await db.commit()
-    await db.refresh(board)
+    ))
     if kanban_in.columns:
-        columns = []
-        for column_in in kanban_in.columns:
-            columns.append(
-                KanbanColumn(
-                    board_id=board.id,
-                    name=column_in.name,
-                    description=column_in.description,
-                    color=column_in.color,
-                    position=column_in.position,
-                    is_required=bool(column_in.is_required),
-                )
-            )
-        db.add_all(columns)
-        board.columns_count = len(columns)
-        await db.commit()
-        await db.refresh(board)
-    elif kanban_in.columns_count is not None:
-        board.columns_count = kanban_in.columns_count
-        await db.commit()
-        await db.refresh(board)
+        await KanbanColumnRepository(uow.session).bulk_create([
+            {
+                "board_id": board.id,
+                "name": column_in.name,
+                "description": column_in.description,
+                "color": column_in.color,
+                "position": column_in.position,
+                "is_required": bool(column_in.is_required),
+            }
+            for column_in in kanban_in.columns
+        ])
     return board
 
 
 @router.get("/", response_model=List[KanbanBoardResponse])
 async def list_kanban_boards(
     workspace_id: int,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user),
 ):
     await _get_workspace_or_404(workspace_id, db)
     repo = KanbanBoardRepository(db)
-    return await repo.get_by_workspace(workspace_id=workspace_id, skip=skip, limit=limit)
+    page = await repo.get_page_by_workspace(workspace_id=workspace_id, cursor=cursor, skip=skip, limit=limit)
+    return paginated(response, page)
 
 
 @router.get("/{board_id}", response_model=KanbanBoardResponse)
 async def get_kanban_board(
     workspace_id: int,
     board_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user),
 ):
     await _get_workspace_or_404(workspace_id, db)
@@ -121,19 +117,16 @@ async def update_kanban_board(
     workspace_id: int,
     board_id: int,
     kanban_in: KanbanBoardUpdate,
-    db: AsyncSession = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow, scope="function"),
     current_user: User = Depends(get_current_active_user),
 ):
-    await _get_workspace_or_404(workspace_id, db)
-    board = await _get_board_or_404(workspace_id, board_id, db)
-
+    await _get_workspace_or_404(workspace_id, uow.session)
     data = kanban_in.model_dump(exclude_unset=True)
-    for key, value in data.items():
-        if hasattr(board, key):
-            setattr(board, key, value)
-    board.updated_by_id = current_user.id
-    await db.commit()
-    await db.refresh(board)
+    data["updated_by_id"] = current_user.id
+    repo = KanbanBoardRepository(uow.session)
+    board = await repo.update_in_workspace(workspace_id=workspace_id, board_id=board_id, data=data)
+    if not board:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Quadro não encontrado")
     return board
 
 
@@ -141,13 +134,12 @@ async def update_kanban_board(
 async def delete_kanban_board(
     workspace_id: int,
     board_id: int,
-    db: AsyncSession = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow, scope="function"),
     current_user: User = Depends(get_current_active_user),
 ):
-    await _get_workspace_or_404(workspace_id, db)
-    board = await _get_board_or_404(workspace_id, board_id, db)
-    await db.delete(board)
-    await db.commit()
+    await _get_workspace_or_404(workspace_id, uow.session)
+    board = await _get_board_or_404(workspace_id, board_id, uow.session)
+    await uow.delete(board)
     return None
 
 
@@ -155,13 +147,13 @@ async def delete_kanban_board(
 async def list_columns(
     workspace_id: int,
     board_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user),
 ):
     await _get_workspace_or_404(workspace_id, db)
     await _get_board_or_404(workspace_id, board_id, db)
     repo = KanbanColumnRepository(db)
-    return await repo.get_by_board(board_id=board_id)
+    return await repo.get_by_board_cached(board_id=board_id)
 
 
 @router.post("/{board_id}/columns", response_model=KanbanColumnResponse, status_code=status.HTTP_201_CREATED)
@@ -169,23 +161,20 @@ async def create_column(
     workspace_id: int,
     board_id: int,
     column_in: KanbanColumnCreate,
-    db: AsyncSession = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow, scope="function"),
     current_user: User = Depends(get_current_active_user),
 ):
-    await _get_workspace_or_404(workspace_id, db)
-    board = await _get_board_or_404(workspace_id, board_id, db)
-    column = KanbanColumn(
+    await _get_workspace_or_404(workspace_id, uow.session)
+    await _get_board_or_404(workspace_id, board_id, uow.session)
+    column = await KanbanColumnRepository(uow.session).create(KanbanColumn(
         board_id=board_id,
         name=column_in.name,
         description=column_in.description,
         color=column_in.color,
         position=column_in.position,
         is_required=bool(column_in.is_required),
-    )
-    db.add(column)
-    board.columns_count = (board.columns_count or 0) + 1
-    await db.commit()
-    await db.refresh(column)
+    ))
+    await KanbanBoardRepository(uow.session).add_to_counters(board_id, columns_count=1)
     return column
 
 
@@ -195,22 +184,16 @@ async def update_column(
     board_id: int,
     column_id: int,
     column_in: KanbanColumnUpdate,
-    db: AsyncSession = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow, scope="function"),
     current_user: User = Depends(get_current_active_user),
 ):
-    await _get_workspace_or_404(workspace_id, db)
-    await _get_board_or_404(workspace_id, board_id, db)
-    repo = KanbanColumnRepository(db)
-    column = await repo.get_in_board(board_id=board_id, column_id=column_id)
+    await _get_workspace_or_404(workspace_id, uow.session)
+    await _get_board_or_404(workspace_id, board_id, uow.session)
+    repo = KanbanColumnRepository(uow.session)
+    data = column_in.model_dump(exclude_unset=True)
+    column = await repo.update_in_board(board_id=board_id, column_id=column_id, data=data)
     if not column:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Coluna não encontrada")
-
-    data = column_in.model_dump(exclude_unset=True)
-    for key, value in data.items():
-        if hasattr(column, key):
-            setattr(column, key, value)
-    await db.commit()
-    await db.refresh(column)
     return column
 
 
@@ -219,16 +202,15 @@ async def delete_column(
     workspace_id: int,
     board_id: int,
     column_id: int,
-    db: AsyncSession = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow, scope="function"),
     current_user: User = Depends(get_current_active_user),
 ):
-    await _get_workspace_or_404(workspace_id, db)
-    board = await _get_board_or_404(workspace_id, board_id, db)
-    repo = KanbanColumnRepository(db)
+    await _get_workspace_or_404(workspace_id, uow.session)
+    await _get_board_or_404(workspace_id, board_id, uow.session)
+    repo = KanbanColumnRepository(uow.session)
     column = await repo.get_in_board(board_id=board_id, column_id=column_id)
     if not column:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Coluna não encontrada")
-    await db.delete(column)
-    board.columns_count = max((board.columns_count or 1) - 1, 0)
-    await db.commit()
+    await uow.delete(column)
+    await KanbanBoardRepository(uow.session).add_to_counters(board_id, columns_count=-1)
     return None
@@ -1,8 +1,7 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, status, Depends, HTTPException
+from fastapi import APIRouter, status, Depends, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from app.database.repository.organization import OrganizationRepository, OrganizationMemberRepository
 from app.database.repository.user import UserRepository
 from app.database.models.organization import Organization, OrganizationMember
@@ -18,8 +17,8 @@ from app.schemas.organization import (
     OrganizationWithUserRole,
     OrganizationWithUserRoleDetailed
 )
-from app.api.deps import get_current_active_user
-from app.database.db import get_db
+from app.api.deps import get_current_active_user, paginated
+from app.database.db import get_db, get_read_db
 from app.database.models.user import User
 from app.database.enum import OrgRole
 
@@ -57,7 +56,7 @@ async def create_organization(
 @router.get("/{organization_id}", response_model=OrganizationResponse)
 async def get_organization(
     organization_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user),
 ):
     repo = OrganizationRepository(db)
@@ -68,9 +67,11 @@ async def get_organization(
 
 @router.get("/", response_model=list[OrganizationResponse])
 async def list_organizations(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """
@@ -78,8 +79,8 @@ async def list_organizations(
     Use /me para listar apenas as organizações do usuário autenticado.
     """
     repo = OrganizationRepository(db)
-    orgs = await repo.get_all(skip=skip, limit=limit)
-    return orgs
+    page = await repo.get_page(cursor=cursor, skip=skip, limit=limit)
+    return paginated(response, page)
 
 @router.put("/{organization_id}", response_model=OrganizationResponse)
 async def update_organization(
@@ -124,9 +125,11 @@ async def delete_organization(
 @router.get("/{organization_id}/members", response_model=list[OrganizationMemberDetail])
 async def list_organization_members_by_id(
     organization_id: int,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """
@@ -140,14 +143,16 @@ async def list_organization_members_by_id(
     if not current_member:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Você não é membro desta organização")
 
-    members = await member_repo.get_by_organization(organization_id, skip=skip, limit=limit)
-    return members
+    page = await member_repo.get_page_by_organization(organization_id, cursor=cursor, skip=skip, limit=limit)
+    return paginated(response, page)
 
 @router.get("/me", response_model=list[OrganizationWithUserRole])
 async def list_user_organizations(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """
@@ -158,32 +163,28 @@ async def list_user_organizations(
     - ADMIN: Pode criar workspaces e convidar membros
     - MEMBER: Acesso básico, só entra onde for convidado
     """
-    # Query que busca as organizações com o papel do usuário
-    statement = (
-        select(Organization, OrganizationMember.role)
-        .join(OrganizationMember, Organization.id == OrganizationMember.organization_id)
-        .where(OrganizationMember.user_id == current_user.id)
-        .offset(skip)
-        .limit(limit)
+    # Busca as organizações com o papel do usuário
+    page = await OrganizationMemberRepository(db).get_page_of_organizations_by_user(
+        current_user.id, cursor=cursor, skip=skip, limit=limit
     )
     
-    result = await db.execute(statement)
-    rows = result.all()
-    
     # Transformar os resultados em objetos com o role incluído
     organizations_with_role = []
-    for org, role in rows:
+    for org, role in page.items:
         # Adicionar o role como atributo do objeto Organization
         org.user_role = role
         organizations_with_role.append(org)
     
-    return organizations_with_role
+    page.items = organizations_with_role
+    return paginated(response, page)
 
 @router.get("/me/detailed", response_model=list[OrganizationWithUserRoleDetailed])
 async def list_user_organizations_detailed(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """
@@ -193,27 +194,21 @@ async def list_user_organizations_detailed(
     - is_owner: True se o usuário é OWNER
     - is_admin: True se o usuário é ADMIN ou OWNER
     """
-    # Query que busca as organizações com o papel do usuário
-    statement = (
-        select(Organization, OrganizationMember.role)
-        .join(OrganizationMember, Organization.id == OrganizationMember.organization_id)
-        .where(OrganizationMember.user_id == current_user.id)
-        .offset(skip)
-        .limit(limit)
+    # Busca as organizações com o papel do usuário
+    page = await OrganizationMemberRepository(db).get_page_of_organizations_by_user(
+        current_user.id, cursor=cursor, skip=skip, limit=limit
     )
     
-    result = await db.execute(statement)
-    rows = result.all()
-    
     # Transformar os resultados com informações adicionais
     organizations_with_details = []
-    for org, role in rows:
+    for org, role in page.items:
         org.user_role = role
         org.is_owner = role == OrgRole.OWNER
         org.is_admin = role in [OrgRole.ADMIN, OrgRole.OWNER]
         organizations_with_details.append(org)
     
-    return organizations_with_details
+    page.items = organizations_with_details
+    return paginated(response, page)
 
 
 
@@ -281,7 +276,7 @@ async def invite_member(
 
 @router.get("/members", response_model=list[OrganizationMemberResponse])
 async def list_organization_members(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user),
 ):
     repo = OrganizationMemberRepository(db)
@@ -1,14 +1,19 @@
 """
 Rotas estendidas para Skills (Knowledge, Materials, Config, Upload)
 """
-from fastapi import APIRouter, status, Depends, HTTPException, UploadFile, File
+import asyncio
+
+from fastapi import APIRouter, BackgroundTasks, status, Depends, HTTPException, UploadFile, File, Header
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import List
-from datetime import datetime, timedelta
+from typing import List, Optional
 
 from app.api.deps import get_current_active_user
-from app.database.db import get_db
+from app.core.logging import get_logger
+from app.api.downloads import stream_file_response
+from app.database.db import get_db, get_read_db
+from app.database.unit_of_work import UnitOfWork, get_uow
 from app.database.models.user import User
 from app.database.models.skill import (
     Skill,
@@ -20,35 +25,86 @@ from app.schemas.skill import (
     SkillKnowledgeCreate,
     SkillKnowledgeUpdate,
     SkillKnowledgeResponse,
+    SkillKnowledgeSummaryResponse,
     SkillMaterialCreate,
     SkillMaterialUpdate,
     SkillMaterialResponse,
+    SkillMaterialSummaryResponse,
     SkillRetrievalConfigCreate,
     SkillRetrievalConfigUpdate,
     SkillRetrievalConfigResponse,
     SkillValidationResponse,
     FileUploadResponse,
+    FileHashLookupRequest,
     SkillResponse,
     SkillCreate
 )
 from app.database.enum import ProcessingStatus
-from app.services.storage import storage_service
+from app.database.repository.skill import (
+    SkillRepository,
+    SkillKnowledgeRepository,
+    SkillMaterialRepository,
+    SkillRetrievalConfigRepository,
+)
+from app.database.models.storage_object import StorageObject
+from app.database.repository.storage_object import StorageObjectRepository
+from app.database.repository.workspace import WorkspaceMemberRepository
+from app.services.async_storage import StorageTimeoutError, async_storage
+from app.services.signed_urls import signed_urls
+
 
+logger = get_logger(__name__)
 
 router = APIRouter(
     prefix="/skill",
     tags=["skill"]
 )
 
+# ============= Referências a arquivos =============
+
+async def _acquire_file(db: AsyncSession, skill: Skill, storage_key: Optional[str]) -> None:
+    """Conta uma referência ao objeto deduplicado da chave (chaves anteriores à deduplicação não contam)"""
+    if not storage_key:
+        return
+    acquired = await StorageObjectRepository(db).acquire(skill.workspace_id, storage_key)
+    if not acquired and async_storage.is_content_key(storage_key):
+        # O objeto perdeu a última referência e foi removido depois do upload
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Arquivo não está mais disponível; envie-o novamente")
+
+
+async def _release_file(db: AsyncSession, storage_key: Optional[str]) -> list[str]:
+    """Tira a referência à chave; retorna as chaves a apagar do storage depois do commit"""
+    if not storage_key:
+        return []
+    collect = await StorageObjectRepository(db).release(storage_key)
+    # None: arquivo anterior à deduplicação, de uso exclusivo deste registro
+    return [] if collect is False else [storage_key]
+
+
+async def _ensure_skill_access(db: AsyncSession, skill_id: int, user: User) -> None:
+    """403 se o usuário não é membro do workspace da skill (nem da organização dele)"""
+    workspace_id = await db.scalar(select(Skill.workspace_id).where(Skill.id == skill_id))
+    if workspace_id is None or not await WorkspaceMemberRepository(db).has_access(workspace_id, user.id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Você não é membro deste workspace")
+
+
+async def _delete_files(keys: list[str]) -> None:
+    """Apaga arquivos do storage em paralelo (background, após o commit)"""
+    results = await asyncio.gather(*(async_storage.delete_file(key) for key in keys), return_exceptions=True)
+    for key, result in zip(keys, results):
+        if isinstance(result, Exception):
+            logger.warning(f"Falha ao apagar arquivo do storage ({key}): {result}")
+
+
 # ============= Knowledge Routes =============
 @router.post("", response_model=SkillResponse, status_code=status.HTTP_201_CREATED)
 async def create_skill(
     skill_in: SkillCreate,
-    db: AsyncSession = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow, scope="function"),
     current_user: User = Depends(get_current_active_user),
 ):
     """Criar uma nova skill"""
-    skill = Skill(
+    skill = await SkillRepository(uow.session).create(Skill(
         name=skill_in.name,
         slug=skill_in.slug,
         description=skill_in.description,
@@ -58,10 +114,7 @@ async def create_skill(
         workspace_id=skill_in.workspace_id,
         created_by_id=current_user.id,
         updated_by_id=current_user.id
-    )
-    db.add(skill)
-    await db.commit()
-    await db.refresh(skill)
+    ))
     return skill
 
 # ============= Knowledge Routes =============
@@ -70,18 +123,21 @@ async def create_skill(
 async def create_knowledge(
     skill_id: int,
     knowledge_in: SkillKnowledgeCreate,
-    db: AsyncSession = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow, scope="function"),
     current_user: User = Depends(get_current_active_user),
 ):
     """Adicionar fonte de conhecimento"""
     # Verificar se skill existe
-    result = await db.execute(select(Skill).where(Skill.id == skill_id))
+    result = await uow.session.execute(select(Skill).where(Skill.id == skill_id))
     skill = result.scalar_one_or_none()
     if not skill:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Skill não encontrada")
     
+    await _ensure_skill_access(uow.session, skill_id, current_user)
+    await _acquire_file(uow.session, skill, knowledge_in.s3_key)
+    
     # Criar knowledge
-    knowledge = SkillKnowledge(
+    knowledge = await SkillKnowledgeRepository(uow.session).create(SkillKnowledge(
         skill_id=skill_id,
         source_type=knowledge_in.source_type,
         name=knowledge_in.name,
@@ -96,11 +152,7 @@ async def create_knowledge(
         file_hash=knowledge_in.file_hash,
         file_extension=knowledge_in.file_extension,
         processing_status=ProcessingStatus.PENDING
-    )
-    
-    db.add(knowledge)
-    await db.commit()
-    await db.refresh(knowledge)
+    ))
     
     # TODO: Disparar job assíncrono para processar documento
     # process_document_async.delay(knowledge.id)
@@ -108,23 +160,19 @@ async def create_knowledge(
     return knowledge
 
 
-@router.get("/{skill_id}/knowledge", response_model=List[SkillKnowledgeResponse])
+@router.get("/{skill_id}/knowledge", response_model=List[SkillKnowledgeSummaryResponse])
 async def list_knowledge(
     skill_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Listar fontes de conhecimento de uma skill"""
-    result = await db.execute(
-        select(SkillKnowledge).where(SkillKnowledge.skill_id == skill_id)
-    )
-    knowledges = result.scalars().all()
-    return knowledges
+    """Listar fontes de conhecimento de uma skill (sem o conteúdo; ver o detalhe)"""
+    return await SkillKnowledgeRepository(db).list_by_skill(skill_id)
 
 
 @router.get("/knowledge/{knowledge_id}", response_model=SkillKnowledgeResponse)
 async def get_knowledge(
     knowledge_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Obter detalhes de uma fonte de conhecimento"""
     result = await db.execute(
@@ -136,54 +184,64 @@ async def get_knowledge(
     return knowledge
 
 
+@router.get("/knowledge/{knowledge_id}/download")
+async def download_knowledge(
+    knowledge_id: int,
+    range_header: Optional[str] = Header(default=None, alias="Range"),
+    # Escopo "function": a conexão volta ao pool antes do streaming começar
+    db: AsyncSession = Depends(get_read_db, scope="function"),
+    current_user: User = Depends(get_current_active_user),
+    # Mesma sessão usada pela autenticação (cache de dependências da requisição)
+    auth_db: AsyncSession = Depends(get_db),
+) -> StreamingResponse:
+    """Baixar o arquivo de uma fonte de conhecimento (streaming, aceita Range)"""
+    knowledge = await SkillKnowledgeRepository(db).get(knowledge_id)
+    if not knowledge:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Knowledge não encontrado")
+    await _ensure_skill_access(db, knowledge.skill_id, current_user)
+    if not knowledge.s3_key:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Knowledge não possui arquivo")
+    # A autenticação pode ter consultado o banco: devolve a conexão antes do streaming
+    await auth_db.close()
+    return await stream_file_response(knowledge.s3_key, knowledge.file_name, range_header, knowledge.file_mime_type)
+
+
 @router.patch("/knowledge/{knowledge_id}", response_model=SkillKnowledgeResponse)
 async def update_knowledge(
     knowledge_id: int,
     knowledge_in: SkillKnowledgeUpdate,
-    db: AsyncSession = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow, scope="function"),
     current_user: User = Depends(get_current_active_user),
 ):
     """Atualizar fonte de conhecimento"""
-    result = await db.execute(
-        select(SkillKnowledge).where(SkillKnowledge.id == knowledge_id)
-    )
-    knowledge = result.scalar_one_or_none()
+    update_data = knowledge_in.model_dump(exclude_unset=True)
+    knowledge = await SkillKnowledgeRepository(uow.session).update(knowledge_id, update_data)
     if not knowledge:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Knowledge não encontrado")
     
-    # Atualizar campos
-    update_data = knowledge_in.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(knowledge, field, value)
-    
-    await db.commit()
-    await db.refresh(knowledge)
     return knowledge
 
 
 @router.delete("/knowledge/{knowledge_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_knowledge(
     knowledge_id: int,
-    db: AsyncSession = Depends(get_db),
+    background_tasks: BackgroundTasks,
+    uow: UnitOfWork = Depends(get_uow, scope="function"),
     current_user: User = Depends(get_current_active_user),
 ):
     """Deletar fonte de conhecimento"""
-    result = await db.execute(
+    result = await uow.session.execute(
         select(SkillKnowledge).where(SkillKnowledge.id == knowledge_id)
     )
     knowledge = result.scalar_one_or_none()
     if not knowledge:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Knowledge não encontrado")
     
-    # Deletar arquivo do S3 se existir
-    if knowledge.s3_key:
-        try:
-            storage_service.delete_file(knowledge.s3_key)
-        except Exception as e:
-            print(f"Erro ao deletar arquivo do S3: {e}")
-    
-    await db.delete(knowledge)
-    await db.commit()
+    # O arquivo só sai do S3 sem outras referências e depois do commit
+    keys = await _release_file(uow.session, knowledge.s3_key)
+    await uow.delete(knowledge)
+    if keys:
+        background_tasks.add_task(_delete_files, keys)
 
 
 # ============= Material Routes =============
@@ -192,18 +250,21 @@ async def delete_knowledge(
 async def create_material(
     skill_id: int,
     material_in: SkillMaterialCreate,
-    db: AsyncSession = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow, scope="function"),
     current_user: User = Depends(get_current_active_user),
 ):
     """Adicionar material de apoio"""
     # Verificar se skill existe
-    result = await db.execute(select(Skill).where(Skill.id == skill_id))
+    result = await uow.session.execute(select(Skill).where(Skill.id == skill_id))
     skill = result.scalar_one_or_none()
     if not skill:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Skill não encontrada")
     
+    await _ensure_skill_access(uow.session, skill_id, current_user)
+    await _acquire_file(uow.session, skill, material_in.s3_key)
+    
     # Criar material
-    material = SkillMaterial(
+    material = await SkillMaterialRepository(uow.session).create(SkillMaterial(
         skill_id=skill_id,
         material_type=material_in.material_type,
         name=material_in.name,
@@ -223,110 +284,110 @@ async def create_material(
         height=material_in.height,
         page_count=material_in.page_count,
         thumbnail_s3_key=material_in.thumbnail_s3_key
-    )
-    
-    db.add(material)
-    await db.commit()
-    await db.refresh(material)
+    ))
     
     return material
 
 
-@router.get("/{skill_id}/materials", response_model=List[SkillMaterialResponse])
+@router.get("/{skill_id}/materials", response_model=List[SkillMaterialSummaryResponse])
 async def list_materials(
     skill_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Listar materiais de uma skill"""
-    result = await db.execute(
-        select(SkillMaterial).where(SkillMaterial.skill_id == skill_id)
-    )
-    materials = result.scalars().all()
-    return materials
+    """Listar materiais de uma skill (URLs pré-assinadas em lote, pelo cache)"""
+    materials = await SkillMaterialRepository(db).list_by_skill(skill_id)
+    urls = await signed_urls.sign_many(material.s3_key for material in materials)
+    # Campos montados à mão: as colunas fora de LIST_COLUMNS estão com raiseload
+    fields = SkillMaterialSummaryResponse.model_fields.keys() - {"s3_presigned_url", "presigned_url_expires_at"}
+    items = []
+    for material in materials:
+        url, expires_at = urls.get(material.s3_key, (None, None))
+        items.append(SkillMaterialSummaryResponse(
+            **{name: getattr(material, name) for name in fields},
+            s3_presigned_url=url,
+            presigned_url_expires_at=expires_at,
+        ))
+    return items
 
 
 @router.get("/materials/{material_id}", response_model=SkillMaterialResponse)
 async def get_material(
     material_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Obter detalhes de um material"""
-    result = await db.execute(
-        select(SkillMaterial).where(SkillMaterial.id == material_id)
-    )
-    material = result.scalar_one_or_none()
+    material = await SkillMaterialRepository(db).get(material_id)
     if not material:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Material não encontrado")
     
-    # Gerar URL pré-assinada se necessário
+    # URL pré-assinada do cache em memória (nada é gravado no banco)
+    response = SkillMaterialResponse.model_validate(material)
     if material.s3_key:
-        # Verificar se URL está expirada ou não existe
-        if not material.s3_presigned_url or not material.presigned_url_expires_at or material.presigned_url_expires_at < datetime.utcnow():
-            # Gerar nova URL pré-assinada (válida por 1 hora)
-            presigned_url = storage_service.generate_presigned_url(material.s3_key, expiration=3600)
-            material.s3_presigned_url = presigned_url
-            material.presigned_url_expires_at = datetime.utcnow() + timedelta(hours=1)
-            await db.commit()
-            await db.refresh(material)
-    
-    return material
+        response.s3_presigned_url, response.presigned_url_expires_at = await signed_urls.sign(material.s3_key)
+    return response
+
+
+@router.get("/materials/{material_id}/download")
+async def download_material(
+    material_id: int,
+    range_header: Optional[str] = Header(default=None, alias="Range"),
+    # Escopo "function": a conexão volta ao pool antes do streaming começar
+    db: AsyncSession = Depends(get_read_db, scope="function"),
+    current_user: User = Depends(get_current_active_user),
+    # Mesma sessão usada pela autenticação (cache de dependências da requisição)
+    auth_db: AsyncSession = Depends(get_db),
+) -> StreamingResponse:
+    """Baixar o arquivo de um material (streaming, aceita Range para prévias e seek em vídeos)"""
+    material = await SkillMaterialRepository(db).get(material_id)
+    if not material:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Material não encontrado")
+    await _ensure_skill_access(db, material.skill_id, current_user)
+    if not material.s3_key:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Material não possui arquivo")
+    # A autenticação pode ter consultado o banco: devolve a conexão antes do streaming
+    await auth_db.close()
+    return await stream_file_response(material.s3_key, material.file_name, range_header, material.file_mime_type)
 
 
 @router.patch("/materials/{material_id}", response_model=SkillMaterialResponse)
 async def update_material(
     material_id: int,
     material_in: SkillMaterialUpdate,
-    db: AsyncSession = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow, scope="function"),
     current_user: User = Depends(get_current_active_user),
 ):
     """Atualizar material"""
-    result = await db.execute(
-        select(SkillMaterial).where(SkillMaterial.id == material_id)
-    )
-    material = result.scalar_one_or_none()
+    update_data = material_in.model_dump(exclude_unset=True)
+    material = await SkillMaterialRepository(uow.session).update(material_id, update_data)
     if not material:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Material não encontrado")
     
-    # Atualizar campos
-    update_data = material_in.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(material, field, value)
-    
-    await db.commit()
-    await db.refresh(material)
     return material
 
 
 @router.delete("/materials/{material_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_material(
     material_id: int,
-    db: AsyncSession = Depends(get_db),
+    background_tasks: BackgroundTasks,
+    uow: UnitOfWork = Depends(get_uow, scope="function"),
     current_user: User = Depends(get_current_active_user),
 ):
     """Deletar material"""
-    result = await db.execute(
+    result = await uow.session.execute(
         select(SkillMaterial).where(SkillMaterial.id == material_id)
     )
     material = result.scalar_one_or_none()
     if not material:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Material não encontrado")
     
-    # Deletar arquivo do S3
-    if material.s3_key:
-        try:
-            storage_service.delete_file(material.s3_key)
-        except Exception as e:
-            print(f"Erro ao deletar arquivo do S3: {e}")
-    
-    # Deletar thumbnail se existir
+    # O arquivo só sai do S3 sem outras referências; a thumbnail é exclusiva do material.
+    # Ambos são apagados em paralelo, depois do commit
+    keys = await _release_file(uow.session, material.s3_key)
     if material.thumbnail_s3_key:
-        try:
-            storage_service.delete_file(material.thumbnail_s3_key)
-        except Exception as e:
-            print(f"Erro ao deletar thumbnail do S3: {e}")
-    
-    await db.delete(material)
-    await db.commit()
+        keys.append(material.thumbnail_s3_key)
+    await uow.delete(material)
+    if keys:
+        background_tasks.add_task(_delete_files, keys)
 
 
 # ============= Retrieval Config Routes =============
@@ -335,18 +396,18 @@ async def delete_material(
 async def create_retrieval_config(
     skill_id: int,
     config_in: SkillRetrievalConfigCreate,
-    db: AsyncSession = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow, scope="function"),
     current_user: User = Depends(get_current_active_user),
 ):
     """Criar configuração de recuperação"""
     # Verificar se skill existe
-    result = await db.execute(select(Skill).where(Skill.id == skill_id))
+    result = await uow.session.execute(select(Skill).where(Skill.id == skill_id))
     skill = result.scalar_one_or_none()
     if not skill:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Skill não encontrada")
     
     # Verificar se já existe configuração
-    result = await db.execute(
+    result = await uow.session.execute(
         select(SkillRetrievalConfig).where(SkillRetrievalConfig.skill_id == skill_id)
     )
     existing_config = result.scalar_one_or_none()
@@ -354,7 +415,7 @@ async def create_retrieval_config(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Configuração já existe")
     
     # Criar configuração
-    config = SkillRetrievalConfig(
+    config = await SkillRetrievalConfigRepository(uow.session).create(SkillRetrievalConfig(
         skill_id=skill_id,
         parent_chunk_size=config_in.parent_chunk_size,
         child_chunk_size=config_in.child_chunk_size,
@@ -365,11 +426,7 @@ async def create_retrieval_config(
         embedding_dimensions=config_in.embedding_dimensions,
         qdrant_collection_name=config_in.qdrant_collection_name,
         advanced_config=config_in.advanced_config
-    )
-    
-    db.add(config)
-    await db.commit()
-    await db.refresh(config)
+    ))
     
     return config
 
@@ -377,13 +434,10 @@ async def create_retrieval_config(
 @router.get("/{skill_id}/retrieval-config", response_model=SkillRetrievalConfigResponse)
 async def get_retrieval_config(
     skill_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Obter configuração de recuperação"""
-    result = await db.execute(
-        select(SkillRetrievalConfig).where(SkillRetrievalConfig.skill_id == skill_id)
-    )
-    config = result.scalar_one_or_none()
+    config = await SkillRetrievalConfigRepository(db).get_by_skill_cached(skill_id)
     if not config:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Configuração não encontrada")
     return config
@@ -393,107 +447,131 @@ async def get_retrieval_config(
 async def update_retrieval_config(
     skill_id: int,
     config_in: SkillRetrievalConfigUpdate,
-    db: AsyncSession = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow, scope="function"),
     current_user: User = Depends(get_current_active_user),
 ):
     """Atualizar configuração de recuperação"""
-    result = await db.execute(
-        select(SkillRetrievalConfig).where(SkillRetrievalConfig.skill_id == skill_id)
-    )
-    config = result.scalar_one_or_none()
+    update_data = config_in.model_dump(exclude_unset=True)
+    config = await SkillRetrievalConfigRepository(uow.session).update_by_skill(skill_id, update_data)
     if not config:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Configuração não encontrada")
     
-    # Atualizar campos
-    update_data = config_in.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(config, field, value)
-    
-    await db.commit()
-    await db.refresh(config)
     return config
 
 
 # ============= Upload Routes =============
 
-@router.post("/{skill_id}/upload/knowledge", response_model=FileUploadResponse)
-async def upload_knowledge_file(
-    skill_id: int,
-    file: UploadFile = File(...),
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
-):
-    """Upload de arquivo de conhecimento para S3"""
-    # Verificar se skill existe
+async def _get_skill_or_404(db: AsyncSession, skill_id: int) -> Skill:
     result = await db.execute(select(Skill).where(Skill.id == skill_id))
     skill = result.scalar_one_or_none()
     if not skill:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Skill não encontrada")
-    
-    # Gerar chave de storage
-    storage_key = storage_service.generate_key(
-        workspace_id=skill.workspace_id,
-        skill_id=skill_id,
-        folder="knowledge",
-        file_name=file.filename
+    return skill
+
+
+def _deduplicated_response(stored: StorageObject, file_name: str, file_mime_type: Optional[str]) -> FileUploadResponse:
+    return FileUploadResponse(
+        key=stored.storage_key,
+        url=stored.url or "",
+        bucket=stored.bucket,
+        provider=stored.provider,
+        file_size=stored.file_size,
+        file_hash=stored.file_hash,
+        file_name=file_name,
+        file_mime_type=file_mime_type or stored.content_type or "application/octet-stream",
+        deduplicated=True,
     )
-    
-    # Upload para storage
+
+
+async def _store_upload(
+    uow: UnitOfWork, background_tasks: BackgroundTasks, skill_id: int, file: UploadFile, user: User
+) -> FileUploadResponse:
+    """
+    Envia o arquivo para uma chave endereçada por conteúdo, deduplicando no workspace.
+
+    O upload já está no disco do worker: o SHA-256 é calculado antes de enviar
+    e, se o workspace já tem esse conteúdo, nada é enviado. A referência é
+    contada quando a fonte de conhecimento/material é criada com a chave.
+    Se um upload concorrente do mesmo conteúdo registrar primeiro, o objeto
+    enviado aqui (com chave própria) é apagado e a resposta aponta para o dele.
+    """
+    skill = await _get_skill_or_404(uow.session, skill_id)
+    await _ensure_skill_access(uow.session, skill_id, user)
+    repository = StorageObjectRepository(uow.session)
     try:
-        upload_result = storage_service.upload_file(
+        file_hash = await async_storage.get_file_hash(file.file)
+        stored = await repository.get_by_hash(skill.workspace_id, file_hash)
+        if stored:
+            return _deduplicated_response(stored, file.filename, file.content_type)
+
+        upload_result = await async_storage.upload_file(
             file=file.file,
-            key=storage_key,
+            key=async_storage.generate_content_key(skill.workspace_id, file_hash),
             content_type=file.content_type
         )
-        
-        return FileUploadResponse(
-            **upload_result,
-            file_name=file.filename,
-            file_mime_type=file.content_type or "application/octet-stream"
-        )
-        
+    except StorageTimeoutError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Erro ao fazer upload: {str(e)}")
 
+    stored = await repository.register({
+        "workspace_id": skill.workspace_id,
+        "file_hash": upload_result["file_hash"],
+        "storage_key": upload_result["key"],
+        "bucket": upload_result["bucket"],
+        "url": upload_result["url"],
+        "provider": upload_result["provider"],
+        "file_size": upload_result["file_size"],
+        "content_type": file.content_type,
+    })
+    if stored.storage_key != upload_result["key"]:
+        background_tasks.add_task(_delete_files, [upload_result["key"]])
+        return _deduplicated_response(stored, file.filename, file.content_type)
+    return FileUploadResponse(
+        **upload_result,
+        file_name=file.filename,
+        file_mime_type=file.content_type or "application/octet-stream",
+    )
+
+
+@router.post("/{skill_id}/upload/lookup", response_model=FileUploadResponse)
+async def lookup_upload(
+    skill_id: int,
+    lookup_in: FileHashLookupRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Verificar pelo SHA-256 se o workspace já tem o arquivo (evita enviar os bytes)"""
+    skill = await _get_skill_or_404(db, skill_id)
+    await _ensure_skill_access(db, skill_id, current_user)
+    stored = await StorageObjectRepository(db).get_by_hash(skill.workspace_id, lookup_in.file_hash)
+    if not stored:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Arquivo não encontrado no workspace")
+    return _deduplicated_response(stored, lookup_in.file_name, lookup_in.file_mime_type)
+
+
+@router.post("/{skill_id}/upload/knowledge", response_model=FileUploadResponse)
+async def upload_knowledge_file(
+    skill_id: int,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    uow: UnitOfWork = Depends(get_uow, scope="function"),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Upload de arquivo de conhecimento para S3 (deduplicado por conteúdo no workspace)"""
+    return await _store_upload(uow, background_tasks, skill_id, file, current_user)
+
 
 @router.post("/{skill_id}/upload/material", response_model=FileUploadResponse)
 async def upload_material_file(
     skill_id: int,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
-    db: AsyncSession = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow, scope="function"),
     current_user: User = Depends(get_current_active_user),
 ):
-    """Upload de arquivo de material para S3"""
-    # Verificar se skill existe
-    result = await db.execute(select(Skill).where(Skill.id == skill_id))
-    skill = result.scalar_one_or_none()
-    if not skill:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Skill não encontrada")
-    
-    # Gerar chave de storage
-    storage_key = storage_service.generate_key(
-        workspace_id=skill.workspace_id,
-        skill_id=skill_id,
-        folder="materials",
-        file_name=file.filename
-    )
-    
-    # Upload para storage
-    try:
-        upload_result = storage_service.upload_file(
-            file=file.file,
-            key=storage_key,
-            content_type=file.content_type
-        )
-        
-        return FileUploadResponse(
-            **upload_result,
-            file_name=file.filename,
-            file_mime_type=file.content_type or "application/octet-stream"
-        )
-        
-    except Exception as e:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Erro ao fazer upload: {str(e)}")
+    """Upload de arquivo de material para S3 (deduplicado por conteúdo no workspace)"""
+    return await _store_upload(uow, background_tasks, skill_id, file, current_user)
 
 
 # ============= Validation Route =============
@@ -501,7 +579,7 @@ async def upload_material_file(
 @router.get("/{skill_id}/validate", response_model=SkillValidationResponse)
 async def validate_skill(
     skill_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Validar skill antes de ativar"""
     result = await db.execute(select(Skill).where(Skill.id == skill_id))
@@ -516,10 +594,7 @@ async def validate_skill(
         errors.append("Nome da habilidade é obrigatório")
     
     # 2. Pelo menos uma fonte de conhecimento
-    result = await db.execute(
-        select(SkillKnowledge).where(SkillKnowledge.skill_id == skill_id)
-    )
-    knowledges = result.scalars().all()
+    knowledges = await SkillKnowledgeRepository(db).list_by_skill(skill_id)
     if len(knowledges) == 0:
         errors.append("Adicione pelo menos uma fonte de conhecimento")
     
@@ -535,10 +610,7 @@ async def validate_skill(
         errors.append(f"Corrija os erros nas fontes: {', '.join(failed_names)}")
     
     # 5. Configuração deve existir
-    result = await db.execute(
-        select(SkillRetrievalConfig).where(SkillRetrievalConfig.skill_id == skill_id)
-    )
-    config = result.scalar_one_or_none()
+    config = await SkillRetrievalConfigRepository(db).get_by_skill_cached(skill_id)
     if not config:
         errors.append("Configuração de recuperação não encontrada")
     
@@ -7,7 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.database.db import get_db
 from app.database.models.user import User
 from app.schemas.user import UserCreate, UserResponse
-from app.api.deps import get_current_active_user
+from app.api.deps import get_current_user_profile
 from app.database.repository.user import UserRepository
 
 router = APIRouter(
@@ -36,7 +36,7 @@ async def create_user(
 
 @router.get("/me", response_model=UserResponse)
 async def read_user_me(
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(get_current_user_profile),
 ) -> Any:
     """
     Get current user.
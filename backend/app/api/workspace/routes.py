@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, status, Depends, HTTPException
+from fastapi import APIRouter, status, Depends, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.database.db import get_db
-from app.api.deps import get_current_active_user
+from app.database.db import get_db, get_read_db
+from app.api.deps import get_current_active_user, paginated
 from app.database.repository.workspace import WorkspaceRepository
 from app.database.models.workspace import Workspace
 from app.schemas.workspace import WorkspaceCreate, WorkspaceResponse
@@ -37,29 +37,33 @@ async def create_workspace(
 @router.get("/{workspace_id}", response_model=WorkspaceResponse)
 async def get_workspace(
     workspace_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user),
 ):
     repo = WorkspaceRepository(db)
-    workspace = await repo.get(workspace_id)
+    workspace = await repo.get_cached(workspace_id)
     if not workspace:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Workspace não encontrado")
     return workspace
 
 @router.get("/", response_model=List[WorkspaceResponse])
 async def list_workspaces(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
     organization_id: int | None = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user),
 ):
     repo = WorkspaceRepository(db)
     if organization_id is not None:
-        workspaces = await repo.get_by_organization(organization_id=organization_id, skip=skip, limit=limit)
+        page = await repo.get_page_by_organization(
+            organization_id=organization_id, cursor=cursor, skip=skip, limit=limit
+        )
     else:
-        workspaces = await repo.get_all(skip=skip, limit=limit)
-    return workspaces
+        page = await repo.get_page(cursor=cursor, skip=skip, limit=limit)
+    return paginated(response, page)
 
 @router.put("/{workspace_id}", response_model=WorkspaceResponse)
 async def update_workspace(
@@ -0,0 +1,206 @@
+"""
+Verificação assíncrona de ID tokens do Google com cache de chaves (JWKS).
+
+As chaves públicas do Google são mantidas em memória indexadas pelo `kid` e
+renovadas em background de acordo com o `Cache-Control: max-age` da resposta.
+No caminho quente a verificação é apenas local (assinatura + claims), sem I/O.
+
+A origem do JWKS é plugável: em testes um arquivo local ou um stub pode
+substituir o endpoint do Google.
+"""
+import asyncio
+import json
+import re
+import time
+from typing import Any, Optional, Protocol
+
+import requests
+from jose import jwt, JWTError
+
+from app.core.logging import get_logger
+from settings import settings
+
+logger = get_logger(__name__)
+
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+class JWKSSource(Protocol):
+    """Origem de um JWKS. Retorna o documento e o tempo de vida em segundos (se conhecido)."""
+
+    async def fetch(self) -> tuple[dict, Optional[int]]:
+        ...
+
+
+class HTTPJWKSSource:
+    """Busca o JWKS por HTTP, respeitando o `Cache-Control` da resposta."""
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        self.url = url
+        self.timeout = timeout
+
+    def _fetch_sync(self) -> tuple[dict, Optional[int]]:
+        response = requests.get(self.url, timeout=self.timeout)
+        response.raise_for_status()
+        match = _MAX_AGE_RE.search(response.headers.get("Cache-Control", ""))
+        return response.json(), int(match.group(1)) if match else None
+
+    async def fetch(self) -> tuple[dict, Optional[int]]:
+        return await asyncio.to_thread(self._fetch_sync)
+
+
+class FileJWKSSource:
+    """Lê o JWKS de um arquivo JSON local (desenvolvimento e testes)."""
+
+    def __init__(self, path: str, max_age: Optional[int] = None):
+        self.path = path
+        self.max_age = max_age
+
+    def _read(self) -> dict:
+        with open(self.path, encoding="utf-8") as fp:
+            return json.load(fp)
+
+    async def fetch(self) -> tuple[dict, Optional[int]]:
+        return await asyncio.to_thread(self._read), self.max_age
+
+
+class StaticJWKSSource:
+    """JWKS fixo em memória (stub para testes)."""
+
+    def __init__(self, jwks: dict, max_age: Optional[int] = None):
+        self.jwks = jwks
+        self.max_age = max_age
+
+    async def fetch(self) -> tuple[dict, Optional[int]]:
+        return self.jwks, self.max_age
+
+
+class GoogleIDTokenVerifier:
+    """
+    Verificador de ID tokens do Google com cache de chaves por `kid`.
+
+    - As chaves são buscadas uma vez e mantidas até expirar o `max-age`.
+    - Uma task em background renova o conjunto antes da expiração.
+    - Um `kid` desconhecido força uma renovação (rotação de chaves), limitada
+      por `min_refresh_interval` para não amplificar tokens inválidos.
+    """
+
+    def __init__(
+        self,
+        source: JWKSSource,
+        audience: Optional[str],
+        default_ttl: int = 3600,
+        min_refresh_interval: int = 60,
+        refresh_margin: int = 60,
+    ):
+        self.source = source
+        self.audience = audience
+        self.default_ttl = default_ttl
+        self.min_refresh_interval = min_refresh_interval
+        self.refresh_margin = refresh_margin
+        self._keys: dict[str, dict] = {}
+        self._expires_at = 0.0
+        self._last_refresh = 0.0
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_fresh(self) -> bool:
+        return bool(self._keys) and time.monotonic() < self._expires_at
+
+    async def refresh(self, force: bool = False) -> None:
+        """Busca o JWKS na origem (single-flight entre requisições concorrentes)."""
+        async with self._lock:
+            if not force and self.is_fresh:
+                return
+            jwks, max_age = await self.source.fetch()
+            keys = {key["kid"]: key for key in jwks.get("keys", []) if "kid" in key}
+            if not keys:
+                raise ValueError("JWKS sem chaves")
+            now = time.monotonic()
+            self._keys = keys
+            self._last_refresh = now
+            self._expires_at = now + (max_age if max_age is not None else self.default_ttl)
+            logger.debug(f"JWKS do Google renovado: {len(keys)} chaves, ttl={max_age or self.default_ttl}s")
+
+    async def _get_key(self, kid: str) -> dict:
+        if not self.is_fresh:
+            await self.refresh()
+        key = self._keys.get(kid)
+        if key is None and time.monotonic() - self._last_refresh >= self.min_refresh_interval:
+            await self.refresh(force=True)
+            key = self._keys.get(kid)
+        if key is None:
+            raise ValueError("Chave de assinatura desconhecida.")
+        return key
+
+    async def verify(self, token: str) -> dict[str, Any]:
+        """
+        Verifica assinatura, audiência, emissor e expiração de um ID token.
+
+        :param token: O ID token recebido do cliente.
+        :return: As claims do token.
+        :raises ValueError: Se o token for inválido.
+        """
+        try:
+            header = jwt.get_unverified_header(token)
+        except JWTError as e:
+            raise ValueError(str(e))
+        kid = header.get("kid")
+        if not kid:
+            raise ValueError("Token sem kid.")
+
+        key = await self._get_key(kid)
+        try:
+            return jwt.decode(
+                token,
+                key,
+                algorithms=[key.get("alg", "RS256")],
+                audience=self.audience,
+                issuer=GOOGLE_ISSUERS,
+                options={"verify_aud": self.audience is not None, "verify_at_hash": False},
+            )
+        except JWTError as e:
+            raise ValueError(str(e))
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            delay = max(self._expires_at - time.monotonic() - self.refresh_margin, self.min_refresh_interval)
+            await asyncio.sleep(delay)
+            try:
+                await self.refresh(force=True)
+            except Exception as e:
+                logger.warning(f"Falha ao renovar JWKS do Google: {e}")
+
+    async def start(self) -> None:
+        """Faz o primeiro fetch e agenda a renovação em background."""
+        if self._task is not None:
+            return
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.warning(f"JWKS do Google indisponível na inicialização: {e}")
+        self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def _build_source() -> JWKSSource:
+    if settings.GOOGLE_JWKS_FILE:
+        return FileJWKSSource(settings.GOOGLE_JWKS_FILE)
+    return HTTPJWKSSource(settings.GOOGLE_JWKS_URL)
+
+
+google_verifier = GoogleIDTokenVerifier(
+    source=_build_source(),
+    audience=settings.GOOGLE_CLIENT_ID,
+)
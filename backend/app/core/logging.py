@@ -12,6 +12,8 @@ client_ip_var = contextvars.ContextVar("client_ip", default="-")
 path_var = contextvars.ContextVar("path", default="-")
 method_var = contextvars.ContextVar("method", default="-")
 user_agent_var = contextvars.ContextVar("user_agent", default="-")
+# Scope ASGI da requisição: o roteamento grava nele a rota casada (scope["route"])
+scope_var = contextvars.ContextVar("scope", default=None)
 
 class ContextFilter(logging.Filter):
     def filter(self, record: logging.LogRecord) -> bool:
@@ -107,6 +109,7 @@ async def logging_context_middleware(request, call_next):
     path_var.set(request.url.path)
     method_var.set(request.method)
     user_agent_var.set(request.headers.get("User-Agent", "-"))
+    scope_var.set(request.scope)
 
     response = await call_next(request)
     response.headers["X-Request-ID"] = rid
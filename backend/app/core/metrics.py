@@ -0,0 +1,180 @@
+"""
+Métricas in-process da aplicação.
+
+Registro simples de contadores, gauges e histogramas mantidos em memória pelo
+processo. Os valores são por worker: cada processo do uvicorn possui o seu
+registro. Métricas podem ter labels; cada combinação vira uma série própria,
+identificada no snapshot como `nome{label="valor"}`.
+"""
+import bisect
+from threading import Lock
+from typing import Callable, Dict, Optional, Sequence, Union
+
+Number = Union[int, float]
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _series_key(name: str, labels: Optional[Dict[str, str]]) -> str:
+    if not labels:
+        return name
+    rendered = ",".join(f'{key}="{value}"' for key, value in sorted(labels.items()))
+    return f"{name}{{{rendered}}}"
+
+
+class Counter:
+    """Contador monotônico."""
+
+    def __init__(self, name: str, description: str = "", labels: Optional[Dict[str, str]] = None):
+        self.name = name
+        self.description = description
+        self.labels = labels or {}
+        self._value = 0
+        self._lock = Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    def snapshot(self) -> int:
+        return self._value
+
+
+class Gauge:
+    """
+    Valor instantâneo que pode subir ou descer.
+
+    Se `fn` for informado, o valor é calculado no momento da leitura.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str = "",
+        labels: Optional[Dict[str, str]] = None,
+        fn: Optional[Callable[[], Number]] = None,
+    ):
+        self.name = name
+        self.description = description
+        self.labels = labels or {}
+        self._fn = fn
+        self._value: Number = 0
+        self._lock = Lock()
+
+    def set(self, value: Number) -> None:
+        with self._lock:
+            self._value = value
+
+    def inc(self, amount: Number = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: Number = 1) -> None:
+        with self._lock:
+            self._value -= amount
+
+    @property
+    def value(self) -> Number:
+        return self._fn() if self._fn is not None else self._value
+
+    def snapshot(self) -> Number:
+        return self.value
+
+
+class Histogram:
+    """Histograma de buckets cumulativos (estilo Prometheus) com contagem e soma."""
+
+    def __init__(
+        self,
+        name: str,
+        description: str = "",
+        labels: Optional[Dict[str, str]] = None,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.description = description
+        self.labels = labels or {}
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        cumulative, running = {}, 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            running += bucket_count
+            cumulative[str(bound)] = running
+        cumulative["+Inf"] = count
+        return {"count": count, "sum": total, "buckets": cumulative}
+
+
+class MetricsRegistry:
+    """Registro global de métricas, indexado pelo nome e labels."""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = Lock()
+
+    def _get_or_create(self, cls, name: str, description: str, labels: Optional[Dict[str, str]], **kwargs):
+        key = _series_key(name, labels)
+        with self._lock:
+            metric = self._metrics.get(key)
+            if metric is None:
+                metric = cls(name, description, labels, **kwargs)
+                self._metrics[key] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Métrica '{key}' já registrada com outro tipo")
+            return metric
+
+    def counter(self, name: str, description: str = "", labels: Optional[Dict[str, str]] = None) -> Counter:
+        return self._get_or_create(Counter, name, description, labels)
+
+    def gauge(
+        self,
+        name: str,
+        description: str = "",
+        labels: Optional[Dict[str, str]] = None,
+        fn: Optional[Callable[[], Number]] = None,
+    ) -> Gauge:
+        return self._get_or_create(Gauge, name, description, labels, fn=fn)
+
+    def histogram(
+        self,
+        name: str,
+        description: str = "",
+        labels: Optional[Dict[str, str]] = None,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, description, labels, buckets=buckets)
+
+    def snapshot(self) -> dict:
+        """Retorna um dict {série: valor} com o estado atual de todas as métricas."""
+        with self._lock:
+            items = list(self._metrics.items())
+        return {key: metric.snapshot() for key, metric in sorted(items)}
+
+
+registry = MetricsRegistry()
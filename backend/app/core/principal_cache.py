@@ -0,0 +1,90 @@
+"""
+Cache de principal (usuário autenticado) em memória.
+
+Evita a consulta `UserRepository.get_by_email` em toda requisição autenticada.
+As entradas são indexadas pelo `sub` do token, têm TTL limitado e despejo LRU.
+O cache é por processo e deve ser invalidado explicitamente sempre que o
+usuário for alterado, desativado ou tiver a senha redefinida.
+"""
+from typing import Any, Optional
+
+from cachetools import TTLCache
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.metrics import registry
+from app.database.models.user import User
+from settings import settings
+
+
+class PrincipalCache:
+    """Cache TTL + LRU de snapshots de `User` indexado pelo subject do token."""
+
+    def __init__(self, maxsize: int, ttl: int, enabled: bool = True):
+        self.enabled = enabled
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.hits = registry.counter("principal_cache_hits_total", "Principais servidos pelo cache")
+        self.misses = registry.counter("principal_cache_misses_total", "Principais buscados no banco")
+        self.invalidations = registry.counter("principal_cache_invalidations_total", "Invalidações explícitas")
+
+    @staticmethod
+    def _snapshot(user: User) -> dict[str, Any]:
+        # Copia apenas as colunas, nunca a instância ligada à sessão da requisição
+        return {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+
+    @staticmethod
+    def _materialize(data: dict[str, Any]) -> User:
+        user = User(**data)
+        make_transient_to_detached(user)
+        return user
+
+    def get(self, subject: str) -> Optional[User]:
+        """
+        Busca o principal no cache.
+
+        :param subject: O `sub` do token (email do usuário).
+        :return: Uma instância destacada de `User` ou None em caso de miss.
+        """
+        if not self.enabled:
+            return None
+        data = self._cache.get(subject)
+        if data is None:
+            self.misses.inc()
+            return None
+        self.hits.inc()
+        return self._materialize(data)
+
+    def set(self, subject: str, user: User) -> None:
+        if self.enabled:
+            self._cache[subject] = self._snapshot(user)
+
+    def invalidate(self, subject: Optional[str]) -> None:
+        """Remove o principal do cache (após update, desativação ou troca de senha)."""
+        if subject is None:
+            return
+        if self._cache.pop(subject, None) is not None:
+            self.invalidations.inc()
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> dict[str, Any]:
+        hits, misses = self.hits.value, self.misses.value
+        total = hits + misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._cache),
+            "maxsize": self._cache.maxsize,
+            "ttl": self._cache.ttl,
+            "hits": hits,
+            "misses": misses,
+            "invalidations": self.invalidations.value,
+            "hit_ratio": hits / total if total else 0.0,
+        }
+
+
+principal_cache = PrincipalCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAXSIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    enabled=settings.PRINCIPAL_CACHE_ENABLED,
+)
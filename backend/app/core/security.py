@@ -1,25 +1,84 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Union, Any
 from jose import jwt
 from passlib.context import CryptContext
+from app.core.metrics import registry
 from settings import settings
 
 pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 
 ALGORITHM = settings.ALGORITHM
 
-def create_access_token(subject: Union[str, Any], expires_delta: Optional[timedelta] = None) -> str:
+# pbkdf2 é CPU-bound e bloqueia o event loop por dezenas de ms; as versões
+# async abaixo rodam o hash em um pool dedicado com concorrência limitada.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_MAX_CONCURRENCY,
+    thread_name_prefix="password-hash",
+)
+_hash_semaphore = asyncio.Semaphore(settings.PASSWORD_HASH_MAX_CONCURRENCY)
+
+hash_queue_depth = registry.gauge("password_hash_queue_depth", "Operações de hash aguardando um worker")
+hash_in_flight = registry.gauge("password_hash_in_flight", "Operações de hash em execução")
+hash_total = registry.counter("password_hash_operations_total", "Operações de hash/verify executadas")
+
+def create_access_token(
+    subject: Union[str, Any],
+    expires_delta: Optional[timedelta] = None,
+    claims: Optional[dict] = None,
+) -> str:
     if expires_delta:
         expire = datetime.now(timezone.utc) + expires_delta
     else:
         expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode = {"exp": expire, "sub": str(subject)}
+    if claims:
+        to_encode.update(claims)
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def create_user_access_token(user: Any, expires_delta: Optional[timedelta] = None) -> str:
+    """
+    Emite o token de acesso de um usuário com o principal assinado.
+
+    Além do `sub` (email), inclui id, flags e `token_version`, permitindo que
+    o modo stateless autentique sem consultar o banco.
+    """
+    claims = {
+        "uid": user.id,
+        "act": bool(user.is_active),
+        "su": bool(user.is_superuser),
+        "ver": user.token_version or 0,
+    }
+    return create_access_token(user.email, expires_delta=expires_delta, claims=claims)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
+
+async def _run_hash(func, *args):
+    hash_queue_depth.inc()
+    try:
+        await _hash_semaphore.acquire()
+    finally:
+        hash_queue_depth.dec()
+    hash_in_flight.inc()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_hash_executor, func, *args)
+    finally:
+        hash_in_flight.dec()
+        hash_total.inc()
+        _hash_semaphore.release()
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Versão não-bloqueante de `verify_password` para handlers async."""
+    return await _run_hash(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Versão não-bloqueante de `get_password_hash` para handlers async."""
+    return await _run_hash(get_password_hash, password)
@@ -0,0 +1,138 @@
+"""
+Denylist de revogação para o modo de token stateless.
+
+No modo stateless o principal (id, is_active, is_superuser, token_version) vai
+assinado no JWT e é confiável até a expiração, sem consulta ao banco. Para
+revogar antes disso, cada par (user_id, token_version) revogado é gravado na
+tabela `revoked_tokens` e espelhado em um bloom filter em memória.
+
+- Resposta "não está no filtro" é definitiva: o token é aceito sem I/O.
+- Resposta "talvez esteja" (revogado ou falso positivo) cai no caminho com
+  banco, que compara a versão do token com a do usuário.
+
+Cada worker recarrega o filtro da tabela periodicamente, propagando
+revogações feitas por outros processos. As revogações são gravadas em qualquer
+modo (ligar o stateless depois não reabilita tokens antigos), então o mesmo
+loop poda as entradas expiradas mesmo com o modo desligado.
+"""
+import asyncio
+import hashlib
+import math
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger
+from app.core.metrics import registry
+from app.database.models.user import RevokedToken
+from settings import settings
+
+logger = get_logger(__name__)
+
+
+class BloomFilter:
+    """Bloom filter compacto sobre um bytearray (double hashing com blake2b)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+def _entry(user_id: int, token_version: int) -> str:
+    return f"{user_id}:{token_version}"
+
+
+class TokenDenylist:
+    """Denylist (user_id, token_version) com bloom filter sincronizado do banco."""
+
+    def __init__(self, capacity: int, sync_interval: int, enabled: bool = True):
+        self.enabled = enabled
+        self.capacity = capacity
+        self.sync_interval = sync_interval
+        self._filter = BloomFilter(capacity)
+        self._task: Optional[asyncio.Task] = None
+        self.maybe_revoked = registry.counter(
+            "token_denylist_maybe_revoked_total", "Tokens que caíram no caminho com banco"
+        )
+        self.entries = registry.gauge("token_denylist_entries", "Revogações ativas carregadas no filtro")
+
+    def might_be_revoked(self, user_id: int, token_version: int) -> bool:
+        hit = _entry(user_id, token_version) in self._filter
+        if hit:
+            self.maybe_revoked.inc()
+        return hit
+
+    async def revoke(self, db: AsyncSession, user_id: int, token_version: int, expires_at: datetime) -> None:
+        """
+        Revoga todos os tokens de `user_id` emitidos com `token_version`.
+
+        Nota: a transação não é "commitada" aqui; o filtro local é atualizado
+        imediatamente e os demais workers recebem a entrada no próximo sync.
+        """
+        await db.merge(RevokedToken(user_id=user_id, token_version=token_version, expires_at=expires_at))
+        self._filter.add(_entry(user_id, token_version))
+
+    async def sync(self, db: AsyncSession) -> None:
+        """Poda as revogações expiradas e recarrega o filtro com as vigentes."""
+        now = datetime.utcnow()
+        await db.execute(delete(RevokedToken).where(RevokedToken.expires_at < now))
+        await db.commit()
+        if not self.enabled:
+            # Fora do modo stateless o filtro não é consultado; só a poda importa
+            return
+        result = await db.execute(
+            select(RevokedToken.user_id, RevokedToken.token_version).where(RevokedToken.expires_at >= now)
+        )
+        rows = result.all()
+        fresh = BloomFilter(max(self.capacity, len(rows) * 2))
+        for user_id, token_version in rows:
+            fresh.add(_entry(user_id, token_version))
+        self._filter = fresh
+        self.entries.set(len(rows))
+
+    async def _sync_loop(self, session_factory) -> None:
+        while True:
+            try:
+                async with session_factory() as db:
+                    await self.sync(db)
+            except Exception as e:
+                logger.warning(f"Falha ao sincronizar denylist de tokens: {e}")
+            await asyncio.sleep(self.sync_interval)
+
+    def start(self, session_factory) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._sync_loop(session_factory))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+token_denylist = TokenDenylist(
+    capacity=settings.TOKEN_DENYLIST_CAPACITY,
+    sync_interval=settings.TOKEN_DENYLIST_SYNC_SECONDS,
+    enabled=settings.AUTH_STATELESS_TOKENS,
+)
@@ -0,0 +1,97 @@
+"""
+Jobs periódicos dos contadores desnormalizados de `kanban_boards`.
+
+    - fold: soma os deltas de `kanban_board_counter_shards` nas linhas dos
+      quadros (a cada KANBAN_COUNTER_FOLD_SECONDS). É seguro em vários workers.
+    - reconcile: recalcula `columns_count` a partir de `kanban_columns` (a cada
+      KANBAN_COUNTER_RECONCILE_SECONDS). Roda num worker por vez, via advisory
+      lock do Postgres, em REPEATABLE READ.
+
+`cards_count` não tem tabela de origem para reconciliar: só recebe fold.
+"""
+import asyncio
+import time
+from typing import Optional
+
+from sqlalchemy import text
+
+from app.core.logging import get_logger
+from app.core.metrics import registry
+from app.database.repository.kanban_board import KanbanBoardRepository
+from settings import settings
+
+logger = get_logger(__name__)
+
+# Chave do advisory lock da reconciliação (arbitrária, fixa)
+RECONCILE_LOCK_KEY = 0x6B616E62
+
+
+class CounterJobs:
+    """Loops de fold e reconciliação dos contadores de quadros."""
+
+    def __init__(self, fold_interval: int, reconcile_interval: int):
+        self.fold_interval = fold_interval
+        self.reconcile_interval = reconcile_interval
+        self._tasks: list[asyncio.Task] = []
+        self.folded = registry.counter("kanban_counter_folds_total", "Quadros atualizados pelo fold de shards")
+        self.reconciled = registry.counter("kanban_counter_reconciled_total", "Quadros com columns_count corrigido")
+
+    async def fold(self, session_factory) -> int:
+        async with session_factory() as db:
+            boards = await KanbanBoardRepository(db).fold_counter_shards()
+            await db.commit()
+        self.folded.inc(boards)
+        return boards
+
+    async def reconcile(self, session_factory) -> Optional[int]:
+        """Retorna os quadros corrigidos, ou None se outro worker está reconciliando."""
+        async with session_factory() as db:
+            if db.get_bind().dialect.name == "postgresql":
+                await db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+                locked = await db.scalar(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": RECONCILE_LOCK_KEY})
+                if not locked:
+                    return None
+            start = time.perf_counter()
+            boards = await KanbanBoardRepository(db).reconcile_columns_count()
+            await db.commit()
+        self.reconciled.inc(boards)
+        if boards:
+            logger.warning(
+                f"columns_count corrigido em {boards} quadro(s) ({(time.perf_counter() - start) * 1000:.0f} ms)"
+            )
+        return boards
+
+    async def _loop(self, name: str, job, interval: int, session_factory) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await job(session_factory)
+            except Exception as e:
+                # Ex: falha de serialização em REPEATABLE READ; tenta no próximo ciclo
+                logger.warning(f"Falha no job de contadores '{name}': {e}")
+
+    def start(self, session_factory) -> None:
+        if self._tasks:
+            return
+        if self.fold_interval > 0:
+            self._tasks.append(asyncio.create_task(self._loop("fold", self.fold, self.fold_interval, session_factory)))
+        if self.reconcile_interval > 0:
+            self._tasks.append(
+                asyncio.create_task(self._loop("reconcile", self.reconcile, self.reconcile_interval, session_factory))
+            )
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+
+counter_jobs = CounterJobs(
+    fold_interval=settings.KANBAN_COUNTER_FOLD_SECONDS,
+    reconcile_interval=settings.KANBAN_COUNTER_RECONCILE_SECONDS,
+)
@@ -3,29 +3,107 @@
 Configuração do banco de dados com SQLAlchemy async.
 Refatorado para desabilitar echo SQL em produção.
 """
+import time
+from uuid import uuid4
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import ArgumentError
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.orm import sessionmaker, declarative_base, Session
 from settings import settings
 from typing import AsyncGenerator
+from app.database.pool_metrics import InstrumentedAsyncPool, instrument_engine
+from app.database.query_profiler import profile_engine
+from app.database.slow_query import slow_query_log
 
 # Determina se deve fazer echo baseado no ambiente
 # Em produção, echo deve ser False para evitar logs excessivos
 ECHO_SQL = settings.is_production and settings.SQL_ECHO
 
-# Cria engine e sessão assíncronas
-engine = create_async_engine(
-    settings.POSTGRES_URL,
-    echo=ECHO_SQL,
-    future=True,
-    pool_size=10,
-    max_overflow=20,
-    pool_timeout=30,
-    pool_recycle=1800,
-    pool_pre_ping=True,
-    connect_args={
+_POOLER_HOST_MARKERS = ("pooler", "pgbouncer")
+
+
+def is_pooler_url(url: str) -> bool:
+    """
+    Detecta se a URL aponta para um pooler em modo transação (PgBouncer, Supavisor...).
+
+    Heurística: porta listada em DB_POOLER_PORTS ou host contendo "pooler"/"pgbouncer".
+    """
+    try:
+        parsed = make_url(url)
+    except ArgumentError:
+        return False
+    host = (parsed.host or "").lower()
+    return parsed.port in settings.DB_POOLER_PORTS or any(marker in host for marker in _POOLER_HOST_MARKERS)
+
+
+def resolve_statement_cache_mode(url: str) -> str:
+    """Resolve o modo 'auto' para 'direct' ou 'pooler' conforme a URL."""
+    mode = settings.DB_STATEMENT_CACHE_MODE
+    if mode == "auto":
+        return "pooler" if is_pooler_url(url) else "direct"
+    return mode
+
+
+def _pooler_safe_statement_name() -> str:
+    # Nomes aleatórios: pid + sequência colidem entre containers (mesmo pid,
+    # contador zerado) que compartilham a mesma conexão no servidor do pooler.
+    return f"__asyncpg_{uuid4()}__"
+
+
+def build_connect_args(mode: str) -> dict:
+    """
+    Monta os connect_args do asyncpg para o modo de cache de statements.
+
+    - direct:   cache do asyncpg e do SQLAlchemy ligados (conexão direta ao Postgres)
+    - pooler:   sem cache no asyncpg, nomes de prepared statement seguros para pooler;
+                cache do SQLAlchemy só se o pooler suportar prepared statements
+                (PgBouncer >= 1.21 com max_prepared_statements)
+    - disabled: nenhum cache (comportamento legado)
+    """
+    if mode == "direct":
+        return {
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        }
+    if mode == "pooler":
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": settings.DB_POOLER_PREPARED_CACHE_SIZE,
+            "prepared_statement_name_func": _pooler_safe_statement_name,
+        }
+    return {
         "statement_cache_size": 0,
-    },
-)
+        "prepared_statement_cache_size": 0,
+    }
+
+
+STATEMENT_CACHE_MODE = resolve_statement_cache_mode(settings.POSTGRES_URL)
+
+
+def _create_engine(url: str, label: str):
+    connect_args = build_connect_args(resolve_statement_cache_mode(url))
+    new_engine = create_async_engine(
+        url,
+        echo=ECHO_SQL,
+        future=True,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=10,
+        max_overflow=20,
+        pool_timeout=30,
+        pool_recycle=1800,
+        pool_pre_ping=True,
+        connect_args=connect_args,
+    )
+    instrument_engine(new_engine, label)
+    profile_engine(new_engine)
+    slow_query_log.watch(new_engine, connect_args)
+    return new_engine
+
+
+# Cria engine e sessão assíncronas
+engine = _create_engine(settings.POSTGRES_URL, "primary")
 """
 Engine assíncrona do SQLAlchemy para conexão com PostgreSQL.
 
@@ -37,7 +115,11 @@ Configurações:
     - pool_timeout=30: Timeout para obter conexão do pool
     - pool_recycle=1800: Recicla conexões após 30 minutos
     - pool_pre_ping=True: Testa conexões antes de usar (previne conexões inválidas)
-    - statement_cache_size=0: Desabilita cache de statements (evita problemas com prepared statements)
+    - poolclass=InstrumentedAsyncPool: Métricas de checkout/uso expostas em /api/internal/metrics
+    - profile_engine: contagem/tempo de statements por requisição (Server-Timing, N+1)
+    - slow_query_log: log de queries acima de SLOW_QUERY_THRESHOLD_MS com EXPLAIN amostrado
+    - connect_args: cache de prepared statements conforme DB_STATEMENT_CACHE_MODE
+      (ligado em conexão direta; nomes seguros para pooler em modo transação)
 """
 
 async_session = sessionmaker(
@@ -54,6 +136,22 @@ Configurações:
     - expire_on_commit=False: Mantém objetos válidos após commit (evita lazy loading issues)
 """
 
+replica_engine = _create_engine(settings.POSTGRES_REPLICA_URL, "replica") if settings.POSTGRES_REPLICA_URL else None
+"""
+Engine da réplica de leitura (None quando POSTGRES_REPLICA_URL não está configurada).
+
+Mesmas configurações de pool do engine primário, em um pool separado.
+"""
+
+read_session = sessionmaker(
+    bind=replica_engine or engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+"""
+Factory de sessões somente leitura. Sem réplica configurada, aponta para o primário.
+"""
+
 Base = declarative_base()
 """
 Classe base para todos os modelos ORM do SQLAlchemy.
@@ -63,7 +161,83 @@ as funcionalidades do ORM disponíveis (mapeamento objeto-relacional).
 """
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+class ReadYourWrites:
+    """
+    Janela "sticky" no primário após uma escrita.
+
+    O sinal viaja com o cliente, não com o processo: a resposta de uma
+    requisição que commitou uma escrita leva o cookie `read_primary_until`
+    (e o header `X-Read-Primary-Until`) com o instante, em epoch, até o qual
+    as leituras desse cliente vão ao primário, cobrindo o lag de replicação.
+    Qualquer worker ou instância que receba a próxima leitura decide pelo
+    valor recebido (cookie, ou o header reenviado por clientes sem cookies).
+
+    Valores mais de `window` segundos no futuro são ignorados: um cliente não
+    consegue se fixar no primário. Os relógios das instâncias devem estar
+    sincronizados (NTP) com folga bem menor que `READ_YOUR_WRITES_SECONDS`.
+    """
+
+    COOKIE = "read_primary_until"
+    HEADER = "X-Read-Primary-Until"
+
+    def __init__(self, window: int):
+        self.window = window
+        self.enabled = window > 0
+
+    def mark(self, state) -> None:
+        """Registra no `request.state` que a requisição commitou uma escrita."""
+        if self.enabled and state is not None:
+            state.read_primary_until = time.time() + self.window
+
+    def is_sticky(self, request: Request) -> bool:
+        value = request.headers.get(self.HEADER) or request.cookies.get(self.COOKIE)
+        try:
+            until = float(value)
+        except (TypeError, ValueError):
+            return False
+        now = time.time()
+        return now < until <= now + self.window
+
+    def apply(self, request: Request, response: Response) -> None:
+        """Anexa o sinal à resposta de uma requisição que escreveu."""
+        until = getattr(request.state, "read_primary_until", None)
+        if until is None:
+            return
+        value = f"{until:.3f}"
+        response.headers[self.HEADER] = value
+        response.set_cookie(
+            self.COOKIE,
+            value,
+            max_age=self.window,
+            httponly=True,
+            samesite="lax",
+            secure=settings.is_production,
+        )
+
+
+read_your_writes = ReadYourWrites(settings.READ_YOUR_WRITES_SECONDS)
+
+
+@event.listens_for(Session, "after_flush")
+def _flag_writes(session, flush_context):
+    if session.new or session.dirty or session.deleted:
+        session.info["has_writes"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_writer(session):
+    if session.info.pop("has_writes", False):
+        read_your_writes.mark(session.info.get("request_state"))
+
+
+async def read_your_writes_middleware(request, call_next):
+    # Os commits (inclusive o do unit of work) acontecem antes do envio da resposta
+    response = await call_next(request)
+    read_your_writes.apply(request, response)
+    return response
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency provider para obter sessões de banco de dados.
     
@@ -75,7 +249,11 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         AsyncSession: Sessão assíncrona do SQLAlchemy configurada e pronta para uso.
         
     Note:
-        - A sessão é criada no início da requisição
+        - A sessão é criada no início da requisição, mas é "lazy": nenhuma
+          conexão sai do pool até o primeiro execute/flush. Requisições
+          respondidas por cache ou rejeitadas na autenticação não ocupam
+          slot do pool (ver métrica http_requests_db_usage_total)
+        - Não execute nada na sessão aqui (nem SELECT 1): isso anularia o lazy
         - A sessão é automaticamente fechada ao final da requisição
         - Utiliza context manager (async with) para garantir cleanup adequado
         - Ideal para uso com Depends() no FastAPI
@@ -89,6 +267,34 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         ```
     """
     async with async_session() as session:
+        session.info["request_state"] = request.state
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency provider de sessões para endpoints somente leitura.
+
+    Usa a réplica de leitura quando configurada, exceto dentro da janela
+    read-your-writes do cliente (cookie/header `read_primary_until`), em que a
+    leitura vai para o primário.
+    A sessão não deve ser usada para escritas.
+
+    Para testar localmente, aponte POSTGRES_URL e POSTGRES_REPLICA_URL para
+    duas instâncias Postgres (a segunda como réplica de streaming da primeira).
+
+    Example:
+        ```python
+        @router.get("/items/")
+        async def list_items(db: AsyncSession = Depends(get_read_db)):
+            pass
+        ```
+    """
+    factory = async_session if replica_engine is None or read_your_writes.is_sticky(request) else read_session
+    async with factory() as session:
         try:
             yield session
         finally:
@@ -112,4 +318,6 @@ async def close_db():
     Esta função deve ser chamada no shutdown da aplicação.
     """
     await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
 
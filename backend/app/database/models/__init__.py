@@ -4,6 +4,7 @@ from .workspace import Workspace
 from .skill import Skill
 from .kanban_board import KanbanBoard
 from .kanban_column import KanbanColumn
+from .storage_object import StorageObject
 
 
 
@@ -13,5 +14,6 @@ __all__ = [
     "Workspace",
     "Skill",
     "KanbanBoard",
-    "KanbanColumn"
+    "KanbanColumn",
+    "StorageObject"
 ]
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum, DateTime, Text
+from sqlalchemy import Column, Integer, SmallInteger, String, ForeignKey, Enum, DateTime, Text, Index
 from sqlalchemy.orm import relationship
 
 from app.database.db import Base
@@ -9,6 +9,8 @@ from app.database.enum import KanbanStatus
 
 class KanbanBoard(Base):
     __tablename__ = "kanban_boards"
+    # Paginação por workspace ordenada por (updated_at, id)
+    __table_args__ = (Index("ix_kanban_boards_workspace_id_updated_at_id", "workspace_id", "updated_at", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     workspace_id = Column(Integer, ForeignKey("workspaces.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -37,3 +39,22 @@ class KanbanBoard(Base):
 
     def __repr__(self):
         return f"<KanbanBoard(id={self.id}, name='{self.name}', workspace_id={self.workspace_id})>"
+
+
+class KanbanBoardCounterShard(Base):
+    """
+    Deltas pendentes dos contadores de um quadro (KANBAN_COUNTER_SHARDS > 0).
+
+    Incrementos concorrentes caem em linhas diferentes (shard aleatório) em vez
+    de disputar o lock da linha do quadro; o job de contadores soma os deltas
+    de volta em `kanban_boards` periodicamente.
+    """
+    __tablename__ = "kanban_board_counter_shards"
+
+    board_id = Column(Integer, ForeignKey("kanban_boards.id", ondelete="CASCADE"), primary_key=True)
+    counter = Column(String(32), primary_key=True)  # Nome da coluna em kanban_boards
+    shard = Column(SmallInteger, primary_key=True)
+    delta = Column(Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f"<KanbanBoardCounterShard(board_id={self.board_id}, counter='{self.counter}', shard={self.shard})>"
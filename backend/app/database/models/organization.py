@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum, Table
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum, Table, Index
 from sqlalchemy.orm import relationship
 from app.database.db import Base
 from app.database.enum import OrgRole
@@ -21,6 +21,8 @@ class OrganizationMember(Base):
     Define quem faz parte da empresa.
     """
     __tablename__ = "organization_members"
+    # A PK começa por user_id; listagens por organização precisam deste índice
+    __table_args__ = (Index("ix_organization_members_organization_id_user_id", "organization_id", "user_id"),)
     
     user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
     organization_id = Column(Integer, ForeignKey("organizations.id"), primary_key=True)
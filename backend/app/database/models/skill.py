@@ -12,7 +12,9 @@ from sqlalchemy import (
     Text, 
     BigInteger, 
     Numeric, 
-    JSON
+    JSON,
+    Index,
+    text
 )
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -93,6 +95,15 @@ class Skill(Base):
 
 class SkillKnowledge(Base):
     __tablename__ = "skill_knowledges"
+    __table_args__ = (
+        Index("ix_skill_knowledges_skill_id_processing_status", "skill_id", "processing_status"),
+        # Parcial: fontes ainda em processamento (validação da skill / fila de ingestão)
+        Index(
+            "ix_skill_knowledges_skill_id_in_progress",
+            "skill_id",
+            postgresql_where=text("processing_status IN ('PENDING', 'PROCESSING')"),
+        ),
+    )
     
     # Primary Key
     id = Column(Integer, primary_key=True, index=True)
@@ -258,16 +269,26 @@ class SkillRetrievalConfig(Base):
 
 
 class SkillUsageLog(Base):
+    """
+    Log de uso de materiais (append-only).
+
+    Particionada por mês em `created_at` (RANGE) no Postgres: as partições são
+    criadas com antecedência e removidas pela retenção em
+    `app.database.partitions`. Filtre sempre por janela de `created_at` para
+    que o planner leia apenas as partições da janela.
+    """
     __tablename__ = "skill_usage_logs"
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
     
-    id = Column(Integer, primary_key=True, index=True)
+    # A chave de partição precisa fazer parte da PK
+    id = Column(Integer, primary_key=True, autoincrement=True)
     
     # Foreign Keys
     material_id = Column(Integer, ForeignKey("skill_materials.id", ondelete="CASCADE"), nullable=False, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, primary_key=True)
     
     # Metadados de uso (opcional)
     metadata_log = Column(JSON, nullable=True)
@@ -285,7 +306,7 @@ Model: SkillChunk (Chunk de Conhecimento)
 Armazena METADADOS dos chunks processados.
 Embeddings são armazenados no Qdrant (não aqui!).
 """
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum, DateTime, Boolean, Text, JSON
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum, DateTime, Boolean, Text, JSON, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database.db import Base
@@ -294,6 +315,9 @@ from app.database.enum import ChunkType
 
 class SkillChunk(Base):
     __tablename__ = "skill_chunks"
+    __table_args__ = (
+        Index("ix_skill_chunks_skill_id_synced_to_qdrant", "skill_id", "synced_to_qdrant"),
+    )
     
     # Primary Key
     id = Column(Integer, primary_key=True, index=True)
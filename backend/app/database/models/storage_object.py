@@ -0,0 +1,47 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer, String, UniqueConstraint, text
+
+from app.database.db import Base
+
+
+class StorageObject(Base):
+    """
+    Objeto do storage endereçado por conteúdo (SHA-256), único por workspace.
+
+    Uploads de um arquivo que o workspace já tem reaproveitam `storage_key` em
+    vez de enviar de novo. `ref_count` conta as fontes de conhecimento e os
+    materiais que apontam para o objeto; ele só é removido do storage quando a
+    última referência é apagada. A chave física é única por upload (nunca
+    reaproveitada), então a remoção de um objeto coletado não alcança um
+    reenvio posterior do mesmo conteúdo.
+
+    Um upload é registrado com `ref_count = 0`; se nunca for vinculado a uma
+    fonte de conhecimento/material, é coletado depois de
+    STORAGE_UNREFERENCED_TTL_HOURS (ver `app.services.storage_gc`).
+    """
+    __tablename__ = "storage_objects"
+    __table_args__ = (
+        UniqueConstraint("workspace_id", "file_hash", name="uq_storage_objects_workspace_id_file_hash"),
+        # Só as linhas sem referências, na ordem em que a coleta as procura
+        Index("ix_storage_objects_unreferenced", "created_at", postgresql_where=text("ref_count = 0")),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    workspace_id = Column(Integer, ForeignKey("workspaces.id", ondelete="CASCADE"), nullable=False)
+
+    file_hash = Column(String(64), nullable=False)  # SHA-256
+    storage_key = Column(String(1000), nullable=False, unique=True)
+    bucket = Column(String(255), nullable=False)
+    url = Column(String(2000), nullable=True)
+    provider = Column(String(10), nullable=False)
+    file_size = Column(BigInteger, nullable=False)
+    content_type = Column(String(100), nullable=True)
+
+    ref_count = Column(Integer, default=0, nullable=False)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<StorageObject(id={self.id}, workspace_id={self.workspace_id}, refs={self.ref_count})>"
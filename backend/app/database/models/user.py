@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Boolean
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from datetime import datetime
 from app.database.db import Base
 
 class User(Base):
@@ -15,3 +16,19 @@ class User(Base):
     is_superuser = Column(Boolean, default=False)
 
     google_id = Column(String, unique=True, nullable=True, index=True)
+
+    # Incrementado a cada revogação (troca de senha, desativação); vai assinado no token
+    token_version = Column(Integer, default=0, nullable=False, server_default="0")
+
+
+class RevokedToken(Base):
+    """
+    Denylist de tokens revogados.
+    Cada linha revoga todos os tokens de um usuário emitidos com `token_version`.
+    """
+    __tablename__ = "revoked_tokens"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    token_version = Column(Integer, primary_key=True)
+    revoked_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)  # Após isso, nenhum token da versão é válido
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database.db import Base
@@ -28,6 +28,8 @@ class WorkspaceMember(Base):
     Define direitos granulares dentro de um projeto/área específica.
     """
     __tablename__ = "workspace_members"
+    # A PK começa por user_id; listagens por workspace precisam deste índice
+    __table_args__ = (Index("ix_workspace_members_workspace_id_user_id", "workspace_id", "user_id"),)
     
     user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
     workspace_id = Column(Integer, ForeignKey("workspaces.id"), primary_key=True)
@@ -0,0 +1,186 @@
+"""
+Manutenção das tabelas particionadas por mês (RANGE em `created_at`).
+
+Cada tabela em PARTITIONED_TABLES tem uma partição por mês, com o nome
+`<tabela>_pYYYYMM` e limites [1º dia do mês, 1º dia do mês seguinte). O job:
+
+    - cria as partições do mês atual até PARTITION_MONTHS_AHEAD meses à frente
+      (sem partição DEFAULT, um INSERT num mês sem partição falha; por isso
+      elas são criadas com antecedência e também no startup)
+    - remove as partições inteiramente fora da retenção com DETACH + DROP, em
+      vez de DELETE: sem varrer linhas, sem bloat e sem VACUUM
+
+Roda num worker por vez (advisory lock) e só no Postgres. Com `lock_timeout`
+curto, uma rodada que esbarra em transações longas desiste e tenta de novo no
+próximo ciclo, em vez de enfileirar as queries da tabela atrás do DDL.
+"""
+import asyncio
+import re
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger
+from app.core.metrics import registry
+from settings import settings
+
+logger = get_logger(__name__)
+
+# Chave do advisory lock da manutenção (arbitrária, fixa)
+MAINTENANCE_LOCK_KEY = 0x70617274
+
+# Tabela -> meses de retenção (0 = guarda tudo)
+PARTITIONED_TABLES = {
+    "skill_usage_logs": settings.SKILL_USAGE_LOG_RETENTION_MONTHS,
+}
+
+LIST_PARTITIONS = text("""
+    SELECT c.relname
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = to_regclass(:table)
+""")
+
+
+def month_start(value: datetime | date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+def partition_month(table: str, name: str) -> Optional[date]:
+    """Mês de uma partição pelo nome (None se não segue a convenção)."""
+    match = re.fullmatch(rf"{re.escape(table)}_p(\d{{4}})(\d{{2}})", name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def create_partition_ddl(table: str, month: date) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, month)} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+async def ensure_partitions(db: AsyncSession, table: str, now: datetime, months_ahead: int) -> list[str]:
+    """
+    Cria as partições que faltam, do mês de `now` até `months_ahead` meses à frente.
+
+    :param db: Sessão (o commit fica com o chamador).
+    :param table: Tabela particionada.
+    :param now: Referência (UTC, sem timezone, como `created_at`).
+    :param months_ahead: Meses futuros a manter criados.
+    :return: Nomes das partições criadas.
+    """
+    existing = set((await db.scalars(LIST_PARTITIONS, {"table": table})).all())
+    current = month_start(now)
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        if partition_name(table, month) in existing:
+            continue
+        await db.execute(text(create_partition_ddl(table, month)))
+        created.append(partition_name(table, month))
+    return created
+
+
+async def drop_expired_partitions(db: AsyncSession, table: str, now: datetime, retention_months: int) -> list[str]:
+    """
+    Remove as partições cujos dados são todos anteriores à retenção.
+
+    Mantém o mês atual e os `retention_months` meses anteriores.
+
+    :param db: Sessão (o commit fica com o chamador).
+    :param table: Tabela particionada.
+    :param now: Referência (UTC, sem timezone, como `created_at`).
+    :param retention_months: Meses completos a manter (0 = não remove nada).
+    :return: Nomes das partições removidas.
+    """
+    if retention_months <= 0:
+        return []
+    cutoff = add_months(month_start(now), -retention_months)
+    dropped = []
+    for name in sorted((await db.scalars(LIST_PARTITIONS, {"table": table})).all()):
+        month = partition_month(table, name)
+        if month is None or add_months(month, 1) > cutoff:
+            continue
+        await db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+        await db.execute(text(f"DROP TABLE {name}"))
+        dropped.append(name)
+    return dropped
+
+
+class PartitionMaintenance:
+    """Criação antecipada e retenção das partições mensais."""
+
+    def __init__(self, tables: dict[str, int], months_ahead: int, interval: int, lock_timeout_ms: int = 5000):
+        self.tables = tables
+        self.months_ahead = months_ahead
+        self.interval = interval
+        self.lock_timeout_ms = lock_timeout_ms
+        self._task: Optional[asyncio.Task] = None
+        self.created = registry.counter("db_partitions_created_total", "Partições mensais criadas")
+        self.dropped = registry.counter("db_partitions_dropped_total", "Partições removidas pela retenção")
+
+    async def run(self, session_factory, now: Optional[datetime] = None) -> Optional[dict[str, dict[str, list[str]]]]:
+        """Uma rodada; retorna o que foi criado/removido, ou None se não se aplica ou outro worker está rodando."""
+        now = now or datetime.utcnow()
+        report = {}
+        async with session_factory() as db:
+            if db.get_bind().dialect.name != "postgresql":
+                return None
+            locked = await db.scalar(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": MAINTENANCE_LOCK_KEY})
+            if not locked:
+                return None
+            await db.execute(text(f"SET LOCAL lock_timeout = {int(self.lock_timeout_ms)}"))
+            for table, retention_months in self.tables.items():
+                created = await ensure_partitions(db, table, now, self.months_ahead)
+                dropped = await drop_expired_partitions(db, table, now, retention_months)
+                report[table] = {"created": created, "dropped": dropped}
+            await db.commit()
+        for table, changes in report.items():
+            self.created.inc(len(changes["created"]))
+            self.dropped.inc(len(changes["dropped"]))
+            if changes["created"] or changes["dropped"]:
+                logger.info(f"Partições de {table}: criadas {changes['created']}, removidas {changes['dropped']}")
+        return report
+
+    async def _loop(self, session_factory) -> None:
+        while True:
+            try:
+                await self.run(session_factory)
+            except Exception as e:
+                # Ex: lock_timeout atrás de uma transação longa; tenta no próximo ciclo
+                logger.warning(f"Falha na manutenção das partições: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self, session_factory) -> None:
+        """Roda uma vez já no startup e depois a cada `interval` segundos."""
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._loop(session_factory))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+partition_maintenance = PartitionMaintenance(
+    tables=PARTITIONED_TABLES,
+    months_ahead=settings.PARTITION_MONTHS_AHEAD,
+    interval=settings.PARTITION_MAINTENANCE_SECONDS,
+)
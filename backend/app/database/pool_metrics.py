@@ -0,0 +1,133 @@
+"""
+Instrumentação do pool de conexões do SQLAlchemy.
+
+Coleta, a partir dos eventos do pool:
+    - tempo de espera no checkout (histograma) e timeouts
+    - conexões em uso / overflow / ociosas (gauges calculados na leitura)
+    - tempo de vida das conexões físicas e tempo em que ficam retidas
+    - checkouts e conexões retidas por rota
+
+Os dados ficam no registro de `app.core.metrics` e são expostos em
+`/api/internal/metrics`, permitindo dimensionar `pool_size`/`max_overflow`.
+"""
+import time
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.logging import method_var, scope_var
+from app.core.metrics import registry
+
+LIFETIME_BUCKETS = (1, 10, 60, 300, 900, 1800, 3600, 7200)
+
+_instrumented: dict[str, Any] = {}
+
+
+def current_route() -> str:
+    """
+    Template da rota corrente (ex: GET /api/skill/{skill_id}/knowledge).
+
+    Usa a rota casada pelo roteador, nunca o path bruto: UUIDs, slugs e paths
+    de scanners criariam uma série de métricas nova a cada valor. Requisições
+    que não casaram com nenhuma rota ficam todas em "unmatched".
+    """
+    scope = scope_var.get()
+    if scope is None:
+        return "-"
+    template = getattr(scope.get("route"), "path", None)
+    # Sem o método: scanners mandam métodos arbitrários também
+    return f"{method_var.get()} {template}" if template else "unmatched"
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool que mede o tempo de checkout (espera + conexão + pre-ping)."""
+
+    metrics_label = "primary"
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            registry.counter(
+                "db_pool_checkout_timeouts_total", "Checkouts que estouraram pool_timeout",
+                labels={"engine": self.metrics_label},
+            ).inc()
+            raise
+        finally:
+            registry.histogram(
+                "db_pool_checkout_wait_seconds", "Tempo para obter uma conexão do pool",
+                labels={"engine": self.metrics_label},
+            ).observe(time.perf_counter() - start)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics_label = self.metrics_label
+        return pool
+
+
+def instrument_engine(engine, label: str) -> None:
+    """Registra os eventos e gauges de pool para um AsyncEngine."""
+    sync_engine = engine.sync_engine
+    if isinstance(sync_engine.pool, InstrumentedAsyncPool):
+        sync_engine.pool.metrics_label = label
+    _instrumented[label] = sync_engine
+    labels = {"engine": label}
+
+    registry.gauge("db_pool_size", "pool_size configurado", labels, fn=lambda: sync_engine.pool.size())
+    registry.gauge("db_pool_checked_out", "Conexões em uso", labels, fn=lambda: sync_engine.pool.checkedout())
+    registry.gauge("db_pool_checked_in", "Conexões ociosas no pool", labels, fn=lambda: sync_engine.pool.checkedin())
+    registry.gauge("db_pool_overflow", "Conexões de overflow abertas", labels, fn=lambda: sync_engine.pool.overflow())
+
+    connections_created = registry.counter("db_pool_connections_created_total", "Conexões físicas abertas", labels)
+    lifetime = registry.histogram(
+        "db_pool_connection_lifetime_seconds", "Tempo de vida das conexões físicas", labels, LIFETIME_BUCKETS
+    )
+    held = registry.histogram("db_pool_connection_held_seconds", "Tempo entre checkout e checkin", labels)
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        connection_record.info["created_at"] = time.monotonic()
+        connections_created.inc()
+
+    @event.listens_for(sync_engine, "close")
+    def _on_close(dbapi_connection, connection_record):
+        created_at = connection_record.info.pop("created_at", None)
+        if created_at is not None:
+            lifetime.observe(time.monotonic() - created_at)
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        route = current_route()
+        connection_record.info["checkout_at"] = time.monotonic()
+        connection_record.info["route"] = route
+        route_labels = {"engine": label, "route": route}
+        registry.counter("db_pool_checkouts_total", "Checkouts por rota", route_labels).inc()
+        registry.gauge("db_pool_connections_held", "Conexões retidas por rota", route_labels).inc()
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        checkout_at = connection_record.info.pop("checkout_at", None)
+        route = connection_record.info.pop("route", None)
+        if checkout_at is not None:
+            held.observe(time.monotonic() - checkout_at)
+        if route is not None:
+            registry.gauge("db_pool_connections_held", "Conexões retidas por rota", {"engine": label, "route": route}).dec()
+
+
+def pool_status() -> dict[str, dict]:
+    """Estado atual de cada pool instrumentado."""
+    status = {}
+    for label, sync_engine in _instrumented.items():
+        pool = sync_engine.pool
+        status[label] = {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout(),
+        }
+    return status
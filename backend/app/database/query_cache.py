@@ -0,0 +1,422 @@
+"""
+Cache read-through de leituras de repositório, invalidado por tags.
+
+Cada entrada é indexada pela query (ex: `kanban_columns:by_board:7`) e marcada
+com tags de entidade (`workspace:{id}`, `board:{id}`, `skill:{id}`) mais a tag
+da tabela. Os valores são snapshots das colunas; a leitura devolve instâncias
+destacadas (detached), que servem para resposta/validação mas não devem ser
+alteradas e commitadas.
+
+Camadas:
+    - local: TTL + LRU por processo (QUERY_CACHE_LOCAL_TTL_SECONDS curto, pois
+      outros workers só enxergam invalidações pela camada compartilhada)
+    - compartilhada (opcional): backend plugável (`SharedCacheBackend`);
+      `RedisCacheBackend` é usado quando QUERY_CACHE_REDIS_URL está definida
+
+Invalidação: escritas via sessão (flush de new/dirty/deleted) e via statements
+de repositório (INSERT/UPDATE ... RETURNING, bulk) acumulam tags em
+`session.info`; elas são invalidadas após o commit e descartadas no rollback.
+Quando a tag da entidade não pode ser derivada (ex: bulk_delete só com PK),
+invalida-se a tag da tabela inteira.
+
+Preenchimento: as faltas carregam do primário (ver `BaseRepository.cached`),
+nunca da réplica, que pode devolver o estado anterior a uma escrita já
+invalidada. E toda invalidação avança uma época (por processo na camada
+local, no Redis na compartilhada): um `load` que começou antes de uma
+invalidação e terminou depois não é guardado, pois pode ter lido os dados
+antigos.
+
+A camada compartilhada guarda JSON (nunca pickle: acesso de escrita ao Redis
+não pode virar execução de código); os tipos das colunas são restaurados a
+partir do modelo.
+"""
+import asyncio
+import enum
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Iterable, Optional, Protocol, Sequence
+from uuid import UUID
+
+from cachetools import TTLCache
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core.logging import get_logger
+from app.core.metrics import registry
+from app.database.models.kanban_board import KanbanBoard
+from app.database.models.kanban_column import KanbanColumn
+from app.database.models.skill import Skill, SkillRetrievalConfig
+from app.database.models.workspace import Workspace
+from settings import settings
+
+logger = get_logger(__name__)
+
+# Modelo -> [(prefixo da tag, atributo)]
+ENTITY_TAGS: dict[type, list[tuple[str, str]]] = {
+    Workspace: [("workspace", "id")],
+    KanbanBoard: [("board", "id")],
+    KanbanColumn: [("board", "board_id")],
+    Skill: [("skill", "id")],
+    SkillRetrievalConfig: [("skill", "skill_id")],
+}
+
+
+def table_tag(model) -> str:
+    return f"table:{model.__tablename__}"
+
+
+def tags_for_values(model, values: dict[str, Any]) -> set[str]:
+    """Tags de um registro a partir de um dict de valores (tabela inteira se faltar atributo)."""
+    spec = ENTITY_TAGS.get(model)
+    if spec is None:
+        return set()
+    tags = set()
+    for prefix, attr in spec:
+        if values.get(attr) is None:
+            return {table_tag(model)}
+        tags.add(f"{prefix}:{values[attr]}")
+    return tags
+
+
+def tags_for_instance(obj: Any) -> set[str]:
+    """Tags de uma instância, incluindo valores anteriores de chaves alteradas (ex: coluna movida)."""
+    model = type(obj)
+    spec = ENTITY_TAGS.get(model)
+    if spec is None:
+        return set()
+    state = inspect(obj)
+    tags = set()
+    for prefix, attr in spec:
+        history = state.attrs[attr].history
+        values = [*history.added, *history.unchanged, *history.deleted]
+        if not values or any(value is None for value in values):
+            return {table_tag(model)}
+        tags.update(f"{prefix}:{value}" for value in values)
+    return tags
+
+
+class SharedCacheBackend(Protocol):
+    """Camada compartilhada entre workers (ex: Redis)."""
+
+    async def get(self, key: str) -> Optional[bytes]: ...
+
+    async def epoch(self) -> int: ...
+
+    async def set(self, key: str, value: bytes, ttl: int, tags: Sequence[str], epoch: int) -> None: ...
+
+    async def invalidate_tags(self, tags: Sequence[str]) -> None: ...
+
+
+class RedisCacheBackend:
+    """Backend compartilhado em Redis: chave com TTL + um SET de chaves por tag + a época."""
+
+    def __init__(self, url: str, prefix: str = "vora:qc:"):
+        import redis.asyncio as redis  # dependência opcional
+        from redis.exceptions import WatchError
+
+        self._redis = redis.from_url(url)
+        self._prefix = prefix
+        self._epoch_key = f"{prefix}epoch"
+        self._watch_error = WatchError
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._redis.get(self._prefix + key)
+
+    async def epoch(self) -> int:
+        return int(await self._redis.get(self._epoch_key) or 0)
+
+    async def set(self, key: str, value: bytes, ttl: int, tags: Sequence[str], epoch: int) -> None:
+        """Grava só se nenhuma invalidação aconteceu desde `epoch` (WATCH na época)."""
+        async with self._redis.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(self._epoch_key)
+                if int(await pipe.get(self._epoch_key) or 0) != epoch:
+                    return
+                pipe.multi()
+                pipe.set(self._prefix + key, value, ex=ttl)
+                for tag in tags:
+                    pipe.sadd(f"{self._prefix}tag:{tag}", key)
+                    pipe.expire(f"{self._prefix}tag:{tag}", ttl)
+                await pipe.execute()
+            except self._watch_error:
+                # Invalidação concorrente: o valor carregado pode estar defasado
+                return
+
+    async def invalidate_tags(self, tags: Sequence[str]) -> None:
+        # Época antes das remoções: um `set` em andamento falha no WATCH
+        await self._redis.incr(self._epoch_key)
+        for tag in tags:
+            tag_key = f"{self._prefix}tag:{tag}"
+            keys = await self._redis.smembers(tag_key)
+            if keys:
+                await self._redis.delete(*[self._prefix + key.decode() for key in keys])
+            await self._redis.delete(tag_key)
+
+
+def _snapshot(obj: Any) -> dict[str, Any]:
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(type(obj)).column_attrs}
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"Tipo não serializável no cache: {type(value).__name__}")
+
+
+_JSON_DECODERS: dict[type, Callable[[Any], Any]] = {
+    datetime: datetime.fromisoformat,
+    date: date.fromisoformat,
+    time: time.fromisoformat,
+    Decimal: Decimal,
+    UUID: UUID,
+}
+
+
+@lru_cache(maxsize=None)
+def _column_decoders(model) -> dict[str, Callable[[Any], Any]]:
+    """Conversores JSON -> tipo Python das colunas do modelo que não voltam nativas."""
+    decoders = {}
+    for attr in inspect(model).column_attrs:
+        try:
+            python_type = attr.columns[0].type.python_type
+        except NotImplementedError:
+            continue
+        if python_type in _JSON_DECODERS:
+            decoders[attr.key] = _JSON_DECODERS[python_type]
+        elif isinstance(python_type, type) and issubclass(python_type, enum.Enum):
+            decoders[attr.key] = python_type
+    return decoders
+
+
+def _dump(payload: Any) -> bytes:
+    return json.dumps(payload, default=_json_default, separators=(",", ":")).encode("utf-8")
+
+
+def _load(model, raw: bytes) -> Any:
+    payload = json.loads(raw)
+    decoders = _column_decoders(model)
+    for data in payload if isinstance(payload, list) else [payload]:
+        for key, decode in decoders.items():
+            if data.get(key) is not None:
+                data[key] = decode(data[key])
+    return payload
+
+
+def _materialize(model, data: dict[str, Any]):
+    obj = model(**data)
+    make_transient_to_detached(obj)
+    return obj
+
+
+class QueryCache:
+    """Cache read-through em duas camadas com invalidação por tags."""
+
+    def __init__(
+        self,
+        maxsize: int,
+        local_ttl: int,
+        shared_ttl: int,
+        shared: Optional[SharedCacheBackend] = None,
+        enabled: bool = True,
+    ):
+        self.enabled = enabled
+        self.shared = shared
+        self.shared_ttl = shared_ttl
+        self._local: TTLCache = TTLCache(maxsize=maxsize, ttl=local_ttl)
+        self._tag_index: dict[str, set[str]] = {}
+        self._index_size = 0
+        self._epoch = 0
+        self._tasks: set = set()
+        self.invalidations = registry.counter("query_cache_invalidations_total", "Tags invalidadas")
+        registry.gauge("query_cache_local_entries", "Entradas na camada local", fn=lambda: len(self._local))
+        registry.gauge("query_cache_hit_ratio", "Acertos / consultas (local + compartilhada)", fn=self.hit_ratio)
+
+    def _count(self, tier: str, result: str) -> None:
+        registry.counter("query_cache_requests_total", "Consultas ao cache por camada", {"tier": tier, "result": result}).inc()
+
+    def hit_ratio(self) -> float:
+        hits = sum(
+            registry.counter("query_cache_requests_total", labels={"tier": tier, "result": "hit"}).value
+            for tier in ("local", "shared")
+        )
+        misses = registry.counter("query_cache_requests_total", labels={"tier": "shared", "result": "miss"}).value
+        total = hits + misses
+        return hits / total if total else 0.0
+
+    def _store_local(self, key: str, tags: Iterable[str], payload: Any) -> None:
+        tags = tuple(tags)
+        self._local[key] = (tags, payload)
+        for tag in tags:
+            self._tag_index.setdefault(tag, set()).add(key)
+        self._index_size += len(tags)
+        if self._index_size > 4 * self._local.maxsize:
+            self._rebuild_index()
+
+    def _rebuild_index(self) -> None:
+        # Remove do índice as chaves que já expiraram/foram despejadas da camada local
+        index: dict[str, set[str]] = {}
+        for key, (tags, _) in list(self._local.items()):
+            for tag in tags:
+                index.setdefault(tag, set()).add(key)
+        self._tag_index = index
+        self._index_size = sum(len(keys) for keys in index.values())
+
+    async def fetch(
+        self,
+        model,
+        key: str,
+        tags: Iterable[str],
+        load: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Lê `key` do cache ou executa `load` e guarda o resultado.
+
+        Além de `tags`, a entrada recebe as tags das entidades carregadas e a
+        tag da tabela. `load` deve retornar uma instância de `model`, uma lista delas ou None
+        (None não é guardado) e ler do primário. O resultado não é guardado se
+        houve uma invalidação enquanto `load` rodava.
+        """
+        if not self.enabled:
+            return await load()
+
+        cached = self._local.get(key)
+        if cached is not None:
+            self._count("local", "hit")
+            return self._decode(model, cached[1])
+        self._count("local", "miss")
+
+        tags = {*tags, table_tag(model)}
+        local_epoch = self._epoch
+        shared_epoch = None
+        if self.shared is not None:
+            try:
+                raw = await self.shared.get(key)
+                shared_epoch = await self.shared.epoch()
+            except Exception as e:
+                logger.warning(f"Falha ao ler cache compartilhado: {e}")
+                raw = None
+            if raw is not None:
+                try:
+                    payload = _load(model, raw)
+                except (ValueError, TypeError, KeyError) as e:
+                    logger.warning(f"Entrada inválida no cache compartilhado ({key}): {e}")
+                else:
+                    self._count("shared", "hit")
+                    if self._epoch == local_epoch:
+                        self._store_local(key, tags, payload)
+                    return self._decode(model, payload)
+        self._count("shared", "miss")
+
+        result = await load()
+        if result is None:
+            return result
+        payload = [_snapshot(obj) for obj in result] if isinstance(result, list) else _snapshot(result)
+        for data in payload if isinstance(payload, list) else [payload]:
+            tags |= tags_for_values(model, data)
+        # Invalidação durante o load: o resultado pode ser anterior à escrita
+        if self._epoch == local_epoch:
+            self._store_local(key, tags, payload)
+        if self.shared is not None and shared_epoch is not None:
+            try:
+                await self.shared.set(key, _dump(payload), self.shared_ttl, sorted(tags), shared_epoch)
+            except Exception as e:
+                logger.warning(f"Falha ao gravar cache compartilhado: {e}")
+        return result
+
+    @staticmethod
+    def _decode(model, payload: Any) -> Any:
+        if isinstance(payload, list):
+            return [_materialize(model, data) for data in payload]
+        return _materialize(model, payload)
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        """Invalida as tags na camada local e (em background) na compartilhada."""
+        tags = set(tags)
+        if not tags:
+            return
+        self._epoch += 1
+        for tag in tags:
+            keys = self._tag_index.pop(tag, ())
+            self._index_size -= len(keys)
+            for key in keys:
+                self._local.pop(key, None)
+        self.invalidations.inc(len(tags))
+        if self.shared is not None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return
+            task = loop.create_task(self._invalidate_shared(tags))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _invalidate_shared(self, tags: set[str]) -> None:
+        try:
+            await self.shared.invalidate_tags(sorted(tags))
+        except Exception as e:
+            logger.warning(f"Falha ao invalidar cache compartilhado: {e}")
+
+    def clear(self) -> None:
+        self._local.clear()
+        self._tag_index.clear()
+        self._index_size = 0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "shared": type(self.shared).__name__ if self.shared is not None else None,
+            "local_size": len(self._local),
+            "local_maxsize": self._local.maxsize,
+            "local_ttl": self._local.ttl,
+            "hit_ratio": self.hit_ratio(),
+        }
+
+
+def mark_tags(session: Session, tags: Iterable[str]) -> None:
+    """Agenda a invalidação das tags para depois do commit da sessão."""
+    session.info.setdefault("cache_tags", set()).update(tags)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_tags(session, flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if type(obj) in ENTITY_TAGS:
+            mark_tags(session, tags_for_instance(obj))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_tags(session):
+    tags = session.info.pop("cache_tags", None)
+    if tags:
+        query_cache.invalidate(tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_tags(session):
+    session.info.pop("cache_tags", None)
+
+
+def _build_shared_backend() -> Optional[SharedCacheBackend]:
+    if not settings.QUERY_CACHE_REDIS_URL:
+        return None
+    try:
+        return RedisCacheBackend(settings.QUERY_CACHE_REDIS_URL)
+    except ImportError:
+        # Sem o pacote `redis` instalado, segue apenas com a camada local
+        logger.warning("QUERY_CACHE_REDIS_URL definida, mas o pacote 'redis' não está instalado")
+        return None
+
+
+query_cache = QueryCache(
+    maxsize=settings.QUERY_CACHE_MAXSIZE,
+    local_ttl=settings.QUERY_CACHE_LOCAL_TTL_SECONDS,
+    shared_ttl=settings.QUERY_CACHE_SHARED_TTL_SECONDS,
+    shared=_build_shared_backend() if settings.QUERY_CACHE_ENABLED else None,
+    enabled=settings.QUERY_CACHE_ENABLED,
+)
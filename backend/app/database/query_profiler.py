@@ -0,0 +1,150 @@
+"""
+Profiler de queries por requisição.
+
+Escuta `before_cursor_execute`/`after_cursor_execute` dos engines e acumula,
+no contexto da requisição corrente, a quantidade de statements e o tempo total
+no banco. O middleware:
+
+    - expõe os números no header `Server-Timing` (visível no DevTools)
+    - registra histogramas por rota em `app.core.metrics`
+    - loga statements idênticos repetidos na mesma requisição (provável N+1)
+    - conta os commits de sessão por requisição (o unit of work deve dar 1)
+    - conta as requisições que terminaram sem fazer checkout de conexão
+      (a sessão de `get_db` só pega uma conexão do pool no primeiro execute)
+
+Os logs saem com o `request_id` de `app.core.logging`.
+"""
+import contextvars
+import time
+from collections import Counter as StatementCounter
+from dataclasses import dataclass, field
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.logging import get_logger, request_id_var
+from app.core.metrics import registry
+from app.database.pool_metrics import current_route
+from settings import settings
+
+logger = get_logger(__name__)
+
+QUERY_COUNT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 250)
+COMMIT_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10)
+
+
+@dataclass
+class QueryProfile:
+    """Statements executados durante uma requisição."""
+
+    request_id: str
+    checkouts: int = 0
+    commits: int = 0
+    count: int = 0
+    db_time: float = 0.0
+    statements: StatementCounter = field(default_factory=StatementCounter)
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.db_time += elapsed
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statements idênticos executados `threshold` vezes ou mais."""
+        return [(statement, n) for statement, n in self.statements.most_common() if n >= threshold]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.db_time * 1000:.2f};desc="{self.count} queries, {self.commits} commits"'
+
+
+_profile_var: contextvars.ContextVar[Optional[QueryProfile]] = contextvars.ContextVar("query_profile", default=None)
+
+
+def current_profile() -> Optional[QueryProfile]:
+    return _profile_var.get()
+
+
+def profile_engine(engine) -> None:
+    """Registra os eventos do profiler em um AsyncEngine."""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        profile = _profile_var.get()
+        if profile is not None:
+            profile.checkouts += 1
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("query_start")
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        profile = _profile_var.get()
+        if profile is not None:
+            profile.record(statement, elapsed)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(exception_context):
+        # Statement que falhou não passa pelo after_cursor_execute: tira seu início da pilha
+        conn = exception_context.connection
+        if conn is not None and exception_context.execution_context is not None:
+            starts = conn.info.get("query_start")
+            if starts:
+                starts.pop()
+
+
+@event.listens_for(Session, "after_commit")
+def _on_commit(session):
+    profile = _profile_var.get()
+    if profile is not None:
+        profile.commits += 1
+
+
+def _shorten(statement: str, size: int = 200) -> str:
+    flat = " ".join(statement.split())
+    return flat if len(flat) <= size else f"{flat[:size]}..."
+
+
+async def query_profiler_middleware(request, call_next):
+    profile = QueryProfile(request_id=request_id_var.get())
+    token = _profile_var.set(profile)
+    try:
+        response = await call_next(request)
+    finally:
+        _profile_var.reset(token)
+
+    registry.counter(
+        "http_requests_db_usage_total",
+        "Requisições por uso do banco (touched_db=false: nenhuma conexão retirada do pool)",
+        {"touched_db": "true" if profile.checkouts else "false"},
+    ).inc()
+    if not settings.QUERY_PROFILER_ENABLED:
+        return response
+
+    response.headers["Server-Timing"] = profile.server_timing()
+    logger.debug(f"{profile.count} queries, {profile.db_time * 1000:.1f} ms no banco")
+
+    route = current_route()
+    registry.histogram(
+        "db_queries_per_request", "Statements SQL por requisição", {"route": route}, QUERY_COUNT_BUCKETS
+    ).observe(profile.count)
+    registry.histogram(
+        "db_time_per_request_seconds", "Tempo no banco por requisição", {"route": route}
+    ).observe(profile.db_time)
+    registry.histogram(
+        "db_commits_per_request", "Commits de sessão por requisição", {"route": route}, COMMIT_COUNT_BUCKETS
+    ).observe(profile.commits)
+
+    for statement, n in profile.repeated(settings.QUERY_PROFILER_N_PLUS_ONE_THRESHOLD):
+        registry.counter("db_n_plus_one_suspects_total", "Statements repetidos (possível N+1)", {"route": route}).inc()
+        logger.warning(
+            f"Possível N+1: statement executado {n}x na mesma requisição "
+            f"({profile.count} queries, {profile.db_time * 1000:.1f} ms no banco): {_shorten(statement)}"
+        )
+    return response
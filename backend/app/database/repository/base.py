@@ -1,11 +1,66 @@
-from typing import Any, Generic, Type, TypeVar
+import base64
+import binascii
+import copy
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Generic, Iterable, Optional, Sequence, Type, TypeVar
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from app.database.db import Base
+from sqlalchemy import select, insert, update, delete, inspect, tuple_, Select
+from app.database.db import Base, async_session
+from app.database.query_cache import ENTITY_TAGS, mark_tags, query_cache, table_tag, tags_for_instance, tags_for_values
 
 # Define um tipo genérico para os modelos SQLAlchemy
 ModelType = TypeVar("ModelType", bound=Base)
 
+
+class InvalidCursorError(ValueError):
+    """Cursor de paginação malformado ou incompatível com a listagem."""
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Serializa os valores da chave de ordenação em um cursor opaco (base64 url-safe)."""
+    payload = [{"dt": value.isoformat()} if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _check_cursor_value(value: Any, key: Any) -> Any:
+    """Confere (ou converte) um valor do cursor contra o tipo Python da coluna da chave."""
+    try:
+        expected = key.type.python_type
+    except NotImplementedError:
+        return value
+    # bool é subclasse de int: true/false não valem como id
+    if isinstance(value, bool) and expected is not bool:
+        raise InvalidCursorError("Cursor inválido")
+    if expected is float and isinstance(value, int):
+        return float(value)
+    if not isinstance(value, expected):
+        raise InvalidCursorError("Cursor inválido")
+    return value
+
+
+def decode_cursor(cursor: str, keys: Sequence[Any]) -> list[Any]:
+    """Inverso de `encode_cursor`; valida a quantidade e o tipo das chaves esperadas."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        values = [datetime.fromisoformat(value["dt"]) if isinstance(value, dict) else value for value in payload]
+    except (binascii.Error, ValueError, TypeError, KeyError) as e:
+        raise InvalidCursorError("Cursor inválido") from e
+    if not isinstance(payload, list) or len(values) != len(keys):
+        raise InvalidCursorError("Cursor inválido")
+    return [_check_cursor_value(value, key) for value, key in zip(values, keys)]
+
+
+@dataclass
+class Page(Generic[ModelType]):
+    """Uma página de resultados; `next_cursor` é None na última página."""
+
+    items: list[Any] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
 class BaseRepository(Generic[ModelType]):
     """
     Classe base genérica para operações CRUD.
@@ -33,47 +88,199 @@ class BaseRepository(Generic[ModelType]):
         """
         return await self.db.get(self.model, pk)
 
+    async def get_cached(self, pk: Any) -> ModelType | None:
+        """
+        Busca pela chave primária passando pelo cache de queries (opt-in).
+
+        Retorna uma instância destacada quando vem do cache: use apenas para
+        leitura/resposta, nunca para alterar e commitar.
+
+        :param pk: O valor da chave primária.
+        :return: A instância do modelo ou None se não for encontrado.
+        """
+        key = f"{self.model.__tablename__}:pk:{pk}"
+        return await self.cached(key, (), lambda repo: repo.get(pk))
+
+    async def cached(self, key: str, tags: Iterable[str], load: Callable[[Any], Awaitable[Any]]) -> Any:
+        """
+        Leitura read-through pelo cache de queries (ver `app.database.query_cache`).
+
+        As faltas carregam do primário, sempre numa sessão curta e própria:
+        a réplica pode ainda não ter a escrita cuja invalidação acabou de
+        acontecer, e a sessão do chamador pode ter alterações ainda não
+        commitadas (ou que serão desfeitas) no identity map. Em ambos os casos
+        o valor errado ficaria no cache por todo o TTL.
+
+        :param key: Chave que identifica a query (inclua o nome da tabela e os argumentos).
+        :param tags: Tags de entidade das quais o resultado depende, ex: ["board:7"].
+        :param load: Recebe um repositório (ligado ao primário) e executa a query;
+            deve retornar instância(s) do modelo ou None.
+        :return: O resultado da query (do cache ou do banco).
+        """
+        if not query_cache.enabled:
+            return await load(self)
+
+        async def load_from_primary() -> Any:
+            async with async_session() as session:
+                repository = copy.copy(self)
+                repository.db = session
+                return await load(repository)
+
+        return await query_cache.fetch(self.model, key, tags, load_from_primary)
+
+    def _mark_written(self, objs: Iterable[Any] = (), rows: Iterable[dict[str, Any]] = ()) -> None:
+        """
+        Registra escritas feitas fora do flush (INSERT/UPDATE/DELETE diretos).
+
+        Agenda a invalidação das tags do cache para depois do commit e sinaliza
+        a escrita para o read-your-writes (que só enxerga flushes do ORM).
+        """
+        self.db.info["has_writes"] = True
+        tags: set[str] = set()
+        for obj in objs:
+            tags |= tags_for_instance(obj)
+        for row in rows:
+            tags |= tags_for_values(self.model, row)
+        if tags:
+            mark_tags(self.db, tags)
+
     async def get_all(self, skip: int = 0, limit: int = 100) -> list[ModelType]:
         """
         :param skip: O número de registros a pular.
         :param limit: O número máximo de registros a retornar.
         :return: Uma lista de instâncias do modelo.
         """
-        statement = select(self.model).offset(skip).limit(limit)
-        result = await self.db.execute(statement)
-        return result.scalars().all()
+        return (await self.get_page(skip=skip, limit=limit)).items
+
+    async def get_page(self, cursor: str | None = None, skip: int = 0, limit: int = 100) -> Page[ModelType]:
+        """
+        Lista todos os registros paginando pela chave primária.
+
+        :param cursor: Cursor retornado pela página anterior (tem precedência sobre skip).
+        :param skip: O número de registros a pular (compatibilidade, sem cursor).
+        :param limit: O número máximo de registros a retornar.
+        :return: A página com os registros e o cursor da próxima.
+        """
+        keys = [getattr(self.model, column.key) for column in self._primary_key()]
+        return await self.paginate(select(self.model), keys, cursor=cursor, skip=skip, limit=limit)
+
+    async def paginate(
+        self,
+        statement: Select,
+        keys: Sequence[Any],
+        cursor: str | None = None,
+        skip: int = 0,
+        limit: int = 100,
+        descending: bool = False,
+        scalars: bool = True,
+    ) -> Page:
+        """
+        Pagina um SELECT por keyset (cursor) sobre uma chave de ordenação indexada.
+
+        A ordenação é `keys` (todas na mesma direção) e a condição de
+        continuação é a comparação de tupla `(k1, k2, ...) > (v1, v2, ...)`
+        (ou `<` se `descending`), que o PostgreSQL resolve com o índice
+        composto correspondente, sem o custo linear do OFFSET. As chaves
+        devem identificar a linha de forma única (inclua a PK como desempate).
+
+        Sem cursor, `skip` ainda é aplicado como OFFSET para compatibilidade;
+        a página retornada já traz o cursor para continuar por keyset.
+
+        :param statement: O SELECT com os filtros da listagem (sem ORDER BY/LIMIT).
+        :param keys: Atributos da chave de ordenação, ex: (KanbanBoard.updated_at, KanbanBoard.id).
+        :param cursor: Cursor opaco da página anterior.
+        :param skip: OFFSET usado apenas quando não há cursor.
+        :param limit: Tamanho da página.
+        :param descending: Ordena e continua em ordem decrescente.
+        :param scalars: Se False, retorna linhas (tuplas); a entidade das chaves deve ser a primeira coluna.
+        :return: A página com os itens e o `next_cursor` (None na última página).
+        """
+        statement = statement.order_by(*[key.desc() if descending else key.asc() for key in keys])
+        if cursor:
+            values = decode_cursor(cursor, keys)
+            if len(keys) == 1:
+                row_key, row_values = keys[0], values[0]
+            else:
+                row_key, row_values = tuple_(*keys), tuple(values)
+            statement = statement.where(row_key < row_values if descending else row_key > row_values)
+        elif skip:
+            statement = statement.offset(skip)
+        result = await self.db.execute(statement.limit(limit + 1))
+        items = list(result.scalars().all() if scalars else result.all())
 
-    async def create(self, obj: ModelType) -> ModelType:
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            last = items[-1] if scalars else items[-1][0]
+            next_cursor = encode_cursor([getattr(last, key.key) for key in keys])
+        return Page(items=items, next_cursor=next_cursor)
+
+    async def create(self, obj: ModelType | dict[str, Any]) -> ModelType:
         """
-        Adiciona um novo objeto à sessão do banco de dados.
+        Insere um novo registro com um único INSERT ... RETURNING.
+
+        Colunas geradas pelo BD ou por defaults (ex: ID, created_at, updated_at)
+        voltam na mesma ida ao banco, sem flush + refresh.
 
         Nota: A transação não é "commitada" aqui. Isso deve ser feito
         fora do repositório, na camada de serviço ou no endpoint.
 
-        :param obj: A instância do modelo a ser criada.
-        :return: A instância do modelo criada, com os dados do banco (ex: ID).
+        Apenas atributos de coluna são enviados; relacionamentos atribuídos na
+        instância são ignorados (use as chaves estrangeiras).
+
+        :param obj: A instância do modelo (transiente) ou dict de valores.
+        :return: A instância persistida, com os dados do BD (ex: ID).
         """
-        self.db.add(obj)
-        await self.db.flush()  # Garante que o objeto seja enviado ao BD e receba um ID
-        await self.db.refresh(obj) # Atualiza o objeto com os dados do BD
-        return obj
+        statement = insert(self.model).returning(self.model)
+        result = await self.db.scalars(statement, [self._as_values(obj)])
+        created = result.one()
+        self._mark_written([created])
+        return created
 
     async def update(self, pk: Any, data: dict[str, Any]) -> ModelType | None:
         """
-        Atualiza um registro existente no banco de dados.
+        Atualiza um registro existente com um único UPDATE ... RETURNING.
+
+        O registro não é carregado antes; a instância retornada (e a que já
+        estiver na sessão) reflete o estado gravado, incluindo `onupdate`.
 
-        :param pk: A chave primária do objeto a ser atualizado.
+        :param pk: A chave primária do objeto a ser atualizado (tupla para PK composta).
         :param data: Um dicionário com os campos a serem atualizados.
         :return: A instância do modelo atualizada ou None se não for encontrado.
         """
-        obj = await self.get(pk)
-        if obj:
-            for key, value in data.items():
-                if hasattr(obj, key):
-                    setattr(obj, key, value)
-            await self.db.flush()
-            await self.db.refresh(obj)
-        return obj
+        return await self.update_where(data, *self._pk_criteria(pk))
+
+    async def update_where(self, data: dict[str, Any], *criteria: Any) -> ModelType | None:
+        """
+        Atualiza o registro que atende aos critérios com UPDATE ... RETURNING.
+
+        Útil para combinar a chave primária com o escopo (ex: workspace_id),
+        dispensando o SELECT de verificação.
+
+        :param data: Um dicionário com os campos a serem atualizados.
+        :param criteria: Expressões do WHERE.
+        :return: A instância do modelo atualizada ou None se não for encontrado.
+        """
+        columns = {attr.key for attr in inspect(self.model).column_attrs}
+        values = {key: value for key, value in data.items() if key in columns}
+        if not values:
+            statement = select(self.model).where(*criteria)
+        else:
+            statement = (
+                update(self.model)
+                .where(*criteria)
+                .values(**values)
+                .returning(self.model)
+                .execution_options(synchronize_session=False, populate_existing=True)
+            )
+        result = await self.db.scalars(statement)
+        updated = result.one_or_none()
+        if updated is not None and values:
+            self._mark_written([updated])
+            if any(attr in values for _, attr in ENTITY_TAGS.get(self.model, ())):
+                # Chave de tag alterada (ex: board_id): o valor antigo é desconhecido aqui
+                mark_tags(self.db, [table_tag(self.model)])
+        return updated
 
     async def delete(self, pk: Any) -> ModelType | None:
         """
@@ -86,4 +293,108 @@ class BaseRepository(Generic[ModelType]):
         if obj:
             self.db.delete(obj)
             await self.db.flush()
-        return obj
\ No newline at end of file
+        return obj
+
+    def _primary_key(self) -> tuple:
+        return inspect(self.model).primary_key
+
+    def _pk_criteria(self, pk: Any) -> list:
+        pk_columns = self._primary_key()
+        pk_values = pk if isinstance(pk, tuple) else (pk,)
+        return [column == value for column, value in zip(pk_columns, pk_values)]
+
+    def _as_values(self, obj: ModelType | dict[str, Any]) -> dict[str, Any]:
+        if isinstance(obj, dict):
+            return obj
+        # Apenas atributos de coluna efetivamente atribuídos na instância
+        state = inspect(obj)
+        return {
+            attr.key: state.dict[attr.key]
+            for attr in inspect(self.model).column_attrs
+            if attr.key in state.dict
+        }
+
+    async def increment(self, pk: Any, deltas: dict[str, int]) -> int:
+        """
+        Soma deltas a colunas numéricas com um UPDATE atômico (`col = col + :delta`).
+
+        Sem read-modify-write: incrementos concorrentes não se perdem e o
+        registro não é carregado. A instância que já estiver na sessão não é
+        atualizada. Nota: a transação não é "commitada" aqui.
+
+        :param pk: A chave primária do registro (tupla para PK composta).
+        :param deltas: Coluna -> valor a somar (negativo para decrementar).
+        :return: Quantidade de registros afetados (0 se não existir).
+        """
+        columns = self.model.__table__.c
+        values = {columns[key]: columns[key] + delta for key, delta in deltas.items() if delta}
+        if not values:
+            return 0
+        statement = (
+            update(self.model)
+            .where(*self._pk_criteria(pk))
+            .values(values)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.execute(statement)
+        pk_values = pk if isinstance(pk, tuple) else (pk,)
+        self._mark_written(rows=[{column.key: value for column, value in zip(self._primary_key(), pk_values)}])
+        return result.rowcount
+
+    async def bulk_create(self, objs: Sequence[ModelType | dict[str, Any]]) -> list[ModelType]:
+        """
+        Insere vários registros em um único INSERT ... RETURNING (por lote).
+
+        Nota: a transação não é "commitada" aqui.
+
+        :param objs: Instâncias do modelo (transientes) ou dicts de valores.
+        :return: As instâncias criadas, com os dados gerados pelo BD (ex: ID).
+        """
+        if not objs:
+            return []
+        values = [self._as_values(obj) for obj in objs]
+        # O Postgres não garante a ordem do RETURNING em INSERTs de várias linhas:
+        # pede ao SQLAlchemy as linhas na ordem dos parâmetros
+        statement = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+        result = await self.db.scalars(statement, values)
+        created = list(result.all())
+        self._mark_written(created)
+        return created
+
+    async def bulk_update(self, rows: Sequence[dict[str, Any]]) -> int:
+        """
+        Atualiza vários registros via executemany de UPDATE ... WHERE pk = :pk.
+
+        Cada dict deve conter a(s) chave(s) primária(s) e os campos a alterar.
+        Os registros não são carregados antes. Nota: a transação não é "commitada" aqui.
+
+        :param rows: Lista de dicts com PK + valores.
+        :return: Quantidade de registros enviados para atualização.
+        """
+        if not rows:
+            return 0
+        await self.db.execute(update(self.model), list(rows))
+        self._mark_written(rows=rows)
+        return len(rows)
+
+    async def bulk_delete(self, pks: Sequence[Any]) -> int:
+        """
+        Remove vários registros com um único DELETE ... WHERE pk IN (...).
+
+        Nota: a transação não é "commitada" aqui.
+
+        :param pks: Valores de chave primária (tuplas para PK composta).
+        :return: Quantidade de registros removidos.
+        """
+        if not pks:
+            return 0
+        pk_columns = self._primary_key()
+        if len(pk_columns) == 1:
+            criteria = pk_columns[0].in_(list(pks))
+            pk_rows = [{pk_columns[0].key: pk} for pk in pks]
+        else:
+            criteria = tuple_(*pk_columns).in_([tuple(pk) for pk in pks])
+            pk_rows = [dict(zip([column.key for column in pk_columns], pk)) for pk in pks]
+        result = await self.db.execute(delete(self.model).where(criteria))
+        self._mark_written(rows=pk_rows)
+        return result.rowcount
@@ -1,8 +1,17 @@
-from sqlalchemy import select, desc
+import random
+from collections import defaultdict
+
+from sqlalchemy import bindparam, delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.models.kanban_board import KanbanBoard
-from app.database.repository.base import BaseRepository
+from app.database.models.kanban_board import KanbanBoard, KanbanBoardCounterShard
+from app.database.models.kanban_column import KanbanColumn
+from app.database.repository.base import BaseRepository, Page
+from settings import settings
+
+# Contadores desnormalizados de kanban_boards
+BOARD_COUNTERS = ("columns_count", "cards_count")
 
 
 class KanbanBoardRepository(BaseRepository[KanbanBoard]):
@@ -10,15 +19,21 @@ class KanbanBoardRepository(BaseRepository[KanbanBoard]):
         super().__init__(KanbanBoard, db)
 
     async def get_by_workspace(self, workspace_id: int, skip: int = 0, limit: int = 100) -> list[KanbanBoard]:
-        statement = (
-            select(KanbanBoard)
-            .where(KanbanBoard.workspace_id == workspace_id)
-            .order_by(desc(KanbanBoard.updated_at))
-            .offset(skip)
-            .limit(limit)
+        return (await self.get_page_by_workspace(workspace_id, skip=skip, limit=limit)).items
+
+    async def get_page_by_workspace(
+        self, workspace_id: int, cursor: str | None = None, skip: int = 0, limit: int = 100
+    ) -> Page[KanbanBoard]:
+        """Quadros do workspace, mais recentes primeiro, paginados por (updated_at, id)."""
+        statement = select(KanbanBoard).where(KanbanBoard.workspace_id == workspace_id)
+        return await self.paginate(
+            statement,
+            (KanbanBoard.updated_at, KanbanBoard.id),
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+            descending=True,
         )
-        result = await self.db.execute(statement)
-        return result.scalars().all()
 
     async def get_in_workspace(self, workspace_id: int, board_id: int) -> KanbanBoard | None:
         statement = select(KanbanBoard).where(
@@ -27,3 +42,113 @@ class KanbanBoardRepository(BaseRepository[KanbanBoard]):
         )
         result = await self.db.execute(statement)
         return result.scalar_one_or_none()
+
+    async def update_in_workspace(self, workspace_id: int, board_id: int, data: dict) -> KanbanBoard | None:
+        """Atualiza o quadro do workspace com um único UPDATE ... RETURNING (None se não existir)."""
+        return await self.update_where(
+            data,
+            KanbanBoard.id == board_id,
+            KanbanBoard.workspace_id == workspace_id,
+        )
+
+    async def add_to_counters(self, board_id: int, **deltas: int) -> None:
+        """
+        Soma deltas aos contadores do quadro na transação corrente, sem carregá-lo.
+
+        Com KANBAN_COUNTER_SHARDS = 0, é um UPDATE atômico na linha do quadro.
+        Com shards, o delta vai para uma linha aleatória de
+        `kanban_board_counter_shards` (upsert), evitando a fila no lock da
+        linha do quadro; o valor em `kanban_boards` fica defasado até o
+        próximo `fold_counter_shards`.
+
+        :param board_id: ID do quadro.
+        :param deltas: Contador -> delta, ex: columns_count=1.
+        """
+        unknown = set(deltas) - set(BOARD_COUNTERS)
+        if unknown:
+            raise ValueError(f"Contadores desconhecidos: {sorted(unknown)}")
+        deltas = {name: delta for name, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        if settings.KANBAN_COUNTER_SHARDS <= 0:
+            await self.increment(board_id, deltas)
+            return
+        shard = random.randrange(settings.KANBAN_COUNTER_SHARDS)
+        statement = pg_insert(KanbanBoardCounterShard).values([
+            {"board_id": board_id, "counter": name, "shard": shard, "delta": delta}
+            for name, delta in deltas.items()
+        ])
+        statement = statement.on_conflict_do_update(
+            index_elements=[
+                KanbanBoardCounterShard.board_id,
+                KanbanBoardCounterShard.counter,
+                KanbanBoardCounterShard.shard,
+            ],
+            set_={"delta": KanbanBoardCounterShard.delta + statement.excluded.delta},
+        )
+        await self.db.execute(statement)
+
+    async def fold_counter_shards(self) -> int:
+        """
+        Move os deltas pendentes dos shards para `kanban_boards`.
+
+        DELETE ... RETURNING dos shards e um UPDATE (executemany) por quadro, na
+        mesma transação: cada delta é somado uma única vez, mesmo com vários
+        workers rodando o job. Nota: a transação não é "commitada" aqui.
+
+        :return: Quantidade de quadros atualizados.
+        """
+        result = await self.db.execute(
+            delete(KanbanBoardCounterShard).returning(
+                KanbanBoardCounterShard.board_id,
+                KanbanBoardCounterShard.counter,
+                KanbanBoardCounterShard.delta,
+            )
+        )
+        totals: dict[int, dict[str, int]] = defaultdict(lambda: dict.fromkeys(BOARD_COUNTERS, 0))
+        for board_id, counter, delta in result.all():
+            if counter in BOARD_COUNTERS:
+                totals[board_id][counter] += delta
+        if not totals:
+            return 0
+        table = KanbanBoard.__table__
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("board_id"))
+            .values({table.c[name]: table.c[name] + bindparam(f"delta_{name}") for name in BOARD_COUNTERS})
+        )
+        await self.db.execute(statement, [
+            {"board_id": board_id, **{f"delta_{name}": delta for name, delta in deltas.items()}}
+            for board_id, deltas in totals.items()
+        ])
+        self._mark_written(rows=[{"id": board_id} for board_id in totals])
+        return len(totals)
+
+    async def reconcile_columns_count(self) -> int:
+        """
+        Recalcula `columns_count` a partir de `kanban_columns` (corrige deriva).
+
+        Descarta os deltas pendentes de `columns_count` nos shards, pois o valor
+        recalculado já os inclui. Rode em REPEATABLE READ para que a contagem e
+        o descarte vejam o mesmo snapshot. Nota: a transação não é "commitada" aqui.
+
+        :return: Quantidade de quadros corrigidos.
+        """
+        await self.db.execute(
+            delete(KanbanBoardCounterShard).where(KanbanBoardCounterShard.counter == "columns_count")
+        )
+        actual = (
+            select(func.count(KanbanColumn.id))
+            .where(KanbanColumn.board_id == KanbanBoard.id)
+            .scalar_subquery()
+        )
+        result = await self.db.execute(
+            update(KanbanBoard)
+            .where(KanbanBoard.columns_count != actual)
+            .values(columns_count=actual)
+            .returning(KanbanBoard.id)
+            .execution_options(synchronize_session=False)
+        )
+        board_ids = result.scalars().all()
+        self._mark_written(rows=[{"id": board_id} for board_id in board_ids])
+        return len(board_ids)
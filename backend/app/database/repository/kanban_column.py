@@ -18,6 +18,14 @@ class KanbanColumnRepository(BaseRepository[KanbanColumn]):
         result = await self.db.execute(statement)
         return result.scalars().all()
 
+    async def get_by_board_cached(self, board_id: int) -> list[KanbanColumn]:
+        """Colunas do quadro via cache de queries (tag `board:{id}`); instâncias somente leitura."""
+        return await self.cached(
+            f"kanban_columns:by_board:{board_id}",
+            [f"board:{board_id}"],
+            lambda repo: repo.get_by_board(board_id),
+        )
+
     async def get_in_board(self, board_id: int, column_id: int) -> KanbanColumn | None:
         statement = select(KanbanColumn).where(
             KanbanColumn.id == column_id,
@@ -25,3 +33,11 @@ class KanbanColumnRepository(BaseRepository[KanbanColumn]):
         )
         result = await self.db.execute(statement)
         return result.scalar_one_or_none()
+
+    async def update_in_board(self, board_id: int, column_id: int, data: dict) -> KanbanColumn | None:
+        """Atualiza a coluna do quadro com um único UPDATE ... RETURNING (None se não existir)."""
+        return await self.update_where(
+            data,
+            KanbanColumn.id == column_id,
+            KanbanColumn.board_id == board_id,
+        )
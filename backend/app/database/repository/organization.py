@@ -2,7 +2,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import joinedload
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database.models.organization import Organization, OrganizationMember
-from app.database.repository.base import BaseRepository
+from app.database.repository.base import BaseRepository, Page
 
 class OrganizationRepository(BaseRepository[Organization]):
     def __init__(self, db: AsyncSession):
@@ -23,25 +23,40 @@ class OrganizationMemberRepository(BaseRepository[OrganizationMember]):
         """
         Lista todos os membros de uma organização específica.
         """
+        return (await self.get_page_by_organization(organization_id, skip=skip, limit=limit)).items
+
+    async def get_page_by_organization(
+        self, organization_id: int, cursor: str | None = None, skip: int = 0, limit: int = 100
+    ) -> Page[OrganizationMember]:
+        """
+        Membros de uma organização (com o usuário carregado), paginados por user_id.
+        """
         statement = (
             select(OrganizationMember)
             .options(joinedload(OrganizationMember.user))
             .where(OrganizationMember.organization_id == organization_id)
-            .offset(skip)
-            .limit(limit)
         )
-        result = await self.db.execute(statement)
-        return result.scalars().all()
+        return await self.paginate(statement, (OrganizationMember.user_id,), cursor=cursor, skip=skip, limit=limit)
 
     async def get_by_user(self, user_id: int, skip: int = 0, limit: int = 100) -> list[OrganizationMember]:
         """
         Lista todas as organizações que um usuário faz parte.
         """
+        statement = select(OrganizationMember).where(OrganizationMember.user_id == user_id)
+        page = await self.paginate(statement, (OrganizationMember.organization_id,), skip=skip, limit=limit)
+        return page.items
+
+    async def get_page_of_organizations_by_user(
+        self, user_id: int, cursor: str | None = None, skip: int = 0, limit: int = 100
+    ) -> Page:
+        """
+        Organizações das quais o usuário é membro, com o papel dele, paginadas por id.
+
+        Os itens são tuplas (Organization, OrgRole).
+        """
         statement = (
-            select(OrganizationMember)
+            select(Organization, OrganizationMember.role)
+            .join(OrganizationMember, Organization.id == OrganizationMember.organization_id)
             .where(OrganizationMember.user_id == user_id)
-            .offset(skip)
-            .limit(limit)
         )
-        result = await self.db.execute(statement)
-        return result.scalars().all()
\ No newline at end of file
+        return await self.paginate(statement, (Organization.id,), cursor=cursor, skip=skip, limit=limit, scalars=False)
\ No newline at end of file
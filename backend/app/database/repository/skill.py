@@ -1,9 +1,14 @@
-from sqlalchemy import select
-from sqlalchemy.orm import joinedload
+from datetime import datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import joinedload, load_only
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database.models.skill import (
     Skill,
     SkillKnowledge,
+    SkillMaterial,
+    SkillRetrievalConfig,
+    SkillUsageLog,
 )
 from app.database.repository.base import BaseRepository
 
@@ -12,7 +17,165 @@ class SkillRepository(BaseRepository[Skill]):
         super().__init__(Skill, db)
 
 class SkillKnowledgeRepository(BaseRepository[SkillKnowledge]):
+    # Colunas da listagem: sem `content` (pode ter megabytes) nem `processing_error`
+    LIST_COLUMNS = (
+        SkillKnowledge.id,
+        SkillKnowledge.skill_id,
+        SkillKnowledge.source_type,
+        SkillKnowledge.name,
+        SkillKnowledge.file_name,
+        SkillKnowledge.file_size,
+        SkillKnowledge.file_mime_type,
+        SkillKnowledge.file_extension,
+        SkillKnowledge.processing_status,
+        SkillKnowledge.processed_at,
+        SkillKnowledge.total_chunks,
+        SkillKnowledge.total_tokens,
+        SkillKnowledge.created_at,
+        SkillKnowledge.updated_at,
+    )
+
     def __init__(self, db: AsyncSession):
         super().__init__(SkillKnowledge, db)
 
+    async def list_by_skill(self, skill_id: int) -> list[SkillKnowledge]:
+        """
+        Fontes de conhecimento da skill carregando apenas `LIST_COLUMNS`.
+
+        As demais colunas ficam com raiseload: acessá-las levanta erro em vez
+        de disparar uma query por linha.
+
+        :param skill_id: ID da skill.
+        :return: Lista de fontes (parcialmente carregadas).
+        """
+        statement = (
+            select(SkillKnowledge)
+            .options(load_only(*self.LIST_COLUMNS, raiseload=True))
+            .where(SkillKnowledge.skill_id == skill_id)
+            .order_by(SkillKnowledge.id)
+        )
+        result = await self.db.scalars(statement)
+        return list(result.all())
+
+class SkillMaterialRepository(BaseRepository[SkillMaterial]):
+    # Colunas da listagem: sem `description` e URL gravada; `s3_key` só para assinar a URL
+    LIST_COLUMNS = (
+        SkillMaterial.id,
+        SkillMaterial.skill_id,
+        SkillMaterial.material_type,
+        SkillMaterial.name,
+        SkillMaterial.usage_context,
+        SkillMaterial.s3_key,
+        SkillMaterial.file_name,
+        SkillMaterial.file_size,
+        SkillMaterial.file_mime_type,
+        SkillMaterial.file_extension,
+        SkillMaterial.duration,
+        SkillMaterial.width,
+        SkillMaterial.height,
+        SkillMaterial.page_count,
+        SkillMaterial.thumbnail_s3_key,
+        SkillMaterial.usage_count,
+        SkillMaterial.last_used_at,
+        SkillMaterial.created_at,
+        SkillMaterial.updated_at,
+    )
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(SkillMaterial, db)
+
+    async def list_by_skill(self, skill_id: int) -> list[SkillMaterial]:
+        """
+        Materiais da skill carregando apenas `LIST_COLUMNS` (demais colunas com raiseload).
+
+        :param skill_id: ID da skill.
+        :return: Lista de materiais (parcialmente carregados).
+        """
+        statement = (
+            select(SkillMaterial)
+            .options(load_only(*self.LIST_COLUMNS, raiseload=True))
+            .where(SkillMaterial.skill_id == skill_id)
+            .order_by(SkillMaterial.id)
+        )
+        result = await self.db.scalars(statement)
+        return list(result.all())
+
+class SkillRetrievalConfigRepository(BaseRepository[SkillRetrievalConfig]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(SkillRetrievalConfig, db)
+
+    async def get_by_skill(self, skill_id: int) -> SkillRetrievalConfig | None:
+        statement = select(SkillRetrievalConfig).where(SkillRetrievalConfig.skill_id == skill_id)
+        result = await self.db.execute(statement)
+        return result.scalar_one_or_none()
+
+    async def get_by_skill_cached(self, skill_id: int) -> SkillRetrievalConfig | None:
+        """Configuração da skill via cache de queries (tag `skill:{id}`); instância somente leitura."""
+        return await self.cached(
+            f"skill_retrieval_configs:by_skill:{skill_id}",
+            [f"skill:{skill_id}"],
+            lambda repo: repo.get_by_skill(skill_id),
+        )
+
+    async def update_by_skill(self, skill_id: int, data: dict) -> SkillRetrievalConfig | None:
+        """
+        Atualiza a configuração da skill com um único UPDATE ... RETURNING.
+
+        :param skill_id: ID da skill.
+        :param data: Campos a serem atualizados.
+        :return: A configuração atualizada ou None se não existir.
+        """
+        return await self.update_where(data, SkillRetrievalConfig.skill_id == skill_id)
+
+class SkillUsageLogRepository(BaseRepository[SkillUsageLog]):
+    """
+    Logs de uso dos materiais.
+
+    A tabela é particionada por mês em `created_at`: as consultas daqui sempre
+    recebem uma janela [start, end) para que o Postgres leia só as partições
+    dela (pruning também com parâmetros, em tempo de execução).
+    """
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(SkillUsageLog, db)
+
+    async def list_by_material(
+        self, material_id: int, start: datetime, end: datetime, limit: int = 100
+    ) -> list[SkillUsageLog]:
+        """
+        Logs de um material numa janela de tempo, do mais recente ao mais antigo.
+
+        :param material_id: ID do material.
+        :param start: Início da janela (inclusive, UTC).
+        :param end: Fim da janela (exclusivo, UTC).
+        :param limit: Máximo de logs.
+        :return: Lista de logs.
+        """
+        statement = (
+            select(SkillUsageLog)
+            .where(
+                SkillUsageLog.material_id == material_id,
+                SkillUsageLog.created_at >= start,
+                SkillUsageLog.created_at < end,
+            )
+            .order_by(SkillUsageLog.created_at.desc(), SkillUsageLog.id.desc())
+            .limit(limit)
+        )
+        result = await self.db.scalars(statement)
+        return list(result.all())
+
+    async def count_by_material(self, material_id: int, start: datetime, end: datetime) -> int:
+        """
+        Quantidade de usos de um material numa janela de tempo.
 
+        :param material_id: ID do material.
+        :param start: Início da janela (inclusive, UTC).
+        :param end: Fim da janela (exclusivo, UTC).
+        :return: Número de logs.
+        """
+        statement = select(func.count()).select_from(SkillUsageLog).where(
+            SkillUsageLog.material_id == material_id,
+            SkillUsageLog.created_at >= start,
+            SkillUsageLog.created_at < end,
+        )
+        return await self.db.scalar(statement)
@@ -0,0 +1,141 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models.storage_object import StorageObject
+from app.database.repository.base import BaseRepository
+
+
+class StorageObjectRepository(BaseRepository[StorageObject]):
+    """
+    Objetos endereçados por conteúdo e suas contagens de referência.
+
+    Uma referência é uma fonte de conhecimento ou um material apontando para
+    `storage_key`: `acquire` ao criar, `release` ao apagar. Os UPDATEs são
+    atômicos (`ref_count = ref_count ± 1`) e travam a linha até o commit, então
+    um `acquire` concorrente com o `release` da última referência ou vê o objeto
+    ainda vivo (e o mantém) ou não o encontra mais.
+    """
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(StorageObject, db)
+
+    async def get_by_hash(self, workspace_id: int, file_hash: str) -> StorageObject | None:
+        statement = select(StorageObject).where(
+            StorageObject.workspace_id == workspace_id,
+            StorageObject.file_hash == file_hash,
+        )
+        result = await self.db.execute(statement)
+        return result.scalar_one_or_none()
+
+    async def register(self, values: dict) -> StorageObject:
+        """
+        Registra um objeto recém-enviado (sem referências ainda).
+
+        Se outro upload do mesmo conteúdo registrou primeiro, devolve o registro
+        existente, com a chave do outro upload; o chamador apaga o objeto que
+        enviou (as chaves são únicas por upload).
+
+        :param values: Campos do objeto (workspace_id, file_hash, storage_key, ...).
+        :return: O objeto registrado.
+        """
+        statement = (
+            pg_insert(StorageObject)
+            .values(ref_count=0, **values)
+            .on_conflict_do_nothing(index_elements=[StorageObject.workspace_id, StorageObject.file_hash])
+        )
+        await self.db.execute(statement)
+        self._mark_written(rows=[values])
+        return await self.get_by_hash(values["workspace_id"], values["file_hash"])
+
+    async def acquire(self, workspace_id: int, storage_key: str) -> bool:
+        """
+        Soma uma referência ao objeto da chave.
+
+        :param workspace_id: Workspace dono do objeto.
+        :param storage_key: Chave no storage.
+        :return: False se a chave não é de um objeto registrado no workspace.
+        """
+        statement = (
+            update(StorageObject)
+            .where(StorageObject.workspace_id == workspace_id, StorageObject.storage_key == storage_key)
+            .values(ref_count=StorageObject.ref_count + 1)
+            .returning(StorageObject.id)
+            .execution_options(synchronize_session=False)
+        )
+        object_id = await self.db.scalar(statement)
+        if object_id is None:
+            return False
+        self._mark_written(rows=[{"id": object_id}])
+        return True
+
+    async def release(self, storage_key: str) -> Optional[bool]:
+        """
+        Tira uma referência do objeto da chave; sem referências, remove o registro.
+
+        O arquivo em si deve ser apagado do storage pelo chamador, depois do commit.
+
+        :param storage_key: Chave no storage.
+        :return: True se o arquivo deve ser apagado, False se ainda é referenciado,
+            None se a chave não é de um objeto registrado (arquivo anterior à deduplicação).
+        """
+        statement = (
+            update(StorageObject)
+            .where(StorageObject.storage_key == storage_key, StorageObject.ref_count > 0)
+            .values(ref_count=StorageObject.ref_count - 1)
+            .returning(StorageObject.id, StorageObject.ref_count)
+            .execution_options(synchronize_session=False)
+        )
+        row = (await self.db.execute(statement)).first()
+        if row is None:
+            exists = await self.db.scalar(select(StorageObject.id).where(StorageObject.storage_key == storage_key))
+            if exists is None:
+                return None
+            object_id = exists
+        elif row.ref_count > 0:
+            self._mark_written(rows=[{"id": row.id}])
+            return False
+        else:
+            object_id = row.id
+
+        deleted = await self.db.scalar(
+            delete(StorageObject)
+            .where(StorageObject.id == object_id, StorageObject.ref_count == 0)
+            .returning(StorageObject.id)
+            .execution_options(synchronize_session=False)
+        )
+        self._mark_written(rows=[{"id": object_id}])
+        return deleted is not None
+
+    async def collect_unreferenced(self, created_before: datetime, limit: int) -> list[str]:
+        """
+        Remove registros de uploads que nunca ganharam referência.
+
+        As linhas são travadas com SKIP LOCKED: um `acquire` em andamento
+        (que trava a linha) faz a linha ser pulada, e um `acquire` posterior à
+        remoção não encontra o objeto (409 para o cliente, que reenvia).
+        O arquivo deve ser apagado do storage pelo chamador, depois do commit.
+
+        :param created_before: Coleta só registros criados antes deste instante.
+        :param limit: Máximo de registros por chamada.
+        :return: Chaves dos arquivos a apagar.
+        """
+        candidates = (
+            select(StorageObject.id)
+            .where(StorageObject.ref_count == 0, StorageObject.created_at < created_before)
+            .order_by(StorageObject.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        statement = (
+            delete(StorageObject)
+            .where(StorageObject.id.in_(candidates.scalar_subquery()), StorageObject.ref_count == 0)
+            .returning(StorageObject.id, StorageObject.storage_key)
+            .execution_options(synchronize_session=False)
+        )
+        rows = (await self.db.execute(statement)).all()
+        self._mark_written(rows=[{"id": row.id} for row in rows])
+        return [row.storage_key for row in rows]
@@ -1,9 +1,14 @@
+from datetime import datetime, timedelta
+from typing import Any
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.database.models.user import User
 from app.database.repository.base import BaseRepository
 from app.schemas.user import UserCreate
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash_async
+from app.core.principal_cache import principal_cache
+from app.core.token_denylist import token_denylist
+from settings import settings
 
 class UserRepository(BaseRepository[User]):
     def __init__(self, db: AsyncSession):
@@ -27,14 +32,84 @@ class UserRepository(BaseRepository[User]):
         :param user_in: Dados do usuário para criação.
         :return: A instância do usuário criado.
         """
-        db_obj = User(
+        db_obj = await super().create(User(
             email=user_in.email,
-            hashed_password=get_password_hash(user_in.password),
+            hashed_password=await get_password_hash_async(user_in.password),
             full_name=user_in.full_name,
             phone=user_in.phone,
             avatar_url=user_in.avatar_url,
-        )
-        self.db.add(db_obj)
+        ))
         await self.db.commit() # Committing here to persist changes, although BaseRepository uses flush.
-        await self.db.refresh(db_obj)
-        return db_obj
\ No newline at end of file
+        return db_obj
+
+    async def create_from_google(self, email: str, full_name: str | None, google_id: str, avatar_url: str | None) -> User:
+        """
+        Cria um usuário autenticado pelo Google (sem senha).
+
+        Nota: a transação não é "commitada" aqui.
+
+        :return: A instância do usuário criado.
+        """
+        return await super().create(User(
+            email=email,
+            full_name=full_name,
+            google_id=google_id,
+            avatar_url=avatar_url,
+            is_active=True,
+        ))
+
+    async def update(self, pk: Any, data: dict[str, Any]) -> User | None:
+        """
+        Atualiza um usuário e invalida o cache de principal.
+
+        :param pk: A chave primária do usuário.
+        :param data: Um dicionário com os campos a serem atualizados.
+        :return: A instância atualizada ou None se não for encontrado.
+        """
+        user = await self.get(pk)
+        if user is None:
+            return None
+        previous_email = user.email
+        user = await super().update(pk, data)
+        principal_cache.invalidate(previous_email)
+        principal_cache.invalidate(user.email)
+        return user
+
+    async def revoke_tokens(self, user: User) -> None:
+        """
+        Revoga todos os tokens já emitidos para o usuário.
+
+        Incrementa `token_version` e registra a versão antiga na denylist até
+        que o último token emitido com ela expire.
+        """
+        previous_version = user.token_version or 0
+        user.token_version = previous_version + 1
+        expires_at = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        await token_denylist.revoke(self.db, user.id, previous_version, expires_at)
+
+    async def deactivate(self, user: User) -> User:
+        """
+        Desativa um usuário, revoga seus tokens e remove-o do cache de principal.
+
+        :param user: A instância do usuário.
+        :return: A instância desativada.
+        """
+        user.is_active = False
+        await self.revoke_tokens(user)
+        await self.db.flush()
+        principal_cache.invalidate(user.email)
+        return user
+
+    async def set_password(self, user: User, password: str) -> User:
+        """
+        Redefine a senha de um usuário, revoga seus tokens e remove-o do cache de principal.
+
+        :param user: A instância do usuário.
+        :param password: A nova senha em texto puro.
+        :return: A instância atualizada.
+        """
+        user.hashed_password = await get_password_hash_async(password)
+        await self.revoke_tokens(user)
+        await self.db.flush()
+        principal_cache.invalidate(user.email)
+        return user
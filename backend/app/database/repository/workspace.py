@@ -1,21 +1,22 @@
-from sqlalchemy import select
+from sqlalchemy import exists, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.models.organization import OrganizationMember
 from app.database.models.workspace import Workspace, WorkspaceMember
-from app.database.repository.base import BaseRepository
+from app.database.repository.base import BaseRepository, Page
 
 class WorkspaceRepository(BaseRepository[Workspace]):
     def __init__(self, db: AsyncSession):
         super().__init__(Workspace, db)
 
     async def get_by_organization(self, organization_id: int, skip: int = 0, limit: int = 100) -> list[Workspace]:
-        statement = (
-            select(Workspace)
-            .where(Workspace.organization_id == organization_id)
-            .offset(skip)
-            .limit(limit)
-        )
-        result = await self.db.execute(statement)
-        return result.scalars().all()
+        return (await self.get_page_by_organization(organization_id, skip=skip, limit=limit)).items
+
+    async def get_page_by_organization(
+        self, organization_id: int, cursor: str | None = None, skip: int = 0, limit: int = 100
+    ) -> Page[Workspace]:
+        """Workspaces da organização paginados por id."""
+        statement = select(Workspace).where(Workspace.organization_id == organization_id)
+        return await self.paginate(statement, (Workspace.id,), cursor=cursor, skip=skip, limit=limit)
         
 class WorkspaceMemberRepository(BaseRepository[WorkspaceMember]):
     def __init__(self, db: AsyncSession):
@@ -27,28 +28,40 @@ class WorkspaceMemberRepository(BaseRepository[WorkspaceMember]):
         """
         return await self.get((user_id, workspace_id))
 
+    async def has_access(self, workspace_id: int, user_id: int) -> bool:
+        """
+        Indica se o usuário é membro do workspace ou da organização dona dele.
+
+        :param workspace_id: ID do workspace.
+        :param user_id: ID do usuário.
+        :return: True se o usuário pode acessar o workspace.
+        """
+        workspace_member = exists().where(
+            WorkspaceMember.workspace_id == workspace_id,
+            WorkspaceMember.user_id == user_id,
+        )
+        organization_member = exists().where(
+            OrganizationMember.organization_id == Workspace.organization_id,
+            OrganizationMember.user_id == user_id,
+        )
+        statement = select(Workspace.id).where(
+            Workspace.id == workspace_id,
+            or_(workspace_member, organization_member),
+        )
+        return await self.db.scalar(statement) is not None
+
     async def get_by_workspace(self, workspace_id: int, skip: int = 0, limit: int = 100) -> list[WorkspaceMember]:
         """
         Lista todos os membros de um workspace específico.
         """
-        statement = (
-            select(WorkspaceMember)
-            .where(WorkspaceMember.workspace_id == workspace_id)
-            .offset(skip)
-            .limit(limit)
-        )
-        result = await self.db.execute(statement)
-        return result.scalars().all()
+        statement = select(WorkspaceMember).where(WorkspaceMember.workspace_id == workspace_id)
+        page = await self.paginate(statement, (WorkspaceMember.user_id,), skip=skip, limit=limit)
+        return page.items
 
     async def get_by_user(self, user_id: int, skip: int = 0, limit: int = 100) -> list[WorkspaceMember]:
         """
         Lista todos os workspaces que um usuário faz parte.
         """
-        statement = (
-            select(WorkspaceMember)
-            .where(WorkspaceMember.user_id == user_id)
-            .offset(skip)
-            .limit(limit)
-        )
-        result = await self.db.execute(statement)
-        return result.scalars().all()
\ No newline at end of file
+        statement = select(WorkspaceMember).where(WorkspaceMember.user_id == user_id)
+        page = await self.paginate(statement, (WorkspaceMember.workspace_id,), skip=skip, limit=limit)
+        return page.items
\ No newline at end of file
@@ -0,0 +1,198 @@
+"""
+Log de queries lentas com captura de EXPLAIN.
+
+Statements acima de `SLOW_QUERY_THRESHOLD_MS` são logados com o SQL
+normalizado, os parâmetros redigidos (apenas tipo/tamanho), a rota e o
+request id. Numa fração amostrada (`SLOW_QUERY_EXPLAIN_SAMPLE_RATE`) dos
+SELECTs lentos, o statement é reexecutado com `EXPLAIN (ANALYZE, BUFFERS)`
+numa conexão à parte (fora do pool da aplicação, em transação READ ONLY
+desfeita) e o plano fica guardado em memória, exposto em
+`/api/internal/slow-queries`. O EXPLAIN ANALYZE executa o statement de novo:
+ficam de fora os que travam linhas (`FOR UPDATE/SHARE`) ou têm efeitos
+colaterais permitidos mesmo em READ ONLY (advisory locks); escritas
+disfarçadas (`WITH ... DELETE`, `nextval`) falham na transação READ ONLY.
+
+Permite flagrar seq scans (ex: skill_chunks, skill_knowledges) em produção
+sem ligar o `echo` do engine.
+"""
+import asyncio
+import random
+import re
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.logging import get_logger, request_id_var
+from app.core.metrics import registry
+from app.database.pool_metrics import current_route
+from settings import settings
+
+logger = get_logger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![$\w])\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*(?:\$\d+|\?|%s)(?:\s*,\s*(?:\$\d+|\?|%s))+\s*\)")
+_READ_ONLY = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+_LOCKING = re.compile(
+    r"\bFOR\s+(UPDATE|SHARE|NO\s+KEY\s+UPDATE|KEY\s+SHARE)\b|\bpg_(try_)?advisory", re.IGNORECASE
+)
+_SENSITIVE = ("password", "token", "secret", "hash")
+
+
+def normalize_sql(statement: str) -> str:
+    """Colapsa espaços, literais e listas IN para agrupar statements equivalentes."""
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _IN_LIST.sub("(...)", normalized)
+    return " ".join(normalized.split())
+
+
+def _describe(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, (str, bytes)):
+        return f"{type(value).__name__}({len(value)})"
+    if isinstance(value, (list, tuple)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def redact_params(parameters: Any) -> Any:
+    """Substitui os valores dos parâmetros pelo tipo (e tamanho); nunca loga o conteúdo."""
+    if isinstance(parameters, dict):
+        return {
+            key: "<redacted>" if any(word in str(key).lower() for word in _SENSITIVE) else _describe(value)
+            for key, value in parameters.items()
+        }
+    if isinstance(parameters, (list, tuple)):
+        return [_describe(value) for value in parameters]
+    return _describe(parameters)
+
+
+class SlowQueryLog:
+    """Detecta statements lentos de um engine e guarda os últimos planos capturados."""
+
+    def __init__(self, threshold_ms: int, sample_rate: float, explain_timeout_ms: int, max_plans: int):
+        self.threshold = threshold_ms / 1000
+        self.sample_rate = sample_rate
+        self.explain_timeout_ms = explain_timeout_ms
+        self._plans: deque = deque(maxlen=max_plans)
+        self._explain_engines: dict[str, Any] = {}
+        self._explaining = False
+        self._tasks: set = set()
+        self.explains = registry.counter("db_slow_query_explains_total", "Planos capturados com EXPLAIN ANALYZE")
+
+    def watch(self, engine, connect_args: Optional[dict] = None) -> None:
+        """Registra os eventos em um AsyncEngine."""
+        if self.threshold <= 0:
+            return
+        sync_engine = engine.sync_engine
+
+        @event.listens_for(sync_engine, "before_cursor_execute")
+        def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("slow_query_start", []).append(time.perf_counter())
+
+        @event.listens_for(sync_engine, "after_cursor_execute")
+        def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            starts = conn.info.get("slow_query_start")
+            if not starts:
+                return
+            elapsed = time.perf_counter() - starts.pop()
+            if elapsed >= self.threshold:
+                self._on_slow_query(engine, connect_args, statement, parameters, elapsed, executemany)
+
+        @event.listens_for(sync_engine, "handle_error")
+        def _handle_error(exception_context):
+            # Statement que falhou não passa pelo after_cursor_execute: tira seu início da pilha
+            conn = exception_context.connection
+            if conn is not None and exception_context.execution_context is not None:
+                starts = conn.info.get("slow_query_start")
+                if starts:
+                    starts.pop()
+
+    def _on_slow_query(self, engine, connect_args, statement, parameters, elapsed, executemany) -> None:
+        route = current_route()
+        normalized = normalize_sql(statement)
+        registry.counter("db_slow_queries_total", "Statements acima do limite de lentidão", {"route": route}).inc()
+        logger.warning(
+            f"Query lenta ({elapsed * 1000:.1f} ms) em {route}: {normalized} | "
+            f"params={redact_params(parameters)}"
+        )
+        if (
+            not executemany
+            and not self._explaining
+            and engine.dialect.name == "postgresql"
+            and _READ_ONLY.match(statement)
+            and not _LOCKING.search(statement)
+            and random.random() < self.sample_rate
+        ):
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return
+            self._explaining = True
+            entry = {
+                "captured_at": datetime.utcnow().isoformat(),
+                "request_id": request_id_var.get(),
+                "route": route,
+                "duration_ms": round(elapsed * 1000, 2),
+                "sql": normalized,
+            }
+            # Roda fora da requisição: o loop é o mesmo do greenlet que executou o statement
+            task = loop.create_task(self._capture_plan(engine, connect_args, statement, parameters, entry))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _explain_engine(self, engine, connect_args):
+        key = str(engine.url)
+        if key not in self._explain_engines:
+            # Conexão avulsa: não disputa slots do pool da aplicação
+            self._explain_engines[key] = create_async_engine(
+                engine.url, poolclass=NullPool, connect_args=connect_args or {}
+            )
+        return self._explain_engines[key]
+
+    async def _capture_plan(self, engine, connect_args, statement, parameters, entry: dict) -> None:
+        try:
+            explain_engine = self._explain_engine(engine, connect_args)
+            async with explain_engine.connect() as conn:
+                transaction = await conn.begin()
+                try:
+                    # Primeiro comando da transação: qualquer escrita no statement falha
+                    await conn.execute(text("SET TRANSACTION READ ONLY"))
+                    await conn.execute(text(f"SET LOCAL statement_timeout = {int(self.explain_timeout_ms)}"))
+                    result = await conn.exec_driver_sql(
+                        f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters
+                    )
+                    entry["plan"] = "\n".join(row[0] for row in result.all())
+                finally:
+                    await transaction.rollback()
+            self._plans.append(entry)
+            self.explains.inc()
+            logger.info(f"Plano capturado para query lenta em {entry['route']}:\n{entry['plan']}")
+        except Exception as e:
+            logger.warning(f"Falha ao capturar EXPLAIN de query lenta: {e}")
+        finally:
+            self._explaining = False
+
+    def recent(self) -> list[dict]:
+        """Planos capturados mais recentes (mais novo primeiro)."""
+        return list(reversed(self._plans))
+
+    async def close(self) -> None:
+        for explain_engine in self._explain_engines.values():
+            await explain_engine.dispose()
+        self._explain_engines.clear()
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    sample_rate=settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+    explain_timeout_ms=settings.SLOW_QUERY_EXPLAIN_TIMEOUT_MS,
+    max_plans=settings.SLOW_QUERY_MAX_PLANS,
+)
@@ -0,0 +1,80 @@
+"""
+Unit of work por requisição: um único commit ao final do handler.
+
+Handlers que optam por `Depends(get_uow, scope="function")` não chamam
+`commit`/`refresh`: acumulam as alterações na sessão (repositórios ou
+`uow.add`) e o commit acontece uma vez, quando o handler termina sem erro.
+Com exceção (inclusive HTTPException), tudo é desfeito.
+
+O escopo "function" é obrigatório: a saída da dependency roda depois de o
+FastAPI serializar a resposta, mas antes de enviá-la. Assim, uma falha no
+commit ainda vira erro 500 em vez de uma resposta de sucesso para dados não
+gravados. Como a resposta é serializada antes do commit, objetos adicionados
+com `uow.add` precisam de `await uow.flush()` antes do `return`. O flush emite
+um INSERT ... RETURNING em lote por tabela e preenche ids e defaults. Escritas
+pelos repositórios já voltam preenchidas.
+
+Commits por requisição são medidos em `db_commits_per_request` (ver
+`app.database.query_profiler`).
+"""
+from typing import Any, AsyncGenerator, Iterable
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.db import get_db
+
+
+class UnitOfWork:
+    """Sessão da requisição com commit único e idempotente."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self._done = False
+
+    def add(self, obj: Any) -> None:
+        self.session.add(obj)
+
+    def add_all(self, objs: Iterable[Any]) -> None:
+        self.session.add_all(objs)
+
+    async def delete(self, obj: Any) -> None:
+        await self.session.delete(obj)
+
+    async def flush(self) -> None:
+        """Envia as alterações pendentes num único flush (INSERT ... RETURNING em lote)."""
+        await self.session.flush()
+
+    async def commit(self) -> None:
+        if self._done:
+            return
+        self._done = True
+        await self.session.commit()
+
+    async def rollback(self) -> None:
+        if self._done:
+            return
+        self._done = True
+        await self.session.rollback()
+
+
+async def get_uow(db: AsyncSession = Depends(get_db)) -> AsyncGenerator[UnitOfWork, None]:
+    """
+    Dependency provider do unit of work (use com `scope="function"`).
+
+    Example:
+        ```python
+        @router.post("/items/")
+        async def create_item(uow: UnitOfWork = Depends(get_uow, scope="function")):
+            item = await ItemRepository(uow.session).create(...)
+            return item
+        ```
+    """
+    uow = UnitOfWork(db)
+    try:
+        yield uow
+    except Exception:
+        await uow.rollback()
+        raise
+    else:
+        await uow.commit()
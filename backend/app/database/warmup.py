@@ -0,0 +1,152 @@
+"""
+Aquecimento do pool de conexões e prontidão (readiness) do processo.
+
+Sem aquecimento, a primeira rajada após um deploy paga TCP/TLS/autenticação
+para até `pool_size` conexões, mais a introspecção de tipos do asyncpg (cada
+conexão consulta o catálogo na primeira vez que encontra um ENUM do Postgres).
+
+No startup, `readiness.start()` abre `DB_POOL_WARMUP_CONNECTIONS` conexões em
+paralelo em cada engine, executa em cada uma um SELECT com todos os ENUMs do
+metadata (registrando os codecs) e as devolve ao pool. Até terminar,
+`/api/health/ready` responde 503; `/api/health/live` responde sempre.
+Sem banco acessível o processo nunca se declara pronto: as tentativas
+continuam, espaçadas depois de `DB_WARMUP_TIMEOUT_SECONDS`.
+"""
+import asyncio
+import time
+from typing import Optional
+
+from sqlalchemy import Enum, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.logging import get_logger
+from app.core.metrics import registry
+from app.database.db import Base
+from settings import settings
+
+logger = get_logger(__name__)
+
+_MAX_RETRY_INTERVAL = 30.0
+
+
+def codec_warmup_statement(engine: AsyncEngine) -> Optional[str]:
+    """SELECT que força a introspecção dos ENUMs nativos do metadata (None fora do Postgres)."""
+    if engine.dialect.name != "postgresql":
+        return None
+    preparer = engine.dialect.identifier_preparer
+    names = sorted({
+        column.type.name
+        for table in Base.metadata.tables.values()
+        for column in table.columns
+        if isinstance(column.type, Enum) and column.type.native_enum and column.type.name
+    })
+    if not names:
+        return None
+    return "SELECT " + ", ".join(f"NULL::{preparer.quote(name)}" for name in names)
+
+
+async def warm_engine(engine: AsyncEngine, connections: int) -> int:
+    """
+    Abre até `connections` conexões simultâneas (limitado ao pool_size) e as devolve ao pool.
+
+    Com aquecimento desligado (0), ainda verifica que o banco responde.
+
+    :param engine: Engine a aquecer.
+    :param connections: Número de conexões desejado.
+    :return: Número de conexões aquecidas.
+    """
+    size = getattr(engine.pool, "size", None)
+    count = min(connections, size()) if callable(size) else connections
+    if count <= 0:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        return 0
+    statement = codec_warmup_statement(engine)
+    opened = []
+
+    async def open_one():
+        conn = await engine.connect()
+        opened.append(conn)
+        await conn.execute(text("SELECT 1"))
+        if statement:
+            await conn.exec_driver_sql(statement)
+        # A conexão volta ao pool só no fechamento, abaixo: todas ficam abertas
+        # ao mesmo tempo para que sejam conexões distintas
+        await conn.rollback()
+
+    try:
+        results = await asyncio.gather(*(open_one() for _ in range(count)), return_exceptions=True)
+    finally:
+        for conn in opened:
+            await conn.close()
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        raise errors[0]
+    return count
+
+
+class Readiness:
+    """Estado de prontidão do processo, liberado ao fim do aquecimento dos pools."""
+
+    def __init__(self, connections: int, timeout: int, retry_interval: float = 1.0):
+        self.connections = connections
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+        self.ready = False
+        self.warmed: dict[str, int] = {}
+        self.error: Optional[str] = None
+        self.duration: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        registry.gauge("app_ready", "1 quando o aquecimento terminou e o processo aceita tráfego", fn=lambda: int(self.ready))
+
+    async def _warm_up(self, engines: dict[str, AsyncEngine]) -> None:
+        start = time.perf_counter()
+        deadline = start + self.timeout
+        for label, engine in engines.items():
+            interval = self.retry_interval
+            while True:
+                try:
+                    self.warmed[label] = await warm_engine(engine, self.connections)
+                    self.error = None
+                    break
+                except Exception as e:
+                    self.error = str(e)
+                    if time.perf_counter() < deadline:
+                        logger.warning(f"Falha ao aquecer o pool '{label}', tentando novamente: {e}")
+                    else:
+                        # Pool quebrado não é pronto: continua fora do balanceador, com backoff
+                        elapsed = time.perf_counter() - start
+                        logger.error(f"Pool '{label}' ainda indisponível após {elapsed:.0f}s: {e}")
+                        interval = min(interval * 2, _MAX_RETRY_INTERVAL)
+                    await asyncio.sleep(interval)
+        self.duration = time.perf_counter() - start
+        self.ready = True
+        logger.info(f"Pools aquecidos em {self.duration * 1000:.0f} ms: {self.warmed}")
+
+    def start(self, engines: dict[str, AsyncEngine]) -> None:
+        """Inicia o aquecimento em background (não bloqueia o startup)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._warm_up(engines))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def status(self) -> dict:
+        return {
+            "ready": self.ready,
+            "warmed_connections": self.warmed,
+            "warmup_ms": round(self.duration * 1000, 1) if self.duration is not None else None,
+            "error": self.error,
+        }
+
+
+readiness = Readiness(
+    connections=settings.DB_POOL_WARMUP_CONNECTIONS,
+    timeout=settings.DB_WARMUP_TIMEOUT_SECONDS,
+)
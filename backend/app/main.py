@@ -1,16 +1,27 @@
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.middleware.cors import CORSMiddleware
 
-from sqlalchemy import text
 from settings import settings
-from app.database.db import engine
+from app.database.db import engine, replica_engine, async_session, read_your_writes, read_your_writes_middleware
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from app.core.logging import setup_logging, get_logger, logging_context_middleware
+from app.core.google_auth import google_verifier
+from app.core.token_denylist import token_denylist
+from app.database.repository.base import InvalidCursorError
+from app.api.deps import NEXT_CURSOR_HEADER
+from app.database.query_profiler import query_profiler_middleware
+from app.database.slow_query import slow_query_log
+from app.database.warmup import readiness
+from app.database.counters import counter_jobs
+from app.database.partitions import partition_maintenance
+from app.services.async_storage import StorageTimeoutError, async_storage
+from app.services.storage_gc import unreferenced_objects
 
 setup_logging()
 logger = get_logger(__name__)
@@ -20,25 +31,54 @@ limiter = Limiter(key_func=get_remote_address)
 async def lifespan(app: FastAPI):
     logger.info("Iniciando aplicação...")
 
-    # 1) Banco
-    try:
-        async with engine.connect() as conn:
-                await conn.execute(text("SELECT 1"))
-        logger.info("Conexão com banco de dados estabelecida com sucesso")
-    except Exception as e:
-        logger.error(f"Erro crítico durante inicialização: {e}")
-        if settings.ENVIRONMENT == "production":
-            raise e
+    # 1) Banco: aquece os pools em background; /api/health/ready responde 503 até terminar
+    engines = {"primary": engine}
+    if replica_engine is not None:
+        engines["replica"] = replica_engine
+    readiness.start(engines)
+
+    # 2) Chaves públicas do Google (renovadas em background)
+    await google_verifier.start()
+
+    # 3) Denylist de tokens (filtro no modo stateless; poda das expiradas sempre)
+    token_denylist.start(async_session)
+
+    # 4) Jobs dos contadores dos quadros (fold dos shards + reconciliação)
+    counter_jobs.start(async_session)
+
+    # 5) Partições mensais (criação antecipada + retenção)
+    partition_maintenance.start(async_session)
+
+    # 6) Coleta de uploads deduplicados nunca vinculados
+    unreferenced_objects.start(async_session)
 
     yield
     
     logger.info("Finalizando aplicação...")
+    await readiness.stop()
+    await counter_jobs.stop()
+    await partition_maintenance.stop()
+    await unreferenced_objects.stop()
+    await async_storage.close()
+    await token_denylist.stop()
+    await google_verifier.stop()
+    await slow_query_log.close()
     await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
     logger.info("Recursos liberados com sucesso")
 
+async def _invalid_cursor_handler(request: Request, exc: InvalidCursorError) -> JSONResponse:
+    return JSONResponse(status_code=400, content={"detail": "Cursor de paginação inválido"})
+
+async def _storage_timeout_handler(request: Request, exc: StorageTimeoutError) -> JSONResponse:
+    return JSONResponse(status_code=504, content={"detail": "O storage demorou demais para responder"})
+
 def setup_middlewares(app: FastAPI) -> None:
     app.state.limiter = limiter
     app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+    app.add_exception_handler(InvalidCursorError, _invalid_cursor_handler)
+    app.add_exception_handler(StorageTimeoutError, _storage_timeout_handler)
 
     cors_origins = getattr(settings, "ALLOWED_ORIGINS", None) or [
         "http://localhost:5173",
@@ -50,6 +90,7 @@ def setup_middlewares(app: FastAPI) -> None:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, read_your_writes.HEADER],
     )
 
     if hasattr(settings, 'ALLOWED_HOSTS') and settings.ALLOWED_HOSTS:
@@ -68,6 +109,8 @@ def setup_routers(app: FastAPI) -> None:
     from app.api.organization.routes import router as organization_router
     from app.api.skill.routes import router as skill_router
     from app.api.kanban.routes import router as kanban_router
+    from app.api.internal.routes import router as internal_router
+    from app.api.health.routes import router as health_router
     
     app.include_router(auth_router, prefix=api_prefix)
     app.include_router(users_router, prefix=api_prefix)
@@ -75,6 +118,8 @@ def setup_routers(app: FastAPI) -> None:
     app.include_router(organization_router, prefix=api_prefix)
     app.include_router(skill_router, prefix=api_prefix)
     app.include_router(kanban_router, prefix=api_prefix)
+    app.include_router(internal_router, prefix=api_prefix)
+    app.include_router(health_router, prefix=api_prefix)
 
     logger.info(f"Todos os roteadores da API {api_prefix} configurados")
 
@@ -85,6 +130,9 @@ def create_application() -> FastAPI:
         version=settings.VERSION,
         lifespan=lifespan
     )
+    # Profiler por dentro do middleware de logging (usa o request_id já definido)
+    app.middleware("http")(query_profiler_middleware)
+    app.middleware("http")(read_your_writes_middleware)
     app.middleware("http")(logging_context_middleware)
     
     setup_middlewares(app)
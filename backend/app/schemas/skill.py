@@ -1,7 +1,7 @@
 """
 Schemas estendidos para Skills (Knowledge, Materials, Config)
 """
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
 from app.database.enum import (
@@ -94,6 +94,27 @@ class SkillKnowledgeResponse(SkillKnowledgeBase):
         from_attributes = True
 
 
+class SkillKnowledgeSummaryResponse(BaseModel):
+    """Item da listagem: sem `content` e `processing_error` (ver o endpoint de detalhe)."""
+    id: int
+    skill_id: int
+    source_type: SourceType
+    name: str
+    file_name: Optional[str] = None
+    file_size: Optional[int] = None
+    file_mime_type: Optional[str] = None
+    file_extension: Optional[str] = None
+    processing_status: ProcessingStatus
+    processed_at: Optional[datetime] = None
+    total_chunks: int
+    total_tokens: int
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
 # ============= Material Schemas =============
 
 class SkillMaterialBase(BaseModel):
@@ -158,6 +179,33 @@ class SkillMaterialResponse(SkillMaterialBase):
         from_attributes = True
 
 
+class SkillMaterialSummaryResponse(BaseModel):
+    """Item da listagem: sem `description` e referências do storage; a URL pré-assinada vem do cache."""
+    id: int
+    skill_id: int
+    material_type: MaterialType
+    name: str
+    usage_context: str
+    file_name: str
+    file_size: int
+    file_mime_type: str
+    file_extension: Optional[str] = None
+    duration: Optional[int] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    page_count: Optional[int] = None
+    thumbnail_s3_key: Optional[str] = None
+    usage_count: int
+    last_used_at: Optional[datetime] = None
+    s3_presigned_url: Optional[str] = None
+    presigned_url_expires_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
 # ============= Retrieval Config Schemas =============
 
 class SkillRetrievalConfigBase(BaseModel):
@@ -216,3 +264,11 @@ class FileUploadResponse(BaseModel):
     file_hash: str
     file_name: str
     file_mime_type: str
+    deduplicated: bool = False  # True se o workspace já tinha o arquivo e nada foi enviado
+
+
+class FileHashLookupRequest(BaseModel):
+    """Consulta prévia ao upload: o cliente envia o SHA-256 antes dos bytes"""
+    file_hash: str = Field(..., min_length=64, max_length=64, pattern="^[0-9a-f]{64}$")
+    file_name: str
+    file_mime_type: Optional[str] = None
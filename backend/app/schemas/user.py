@@ -27,6 +27,11 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     email: Optional[str] = None
+    # Principal assinado (presente em tokens emitidos por create_user_access_token)
+    user_id: Optional[int] = None
+    is_active: Optional[bool] = None
+    is_superuser: Optional[bool] = None
+    token_version: Optional[int] = None
 
 class GoogleLogin(BaseModel):
     token: str  # id_token from Google
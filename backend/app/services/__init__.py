@@ -2,5 +2,6 @@
 Services
 """
 from .storage import storage_service, StorageService
+from .async_storage import async_storage, AsyncStorageService, StorageTimeoutError
 
-__all__ = ["storage_service", "StorageService"]
+__all__ = ["storage_service", "StorageService", "async_storage", "AsyncStorageService", "StorageTimeoutError"]
@@ -0,0 +1,223 @@
+"""
+Fachada assíncrona do storage (S3/GCS).
+
+Os SDKs (boto3 e google-cloud-storage) são síncronos: chamados direto de um
+handler async, cada upload, remoção ou assinatura trava o event loop durante
+um round-trip de rede. Aqui cada chamada roda num ThreadPoolExecutor dedicado
+(STORAGE_EXECUTOR_WORKERS threads, separado do executor padrão do loop) e:
+
+    - no máximo STORAGE_EXECUTOR_WORKERS chamadas ficam em andamento; as demais
+      esperam no event loop, sem fila ilimitada dentro do executor
+    - cada operação tem um timeout (STORAGE_*_TIMEOUT_SECONDS) que conta a
+      espera por uma vaga mais a chamada; estourado, levanta
+      StorageTimeoutError (respondido como 504)
+
+Uma chamada que estoura o timeout não é interrompida (threads não podem ser
+canceladas): ela termina em background e só então libera a vaga. Os timeouts
+de conexão/leitura do próprio SDK limitam quanto isso pode durar.
+"""
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, BinaryIO, Callable, Optional
+
+from app.core.logging import get_logger
+from app.core.metrics import registry
+from app.services.storage import StorageService, storage_service
+from app.services.streaming import ObjectStream
+from settings import settings
+
+logger = get_logger(__name__)
+
+STORAGE_LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+# Assinatura é CPU local: HMAC (S3 SigV4) na casa de µs, RSA (GCS v4) na de ms
+SIGNING_CPU_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05)
+
+
+class StorageTimeoutError(Exception):
+    """Operação de storage não terminou dentro do timeout."""
+
+    def __init__(self, operation: str, timeout: float):
+        super().__init__(f"Operação de storage '{operation}' excedeu {timeout:g}s")
+        self.operation = operation
+        self.timeout = timeout
+
+
+class AsyncStorageService:
+    """Mesma API do StorageService, com corrotinas que não bloqueiam o event loop."""
+
+    def __init__(self, service: StorageService, workers: int):
+        self._service = service
+        self.workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots = asyncio.Semaphore(workers)
+        self.in_flight = 0
+        registry.gauge("storage_calls_in_flight", "Chamadas ao SDK de storage em andamento", fn=lambda: self.in_flight)
+        self.timeouts = registry.counter("storage_timeouts_total", "Operações de storage que excederam o timeout")
+        self.urls_signed = registry.counter("storage_urls_signed_total", "URLs pré-assinadas geradas")
+        self.signing_cpu = registry.histogram(
+            "storage_signing_cpu_seconds",
+            "Tempo de CPU por URL pré-assinada (thread_time, sem espera de rede)",
+            buckets=SIGNING_CPU_BUCKETS,
+        )
+
+    @property
+    def provider(self) -> str:
+        return self._service.provider
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="storage")
+        return self._executor
+
+    def _release(self, future: asyncio.Future) -> None:
+        self.in_flight -= 1
+        self._slots.release()
+        # Resultado de uma chamada abandonada por timeout: evita o aviso de exceção não lida
+        if not future.cancelled():
+            future.exception()
+
+    async def _run(self, operation: str, timeout: float, fn: Callable, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts.inc()
+            raise StorageTimeoutError(operation, timeout) from None
+
+        self.in_flight += 1
+        future = loop.run_in_executor(self._get_executor(), functools.partial(fn, *args, **kwargs))
+        # A vaga só volta quando a thread termina, mesmo se desistirmos antes
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), max(timeout - (loop.time() - start), 0))
+        except asyncio.TimeoutError:
+            self.timeouts.inc()
+            logger.warning(f"Storage '{operation}' excedeu {timeout:g}s; a chamada segue em background")
+            raise StorageTimeoutError(operation, timeout) from None
+        finally:
+            registry.histogram(
+                "storage_operation_seconds",
+                "Duração das operações de storage (espera + chamada)",
+                labels={"operation": operation},
+                buckets=STORAGE_LATENCY_BUCKETS,
+            ).observe(loop.time() - start)
+
+    def generate_key(
+        self,
+        workspace_id: int,
+        skill_id: int,
+        folder: str,
+        file_name: str,
+        entity_id: Optional[int] = None
+    ) -> str:
+        """Gera chave de armazenamento (sem I/O)"""
+        return self._service.generate_key(workspace_id, skill_id, folder, file_name, entity_id)
+
+    def generate_content_key(self, workspace_id: int, file_hash: str) -> str:
+        """Gera chave endereçada por conteúdo (sem I/O)"""
+        return self._service.generate_content_key(workspace_id, file_hash)
+
+    def is_content_key(self, key: str) -> bool:
+        return self._service.is_content_key(key)
+
+    async def get_file_hash(self, file: BinaryIO) -> str:
+        """SHA-256 do arquivo lido em partes (ex: o upload já recebido em disco)"""
+        return await self._run("hash", settings.STORAGE_UPLOAD_TIMEOUT_SECONDS, self._service.get_file_hash, file)
+
+    async def upload_file(self, file: BinaryIO, key: str, content_type: Optional[str] = None) -> dict:
+        """Upload de arquivo (ver StorageService.upload_file)"""
+        return await self._run(
+            "upload", settings.STORAGE_UPLOAD_TIMEOUT_SECONDS, self._service.upload_file, file, key, content_type
+        )
+
+    async def download_file(self, key: str) -> bytes:
+        """Download de arquivo"""
+        return await self._run("download", settings.STORAGE_DOWNLOAD_TIMEOUT_SECONDS, self._service.download_file, key)
+
+    async def open_stream(
+        self, key: str, start: Optional[int] = None, end: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Abre o arquivo (ou o intervalo [start, end], inclusivo) e devolve seus pedaços.
+
+        A abertura acontece aqui, antes de qualquer byte ser enviado ao cliente:
+        erros e timeouts dela ainda viram uma resposta de erro. Cada pedaço é
+        lido no executor com o timeout de download, ocupando uma vaga só durante
+        a leitura, então clientes lentos não prendem threads.
+        """
+        stream = await self._run(
+            "download", settings.STORAGE_DOWNLOAD_TIMEOUT_SECONDS, self._service.open_range, key, start, end
+        )
+        return self._iterate(stream)
+
+    async def _iterate(self, stream: ObjectStream) -> AsyncIterator[bytes]:
+        try:
+            while True:
+                chunk = await self._run("read", settings.STORAGE_DOWNLOAD_TIMEOUT_SECONDS, next, stream.chunks, None)
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            # Também quando o cliente desconecta no meio do download
+            try:
+                stream.close()
+            except Exception as e:
+                logger.warning(f"Falha ao fechar download do storage: {e}")
+
+    async def delete_file(self, key: str) -> bool:
+        """Deletar arquivo"""
+        return await self._run("delete", settings.STORAGE_DELETE_TIMEOUT_SECONDS, self._service.delete_file, key)
+
+    async def generate_presigned_url(self, key: str, expiration: int = 3600) -> str:
+        """Gera URL pré-assinada/assinada (prefira `signed_urls`, que reaproveita as URLs)"""
+        urls = await self.generate_presigned_urls([key], expiration)
+        return urls[key]
+
+    async def generate_presigned_urls(self, keys: list[str], expiration: int) -> dict[str, str]:
+        """Assina várias chaves numa única ida ao executor (listagens)"""
+        if not keys:
+            return {}
+        return await self._run("sign", settings.STORAGE_SIGN_TIMEOUT_SECONDS, self._sign_batch, keys, expiration)
+
+    def _sign_batch(self, keys: list[str], expiration: int) -> dict[str, str]:
+        # Roda na thread do executor: thread_time mede só a CPU desta assinatura
+        urls = {}
+        for key in keys:
+            start = time.thread_time()
+            urls[key] = self._service.generate_presigned_url(key, expiration)
+            self.signing_cpu.observe(time.thread_time() - start)
+        self.urls_signed.inc(len(keys))
+        return urls
+
+    async def file_exists(self, key: str) -> bool:
+        """Verifica se arquivo existe"""
+        return await self._run("exists", settings.STORAGE_METADATA_TIMEOUT_SECONDS, self._service.file_exists, key)
+
+    async def get_file_metadata(self, key: str) -> dict:
+        """Obtém metadados do arquivo"""
+        return await self._run(
+            "metadata", settings.STORAGE_METADATA_TIMEOUT_SECONDS, self._service.get_file_metadata, key
+        )
+
+    async def list_files(self, prefix: str) -> list:
+        """Lista arquivos com prefixo"""
+        return await self._run("list", settings.STORAGE_METADATA_TIMEOUT_SECONDS, self._service.list_files, prefix)
+
+    async def copy_file(self, source_key: str, dest_key: str) -> bool:
+        """Copia arquivo"""
+        return await self._run(
+            "copy", settings.STORAGE_METADATA_TIMEOUT_SECONDS, self._service.copy_file, source_key, dest_key
+        )
+
+    async def close(self) -> None:
+        """Encerra o executor sem esperar chamadas pendentes (chamado no shutdown)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Instância global da fachada assíncrona
+async_storage = AsyncStorageService(storage_service, workers=settings.STORAGE_EXECUTOR_WORKERS)
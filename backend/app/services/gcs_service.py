@@ -2,12 +2,22 @@
 Serviço de Google Cloud Storage (GCS) para manipulação de arquivos no bucket
 """
 from google.cloud import storage
-from google.cloud.exceptions import NotFound
+from google.cloud.exceptions import NotFound, PreconditionFailed
 import hashlib
 import os
-from typing import Optional, BinaryIO
+from itertools import chain
+from typing import Iterator, Optional, BinaryIO
 from datetime import datetime, timedelta
 from settings import settings
+from .streaming import (
+    ObjectStream,
+    download_chunk_size,
+    gcs_chunk_size,
+    iter_parts,
+    multipart_threshold,
+    read_part,
+    sha256_of,
+)
 
 
 class GCSService:
@@ -51,11 +61,16 @@ class GCSService:
         self,
         file: BinaryIO,
         gcs_key: str,
-        content_type: Optional[str] = None
+        content_type: Optional[str] = None,
+        if_generation_match: Optional[int] = None
     ) -> dict:
         """
         Upload de arquivo para GCS
         
+        Args:
+            if_generation_match: Pré-condição do GCS; 0 = só cria, nunca
+                sobrescreve um objeto existente (chaves endereçadas por conteúdo)
+        
         Returns:
             dict: {
                 'gcs_key': str,
@@ -66,20 +81,25 @@ class GCSService:
             }
         """
         try:
-            # Ler conteúdo do arquivo
-            file_content = file.read()
-            file_size = len(file_content)
-            
-            # Calcular hash SHA-256
-            file_hash = hashlib.sha256(file_content).hexdigest()
-            
-            # Upload para GCS
             blob = self.bucket.blob(gcs_key)
             
-            if content_type:
-                blob.content_type = content_type
-            
-            blob.upload_from_string(file_content)
+            # Lê só até o limite do upload resumable: arquivos menores vão numa única requisição
+            hasher = hashlib.sha256()
+            head = read_part(file, multipart_threshold())
+            if len(head) < multipart_threshold():
+                hasher.update(head)
+                file_size = len(head)
+                blob.upload_from_string(
+                    head,
+                    content_type=content_type or 'application/octet-stream',
+                    if_generation_match=if_generation_match,
+                )
+            else:
+                # Sem outra referência a `head`: cada parte é liberada logo após o envio
+                parts = chain((head,), iter_parts(file, gcs_chunk_size()))
+                del head
+                file_size = self._upload_resumable(blob, parts, hasher, content_type, if_generation_match)
+            file_hash = hasher.hexdigest()
             
             # Gerar URL pública (se bucket for público) ou usar gsutil URI
             gcs_url = f"gs://{self.bucket_name}/{gcs_key}"
@@ -98,6 +118,51 @@ class GCSService:
         except Exception as e:
             raise Exception(f"Erro ao fazer upload para GCS: {str(e)}")
     
+    def _upload_resumable(
+        self, blob, parts: Iterator[bytes], hasher, content_type: Optional[str], if_generation_match: Optional[int]
+    ) -> int:
+        """
+        Upload resumable das partes, atualizando o hash a cada parte
+        
+        O writer envia um chunk por vez. A política de retry padrão do writer
+        só refaz chunks que falharem quando há pré-condição de geração: com
+        `if_generation_match` (0 para chaves endereçadas por conteúdo) o upload
+        é idempotente e cada chunk é refeito; sem ela, um erro derruba o upload.
+        
+        O objeto só passa a existir quando o último chunk é aceito; se a
+        resposta dele se perder, o objeto pode ficar gravado mesmo com erro.
+        Ele só é apagado quando este upload criou a chave (`if_generation_match=0`,
+        chave única por upload): sem a pré-condição, a chave pode ter um objeto
+        de outro upload, e uma falha de pré-condição significa que o objeto
+        já existia.
+        
+        Returns:
+            int: Tamanho total enviado
+        """
+        file_size = 0
+        try:
+            with blob.open(
+                'wb',
+                chunk_size=gcs_chunk_size(),
+                content_type=content_type,
+                if_generation_match=if_generation_match,
+            ) as writer:
+                for part in parts:
+                    hasher.update(part)
+                    file_size += len(part)
+                    writer.write(part)
+                    del part  # libera a parte antes de ler a próxima
+        except PreconditionFailed:
+            raise
+        except Exception:
+            if if_generation_match == 0:
+                try:
+                    blob.delete()
+                except NotFound:
+                    pass
+            raise
+        return file_size
+    
     def download_file(self, gcs_key: str) -> bytes:
         """
         Download de arquivo do GCS
@@ -114,6 +179,36 @@ class GCSService:
         except Exception as e:
             raise Exception(f"Erro ao fazer download do GCS: {str(e)}")
     
+    def open_range(self, gcs_key: str, start: Optional[int] = None, end: Optional[int] = None) -> ObjectStream:
+        """
+        Abre o objeto (ou o intervalo [start, end], inclusivo) para leitura em pedaços
+        
+        Cada pedaço é um download ranged do blob; nada além do pedaço atual
+        fica em memória.
+        
+        Returns:
+            ObjectStream: Pedaços do conteúdo e função para fechar o leitor
+        """
+        chunk_size = download_chunk_size()
+        reader = self.bucket.blob(gcs_key).open('rb', chunk_size=chunk_size)
+        if start:
+            reader.seek(start)
+        
+        def chunks():
+            remaining = None if end is None else end - (start or 0) + 1
+            while remaining is None or remaining > 0:
+                try:
+                    data = reader.read(chunk_size if remaining is None else min(chunk_size, remaining))
+                except NotFound:
+                    raise Exception(f"Arquivo não encontrado: {gcs_key}")
+                if not data:
+                    return
+                if remaining is not None:
+                    remaining -= len(data)
+                yield data
+        
+        return ObjectStream(chunks=chunks(), close=reader.close)
+    
     def delete_file(self, gcs_key: str) -> bool:
         """
         Deletar arquivo do GCS
@@ -253,14 +348,12 @@ class GCSService:
     
     def get_file_hash(self, file: BinaryIO) -> str:
         """
-        Calcula hash SHA-256 de um arquivo
+        Calcula hash SHA-256 de um arquivo, lendo em partes
         
         Returns:
             str: Hash SHA-256
         """
-        file_content = file.read()
-        file.seek(0)  # Reset file pointer
-        return hashlib.sha256(file_content).hexdigest()
+        return sha256_of(file)
     
     def make_public(self, gcs_key: str) -> str:
         """
@@ -4,10 +4,21 @@ Serviço de S3 para manipulação de arquivos no bucket
 import boto3
 import hashlib
 import os
-from typing import Optional, BinaryIO
+from itertools import chain
+from typing import Iterator, Optional, BinaryIO
 from datetime import datetime, timedelta
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from settings import settings
+from .streaming import (
+    ObjectStream,
+    download_chunk_size,
+    iter_parts,
+    multipart_threshold,
+    part_size,
+    read_part,
+    sha256_of,
+)
 
 
 class S3Service:
@@ -18,7 +29,14 @@ class S3Service:
             's3',
             aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
             aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION
+            region_name=settings.AWS_REGION,
+            # Uma conexão por thread do executor de storage; timeouts de rede
+            # limitam as chamadas que a fachada assíncrona abandona
+            config=Config(
+                max_pool_connections=settings.STORAGE_EXECUTOR_WORKERS,
+                connect_timeout=10,
+                read_timeout=settings.STORAGE_UPLOAD_TIMEOUT_SECONDS,
+            ),
         )
         self.bucket_name = settings.S3_BUCKET_NAME
         self.region = settings.AWS_REGION
@@ -62,24 +80,28 @@ class S3Service:
             }
         """
         try:
-            # Ler conteúdo do arquivo
-            file_content = file.read()
-            file_size = len(file_content)
-            
-            # Calcular hash SHA-256
-            file_hash = hashlib.sha256(file_content).hexdigest()
-            
-            # Upload para S3
             extra_args = {}
             if content_type:
                 extra_args['ContentType'] = content_type
             
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=s3_key,
-                Body=file_content,
-                **extra_args
-            )
+            # Lê só até o limite do multipart: arquivos menores vão num único PUT
+            hasher = hashlib.sha256()
+            head = read_part(file, multipart_threshold())
+            if len(head) < multipart_threshold():
+                hasher.update(head)
+                file_size = len(head)
+                self.s3_client.put_object(
+                    Bucket=self.bucket_name,
+                    Key=s3_key,
+                    Body=head,
+                    **extra_args
+                )
+            else:
+                # Sem outra referência a `head`: cada parte é liberada logo após o envio
+                parts = chain((head,), iter_parts(file, part_size()))
+                del head
+                file_size = self._upload_multipart(s3_key, parts, hasher, extra_args)
+            file_hash = hasher.hexdigest()
             
             # Gerar URL pública
             s3_url = f"https://{self.bucket_name}.s3.{self.region}.amazonaws.com/{s3_key}"
@@ -96,6 +118,54 @@ class S3Service:
         except ClientError as e:
             raise Exception(f"Erro ao fazer upload para S3: {str(e)}")
     
+    def _upload_multipart(self, s3_key: str, parts: Iterator[bytes], hasher, extra_args: dict) -> int:
+        """
+        Multipart upload das partes, atualizando o hash a cada parte
+        
+        Em caso de erro o upload é abortado para não deixar partes órfãs
+        cobradas no bucket.
+        
+        Returns:
+            int: Tamanho total enviado
+        """
+        upload_id = self.s3_client.create_multipart_upload(
+            Bucket=self.bucket_name,
+            Key=s3_key,
+            **extra_args
+        )['UploadId']
+        try:
+            uploaded = []
+            file_size = 0
+            number = 0
+            for part in parts:
+                number += 1
+                hasher.update(part)
+                file_size += len(part)
+                response = self.s3_client.upload_part(
+                    Bucket=self.bucket_name,
+                    Key=s3_key,
+                    UploadId=upload_id,
+                    PartNumber=number,
+                    Body=part
+                )
+                del part  # libera a parte antes de ler a próxima
+                uploaded.append({'ETag': response['ETag'], 'PartNumber': number})
+            
+            self.s3_client.complete_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=s3_key,
+                UploadId=upload_id,
+                MultipartUpload={'Parts': uploaded}
+            )
+            return file_size
+        except Exception:
+            self.s3_client.abort_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=s3_key,
+                UploadId=upload_id
+            )
+            raise
+    
     def download_file(self, s3_key: str) -> bytes:
         """
         Download de arquivo do S3
@@ -113,6 +183,25 @@ class S3Service:
         except ClientError as e:
             raise Exception(f"Erro ao fazer download do S3: {str(e)}")
     
+    def open_range(self, s3_key: str, start: Optional[int] = None, end: Optional[int] = None) -> ObjectStream:
+        """
+        Abre o objeto (ou o intervalo [start, end], inclusivo) para leitura em pedaços
+        
+        O corpo do get_object é lido sob demanda, um pedaço por vez; nada além
+        do pedaço atual fica em memória.
+        
+        Returns:
+            ObjectStream: Pedaços do conteúdo e função para fechar a conexão
+        """
+        params = {'Bucket': self.bucket_name, 'Key': s3_key}
+        if start is not None:
+            params['Range'] = f"bytes={start}-{'' if end is None else end}"
+        try:
+            body = self.s3_client.get_object(**params)['Body']
+        except ClientError as e:
+            raise Exception(f"Erro ao fazer download do S3: {str(e)}")
+        return ObjectStream(chunks=body.iter_chunks(download_chunk_size()), close=body.close)
+    
     def delete_file(self, s3_key: str) -> bool:
         """
         Deletar arquivo do S3
@@ -257,14 +346,12 @@ class S3Service:
     
     def get_file_hash(self, file: BinaryIO) -> str:
         """
-        Calcula hash SHA-256 de um arquivo
+        Calcula hash SHA-256 de um arquivo, lendo em partes
         
         Returns:
             str: Hash SHA-256
         """
-        file_content = file.read()
-        file.seek(0)  # Reset file pointer
-        return hashlib.sha256(file_content).hexdigest()
+        return sha256_of(file)
 
 
 # Instância global do serviço
@@ -0,0 +1,105 @@
+"""
+Cache em memória de URLs pré-assinadas, por processo.
+
+Assinar é CPU pura (HMAC no S3; RSA na assinatura v4 do GCS), mas repetida
+em toda leitura de material ela pesa, e gravar a URL de volta no banco
+transformava um GET numa transação de escrita. Aqui:
+
+    - o tempo é dividido em janelas de SIGNED_URL_BUCKET_SECONDS; a chave do
+      cache é (chave do storage, janela)
+    - toda URL da janela expira no mesmo instante, fim da janela +
+      SIGNED_URL_TTL_SECONDS: quem a recebe tem sempre ao menos o TTL de
+      validade, e a mesma URL se repete durante a janela (cache do navegador/CDN)
+    - na virada da janela a chave muda; as entradas antigas saem pelo TTL
+    - listagens assinam todas as linhas que faltam numa única ida ao executor
+
+Métricas: `signed_url_cache_hits_total`, `signed_url_cache_misses_total` e,
+em `app.services.async_storage`, o tempo de CPU por assinatura.
+"""
+import math
+import time
+from datetime import datetime
+from typing import Iterable, Optional
+
+from cachetools import TTLCache
+
+from app.core.metrics import registry
+from app.services.async_storage import AsyncStorageService, async_storage
+from settings import settings
+
+SignedUrl = tuple[str, datetime]
+
+
+class SignedUrlCache:
+    """Cache TTL + LRU de URLs pré-assinadas indexado por (chave, janela de expiração)."""
+
+    def __init__(self, storage: AsyncStorageService, maxsize: int, ttl: int, bucket_seconds: int, enabled: bool = True):
+        self.storage = storage
+        self.ttl = ttl
+        self.bucket_seconds = max(bucket_seconds, 1)
+        self.enabled = enabled
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=self.bucket_seconds)
+        self.hits = registry.counter("signed_url_cache_hits_total", "URLs pré-assinadas servidas pelo cache")
+        self.misses = registry.counter("signed_url_cache_misses_total", "URLs pré-assinadas geradas por falta no cache")
+
+    def _window(self, now: float) -> tuple[int, float]:
+        """Janela atual e o instante (epoch) em que suas URLs expiram."""
+        window = int(now // self.bucket_seconds)
+        return window, (window + 1) * self.bucket_seconds + self.ttl
+
+    async def sign(self, key: str) -> SignedUrl:
+        """
+        URL pré-assinada de uma chave.
+
+        :param key: Chave no storage.
+        :return: (URL, expiração em UTC sem timezone, como as colunas do banco).
+        """
+        return (await self.sign_many([key]))[key]
+
+    async def sign_many(self, keys: Iterable[Optional[str]]) -> dict[str, SignedUrl]:
+        """
+        URLs pré-assinadas de várias chaves; as que faltam no cache são assinadas em lote.
+
+        :param keys: Chaves no storage (None e repetidas são ignoradas).
+        :return: Chave -> (URL, expiração em UTC sem timezone).
+        """
+        now = time.time()
+        window, expires_at = self._window(now)
+        expires = datetime.utcfromtimestamp(expires_at)
+        result: dict[str, SignedUrl] = {}
+        missing = []
+        for key in dict.fromkeys(key for key in keys if key):
+            url = self._cache.get((key, window)) if self.enabled else None
+            if url is None:
+                missing.append(key)
+            else:
+                result[key] = (url, expires)
+        self.hits.inc(len(result))
+        if not missing:
+            return result
+
+        self.misses.inc(len(missing))
+        # Validade contada a partir de agora até o fim da janela + TTL
+        urls = await self.storage.generate_presigned_urls(missing, math.ceil(expires_at - now))
+        for key, url in urls.items():
+            if self.enabled:
+                self._cache[(key, window)] = url
+            result[key] = (url, expires)
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "size": len(self._cache),
+            "hits": self.hits.value,
+            "misses": self.misses.value,
+        }
+
+
+signed_urls = SignedUrlCache(
+    async_storage,
+    maxsize=settings.SIGNED_URL_CACHE_MAXSIZE,
+    ttl=settings.SIGNED_URL_TTL_SECONDS,
+    bucket_seconds=settings.SIGNED_URL_BUCKET_SECONDS,
+    enabled=settings.SIGNED_URL_CACHE_ENABLED,
+)
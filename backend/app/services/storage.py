@@ -2,7 +2,9 @@
 Serviço unificado de storage que abstrai S3 e GCS
 """
 from typing import Optional, BinaryIO
+from uuid import uuid4
 from settings import settings
+from .streaming import ObjectStream
 
 
 class StorageService:
@@ -50,6 +52,23 @@ class StorageService:
         else:
             return self._service.generate_s3_key(workspace_id, skill_id, folder, file_name, entity_id)
     
+    def generate_content_key(self, workspace_id: int, file_hash: str) -> str:
+        """
+        Gera chave endereçada por conteúdo (deduplicação por workspace)
+        
+        Formato: workspaces/{workspace_id}/objects/{hash[:2]}/{hash}/{uuid}
+        
+        O sufixo aleatório torna a chave física única por upload: um objeto
+        coletado (última referência apagada, remoção em background) nunca tem
+        a chave reaproveitada por um novo upload do mesmo conteúdo.
+        """
+        return f"workspaces/{workspace_id}/objects/{file_hash[:2]}/{file_hash}/{uuid4().hex}"
+    
+    def is_content_key(self, key: str) -> bool:
+        """Indica se a chave foi gerada por generate_content_key"""
+        parts = key.split('/')
+        return len(parts) == 6 and parts[0] == 'workspaces' and parts[2] == 'objects' and len(parts[4]) == 64
+    
     def upload_file(
         self,
         file: BinaryIO,
@@ -69,7 +88,11 @@ class StorageService:
                 'file_hash': str
             }
         """
-        result = self._service.upload_file(file, key, content_type)
+        if self.provider == 'gcs' and self.is_content_key(key):
+            # Chave nova por upload: nunca sobrescreve, e a pré-condição habilita o retry por chunk
+            result = self._service.upload_file(file, key, content_type, if_generation_match=0)
+        else:
+            result = self._service.upload_file(file, key, content_type)
         
         # Normalizar chaves de retorno
         return {
@@ -85,6 +108,10 @@ class StorageService:
         """Download de arquivo"""
         return self._service.download_file(key)
     
+    def open_range(self, key: str, start: Optional[int] = None, end: Optional[int] = None) -> ObjectStream:
+        """Abre o arquivo (ou o intervalo [start, end], inclusivo) para leitura em pedaços"""
+        return self._service.open_range(key, start, end)
+    
     def delete_file(self, key: str) -> bool:
         """Deletar arquivo"""
         return self._service.delete_file(key)
@@ -0,0 +1,92 @@
+"""
+Coleta de uploads deduplicados que nunca foram vinculados.
+
+O upload registra o objeto com `ref_count = 0`; a referência só é contada
+quando uma fonte de conhecimento ou um material é criado com a chave. Um
+upload abandonado (cliente desistiu, erro entre o upload e o create) ficaria
+no bucket para sempre. O job remove, em lotes, os registros sem referências
+criados há mais de STORAGE_UNREFERENCED_TTL_HOURS e apaga os arquivos depois
+do commit. Como as chaves são únicas por upload, apagar o arquivo nunca
+alcança um reenvio do mesmo conteúdo.
+
+Vários workers podem rodar o job ao mesmo tempo: as linhas são travadas com
+SKIP LOCKED, então cada uma é coletada por um só.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app.core.logging import get_logger
+from app.core.metrics import registry
+from app.database.repository.storage_object import StorageObjectRepository
+from app.services.async_storage import AsyncStorageService, async_storage
+from settings import settings
+
+logger = get_logger(__name__)
+
+
+class UnreferencedObjectCollector:
+    """Remoção periódica de objetos do storage sem referências."""
+
+    def __init__(self, storage: AsyncStorageService, ttl_hours: int, interval: int, batch_size: int = 500):
+        self.storage = storage
+        self.ttl = timedelta(hours=ttl_hours)
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+        self.collected = registry.counter("storage_objects_collected_total", "Uploads sem referências coletados")
+        self.failures = registry.counter(
+            "storage_objects_collect_failures_total", "Arquivos coletados que falharam ao sair do storage"
+        )
+
+    async def run(self, session_factory, now: Optional[datetime] = None) -> int:
+        """Uma rodada; retorna quantos objetos foram coletados."""
+        created_before = (now or datetime.utcnow()) - self.ttl
+        total = 0
+        while True:
+            async with session_factory() as db:
+                keys = await StorageObjectRepository(db).collect_unreferenced(created_before, self.batch_size)
+                await db.commit()
+            if not keys:
+                break
+            results = await asyncio.gather(*(self.storage.delete_file(key) for key in keys), return_exceptions=True)
+            for key, result in zip(keys, results):
+                if isinstance(result, Exception):
+                    self.failures.inc()
+                    logger.warning(f"Falha ao apagar upload sem referências do storage ({key}): {result}")
+            total += len(keys)
+            self.collected.inc(len(keys))
+            if len(keys) < self.batch_size:
+                break
+        if total:
+            logger.info(f"Uploads sem referências coletados: {total}")
+        return total
+
+    async def _loop(self, session_factory) -> None:
+        while True:
+            try:
+                await self.run(session_factory)
+            except Exception as e:
+                logger.warning(f"Falha na coleta de uploads sem referências: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self, session_factory) -> None:
+        """Roda uma vez já no startup e depois a cada `interval` segundos."""
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._loop(session_factory))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+unreferenced_objects = UnreferencedObjectCollector(
+    async_storage,
+    ttl_hours=settings.STORAGE_UNREFERENCED_TTL_HOURS,
+    interval=settings.STORAGE_GC_INTERVAL_SECONDS,
+)
@@ -0,0 +1,90 @@
+"""
+Utilitários de leitura em partes para o storage.
+
+Uploads e hashes não carregam o arquivo inteiro em memória: leem partes de
+tamanho fixo (STORAGE_PART_SIZE_BYTES) e atualizam o SHA-256 a cada parte.
+Acima de STORAGE_MULTIPART_THRESHOLD_BYTES, os serviços usam multipart upload
+(S3) ou upload resumable (GCS). O pico de memória por upload fica em torno de
+duas partes, qualquer que seja o tamanho do arquivo.
+
+Downloads seguem o mesmo princípio no sentido inverso: `open_range` dos
+serviços devolve um ObjectStream que lê o objeto (ou um intervalo de bytes
+dele) em pedaços de STORAGE_DOWNLOAD_CHUNK_BYTES.
+"""
+import hashlib
+from dataclasses import dataclass
+from typing import BinaryIO, Callable, Iterator
+
+from settings import settings
+
+# Menor parte aceita pelo multipart do S3 (exceto a última)
+S3_MIN_PART_SIZE = 5 * 1024 * 1024
+# O chunk_size de uploads resumable do GCS precisa ser múltiplo de 256 KiB
+GCS_CHUNK_MULTIPLE = 256 * 1024
+
+
+@dataclass
+class ObjectStream:
+    """Leitura em pedaços de um objeto do storage; `close` libera a conexão."""
+
+    chunks: Iterator[bytes]
+    close: Callable[[], None]
+
+
+def part_size() -> int:
+    """Tamanho das partes (nunca menor que o mínimo do S3)."""
+    return max(settings.STORAGE_PART_SIZE_BYTES, S3_MIN_PART_SIZE)
+
+
+def multipart_threshold() -> int:
+    """Tamanho a partir do qual o upload vai em partes (nunca menor que o mínimo do S3)."""
+    return max(settings.STORAGE_MULTIPART_THRESHOLD_BYTES, S3_MIN_PART_SIZE)
+
+
+def gcs_chunk_size() -> int:
+    """Tamanho das partes arredondado para cima ao múltiplo de 256 KiB exigido pelo GCS."""
+    size = part_size()
+    return -(-size // GCS_CHUNK_MULTIPLE) * GCS_CHUNK_MULTIPLE
+
+
+def read_part(file: BinaryIO, size: int) -> bytes:
+    """
+    Lê até `size` bytes, repetindo leituras curtas.
+
+    :param file: Arquivo de origem.
+    :param size: Tamanho da parte.
+    :return: A parte; menor que `size` só no fim do arquivo (vazia no EOF).
+    """
+    chunks = []
+    remaining = size
+    while remaining > 0:
+        chunk = file.read(remaining)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return chunks[0] if len(chunks) == 1 else b"".join(chunks)
+
+
+def iter_parts(file: BinaryIO, size: int) -> Iterator[bytes]:
+    """Partes de `size` bytes até o fim do arquivo."""
+    while True:
+        part = read_part(file, size)
+        if not part:
+            return
+        yield part
+        # Solta a parte antes de ler a próxima (quem consome também não deve guardá-la)
+        del part
+
+
+def sha256_of(file: BinaryIO) -> str:
+    """SHA-256 do arquivo lido em partes; volta o ponteiro ao início."""
+    hasher = hashlib.sha256()
+    for part in iter_parts(file, part_size()):
+        hasher.update(part)
+    file.seek(0)
+    return hasher.hexdigest()
+
+
+def download_chunk_size() -> int:
+    return max(settings.STORAGE_DOWNLOAD_CHUNK_BYTES, 64 * 1024)
@@ -0,0 +1,89 @@
+"""
+Benchmark: latência das primeiras N requisições logo após o startup.
+
+Para cada modo, cria um engine novo (pool vazio, como num deploy) e dispara
+uma rajada de N "requisições" concorrentes, cada uma com uma sessão própria
+executando leituras que tocam colunas ENUM (quadros e fontes de conhecimento):
+
+    - cold: a rajada chega com o pool vazio
+    - warm: antes da rajada roda `warm_engine` (conexões abertas + codecs)
+
+O tempo do aquecimento é reportado à parte: ele acontece antes de o processo
+se declarar pronto, fora do caminho das requisições.
+
+Uso (a partir de backend/):
+    python -m benchmarks.cold_start --requests 20 --warmup-connections 10
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.database.models  # noqa: F401  (registra todos os modelos no metadata)
+from app.database.db import build_connect_args, resolve_statement_cache_mode
+from app.database.models.kanban_board import KanbanBoard
+from app.database.models.skill import SkillKnowledge
+from app.database.warmup import warm_engine
+from settings import settings
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _request(session_factory) -> float:
+    start = time.perf_counter()
+    async with session_factory() as db:
+        await db.execute(select(KanbanBoard.id, KanbanBoard.status).limit(1))
+        await db.execute(select(SkillKnowledge.id, SkillKnowledge.processing_status).limit(1))
+    return (time.perf_counter() - start) * 1000
+
+
+async def run_mode(url: str, warm: bool, requests: int, warmup_connections: int) -> None:
+    engine = create_async_engine(
+        url,
+        pool_size=10,
+        max_overflow=20,
+        pool_pre_ping=True,
+        # Mesmos connect_args da aplicação (só se aplicam ao asyncpg)
+        connect_args=build_connect_args(resolve_statement_cache_mode(url)) if "asyncpg" in url else {},
+    )
+    session_factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        warmup_ms = 0.0
+        if warm:
+            start = time.perf_counter()
+            await warm_engine(engine, warmup_connections)
+            warmup_ms = (time.perf_counter() - start) * 1000
+        timings = await asyncio.gather(*(_request(session_factory) for _ in range(requests)))
+        name = "warm" if warm else "cold"
+        print(
+            f"{name:<5} | aquecimento {warmup_ms:7.1f} ms | primeiras {requests} req: "
+            f"avg {statistics.fmean(timings):7.2f} ms | p50 {_percentile(timings, 50):7.2f} ms | "
+            f"p99 {_percentile(timings, 99):7.2f} ms | max {max(timings):7.2f} ms"
+        )
+    finally:
+        await engine.dispose()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=settings.POSTGRES_URL)
+    parser.add_argument("--requests", type=int, default=20, help="Tamanho da rajada inicial")
+    parser.add_argument("--warmup-connections", type=int, default=settings.DB_POOL_WARMUP_CONNECTIONS)
+    parser.add_argument("--rounds", type=int, default=3, help="Repetições de cada modo")
+    args = parser.parse_args()
+
+    for _ in range(args.rounds):
+        await run_mode(args.url, False, args.requests, args.warmup_connections)
+        await run_mode(args.url, True, args.requests, args.warmup_connections)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
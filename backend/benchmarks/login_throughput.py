@@ -0,0 +1,97 @@
+"""
+Benchmark: latência de endpoints não relacionados durante uma rajada de logins.
+
+Roda dentro de um único event loop (como um worker uvicorn) e compara:
+    - sync:  `verify_password` chamado direto do handler (bloqueia o loop)
+    - async: `verify_password_async` (pool dedicado com concorrência limitada)
+
+Enquanto os logins rodam, um "endpoint não relacionado" é simulado por uma
+tarefa que mede o atraso do event loop em cada tick. O p99 desse atraso é a
+latência extra que qualquer outra requisição pagaria.
+
+Uso (a partir de backend/):
+    python -m benchmarks.login_throughput --logins 200 --concurrency 20
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.core.security import (
+    get_password_hash,
+    verify_password,
+    verify_password_async,
+)
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _probe(stop: asyncio.Event, samples: list[float], interval: float) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(interval)
+        samples.append((loop.time() - start - interval) * 1000)
+
+
+async def _login_sync(password: str, hashed: str) -> None:
+    verify_password(password, hashed)
+
+
+async def _login_async(password: str, hashed: str) -> None:
+    await verify_password_async(password, hashed)
+
+
+async def run_mode(mode: str, logins: int, concurrency: int, hashed: str) -> dict:
+    handler = _login_sync if mode == "sync" else _login_async
+    semaphore = asyncio.Semaphore(concurrency)
+    samples: list[float] = []
+    stop = asyncio.Event()
+
+    async def one_login() -> None:
+        async with semaphore:
+            await handler("benchmark-password", hashed)
+            # devolve o controle ao loop entre logins, como um handler real
+            await asyncio.sleep(0)
+
+    probe = asyncio.create_task(_probe(stop, samples, interval=0.005))
+    started = time.perf_counter()
+    await asyncio.gather(*(one_login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe
+
+    return {
+        "mode": mode,
+        "logins_per_s": logins / elapsed,
+        "probe_p50_ms": statistics.median(samples) if samples else 0.0,
+        "probe_p99_ms": _percentile(samples, 99),
+        "probe_max_ms": max(samples) if samples else 0.0,
+        "probe_samples": len(samples),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    hashed = get_password_hash("benchmark-password")
+    for mode in ("sync", "async"):
+        result = await run_mode(mode, args.logins, args.concurrency, hashed)
+        print(
+            f"{result['mode']:>5} | {result['logins_per_s']:8.1f} logins/s | "
+            f"p50 {result['probe_p50_ms']:7.2f} ms | p99 {result['probe_p99_ms']:7.2f} ms | "
+            f"max {result['probe_max_ms']:7.2f} ms | n={result['probe_samples']}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+"""
+Benchmark: cache de prepared statements do asyncpg nos caminhos de leitura dos repositórios.
+
+Cria um engine por modo (`direct`, `pooler`, `disabled`) apontando para
+POSTGRES_URL e executa as mesmas leituras de repositório repetidamente,
+reportando latência média e p99 por operação.
+
+Uso (a partir de backend/, com um Postgres local populado):
+    python -m benchmarks.statement_cache --iterations 2000 --email user@exemplo.com \\
+        --organization-id 1 --workspace-id 1 --board-id 1
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database.db import build_connect_args
+from app.database.repository.kanban_board import KanbanBoardRepository
+from app.database.repository.kanban_column import KanbanColumnRepository
+from app.database.repository.user import UserRepository
+from app.database.repository.workspace import WorkspaceRepository
+from settings import settings
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_mode(mode: str, args: argparse.Namespace) -> dict[str, list[float]]:
+    engine = create_async_engine(
+        settings.POSTGRES_URL,
+        pool_size=1,
+        max_overflow=0,
+        connect_args=build_connect_args(mode),
+    )
+    session_factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    operations = {
+        "user.get_by_email": lambda db: UserRepository(db).get_by_email(args.email),
+        "workspace.get_by_organization": lambda db: WorkspaceRepository(db).get_by_organization(args.organization_id),
+        "kanban_board.get_by_workspace": lambda db: KanbanBoardRepository(db).get_by_workspace(args.workspace_id),
+        "kanban_column.get_by_board": lambda db: KanbanColumnRepository(db).get_by_board(args.board_id),
+    }
+    timings: dict[str, list[float]] = {name: [] for name in operations}
+    try:
+        async with session_factory() as db:
+            # aquecimento: abre a conexão e popula os caches
+            for operation in operations.values():
+                await operation(db)
+            for _ in range(args.iterations):
+                for name, operation in operations.items():
+                    start = time.perf_counter()
+                    await operation(db)
+                    timings[name].append((time.perf_counter() - start) * 1000)
+                    db.expunge_all()
+    finally:
+        await engine.dispose()
+    return timings
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--email", default="benchmark@example.com")
+    parser.add_argument("--organization-id", type=int, default=1)
+    parser.add_argument("--workspace-id", type=int, default=1)
+    parser.add_argument("--board-id", type=int, default=1)
+    parser.add_argument("--modes", nargs="+", default=["direct", "pooler", "disabled"])
+    args = parser.parse_args()
+
+    for mode in args.modes:
+        timings = await run_mode(mode, args)
+        for name, values in timings.items():
+            print(
+                f"{mode:>8} | {name:<32} | avg {statistics.fmean(values):6.3f} ms | "
+                f"p99 {_percentile(values, 99):6.3f} ms"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,118 @@
+"""
+Benchmark: idas ao banco nos caminhos de escrita dos repositórios.
+
+Compara o padrão antigo (add + flush + refresh / get + flush + refresh) com o
+INSERT/UPDATE ... RETURNING de `BaseRepository.create`/`update`, contando os
+statements enviados (evento `before_cursor_execute`) e medindo a latência.
+
+Tudo roda dentro de uma transação desfeita ao final: nenhum dado é gravado.
+
+Uso (a partir de backend/):
+    python -m benchmarks.write_roundtrips --iterations 500
+    python -m benchmarks.write_roundtrips --url sqlite+aiosqlite:///:memory: --create-schema
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.database.models  # noqa: F401  (registra todos os modelos no metadata)
+from app.database.db import Base
+from app.database.models.kanban_board import KanbanBoard
+from app.database.models.organization import Organization
+from app.database.models.workspace import Workspace
+from app.database.repository.kanban_board import KanbanBoardRepository
+from settings import settings
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def legacy_create(db: AsyncSession, workspace_id: int, n: int) -> KanbanBoard:
+    board = KanbanBoard(workspace_id=workspace_id, name=f"board {n}")
+    db.add(board)
+    await db.flush()
+    await db.refresh(board)
+    return board
+
+
+async def returning_create(db: AsyncSession, workspace_id: int, n: int) -> KanbanBoard:
+    return await KanbanBoardRepository(db).create(KanbanBoard(workspace_id=workspace_id, name=f"board {n}"))
+
+
+async def legacy_update(db: AsyncSession, board_id: int, n: int) -> KanbanBoard:
+    board = await db.get(KanbanBoard, board_id)
+    board.name = f"renamed {n}"
+    await db.flush()
+    await db.refresh(board)
+    return board
+
+
+async def returning_update(db: AsyncSession, board_id: int, n: int) -> KanbanBoard:
+    return await KanbanBoardRepository(db).update(board_id, {"name": f"renamed {n}"})
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=settings.POSTGRES_URL)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--create-schema", action="store_true", help="Cria as tabelas antes (banco vazio)")
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.url)
+    statements = [0]
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements[0] += 1
+
+    try:
+        if args.create_schema:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+
+        async with engine.connect() as conn:
+            transaction = await conn.begin()
+            session_factory = sessionmaker(bind=conn, class_=AsyncSession, expire_on_commit=False)
+            async with session_factory() as db:
+                organization = Organization(name="benchmark", slug=f"benchmark-{time.time_ns()}")
+                db.add(organization)
+                await db.flush()
+                workspace = Workspace(name="benchmark", organization_id=organization.id)
+                db.add(workspace)
+                await db.flush()
+                target = await returning_create(db, workspace.id, 0)
+
+                cases = {
+                    "create (flush + refresh)": lambda n: legacy_create(db, workspace.id, n),
+                    "create (INSERT RETURNING)": lambda n: returning_create(db, workspace.id, n),
+                    "update (get + flush + refresh)": lambda n: legacy_update(db, target.id, n),
+                    "update (UPDATE RETURNING)": lambda n: returning_update(db, target.id, n),
+                }
+                for name, case in cases.items():
+                    timings = []
+                    statements[0] = 0
+                    for n in range(args.iterations):
+                        # sessão limpa: o update antigo não aproveita o identity map
+                        db.expunge_all()
+                        start = time.perf_counter()
+                        await case(n)
+                        timings.append((time.perf_counter() - start) * 1000)
+                    print(
+                        f"{name:<32} | {statements[0] / args.iterations:4.1f} statements/op | "
+                        f"avg {statistics.fmean(timings):6.3f} ms | p99 {_percentile(timings, 99):6.3f} ms"
+                    )
+            await transaction.rollback()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
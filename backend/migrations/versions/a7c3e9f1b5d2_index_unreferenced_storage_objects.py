@@ -0,0 +1,34 @@
+"""Index unreferenced storage_objects for the upload collector
+
+Revision ID: a7c3e9f1b5d2
+Revises: f2b7d5e9a4c1
+Create Date: 2026-10-17 21:05:37.218406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e9f1b5d2'
+down_revision: Union[str, Sequence[str], None] = 'f2b7d5e9a4c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_storage_objects_unreferenced',
+        'storage_objects',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text('ref_count = 0'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_storage_objects_unreferenced', table_name='storage_objects')
@@ -0,0 +1,77 @@
+"""Add composite and partial indexes for hot predicates
+
+Os índices são criados com CREATE INDEX CONCURRENTLY (sem bloquear escritas),
+por isso rodam fora da transação da migration (autocommit_block). Se uma
+execução anterior falhou no meio, o índice INVALID que sobrou é removido antes
+de ser recriado.
+
+Revision ID: c7d2f4a81e36
+Revises: a3c9e1d47b20
+Create Date: 2026-10-17 11:02:15.640193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d2f4a81e36'
+down_revision: Union[str, Sequence[str], None] = 'a3c9e1d47b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (nome, tabela, colunas, predicado do índice parcial)
+INDEXES = [
+    ('ix_skill_chunks_skill_id_synced_to_qdrant', 'skill_chunks', ['skill_id', 'synced_to_qdrant'], None),
+    ('ix_skill_knowledges_skill_id_processing_status', 'skill_knowledges', ['skill_id', 'processing_status'], None),
+    (
+        'ix_skill_knowledges_skill_id_in_progress',
+        'skill_knowledges',
+        ['skill_id'],
+        "processing_status IN ('PENDING', 'PROCESSING')",
+    ),
+    ('ix_workspace_members_workspace_id_user_id', 'workspace_members', ['workspace_id', 'user_id'], None),
+    ('ix_organization_members_organization_id_user_id', 'organization_members', ['organization_id', 'user_id'], None),
+    ('ix_kanban_boards_workspace_id_updated_at_id', 'kanban_boards', ['workspace_id', 'updated_at', 'id'], None),
+]
+
+
+def _drop_invalid_leftovers() -> None:
+    """Remove índices INVALID deixados por um CREATE INDEX CONCURRENTLY interrompido."""
+    if op.get_context().as_sql:
+        return
+    invalid = op.get_bind().execute(
+        sa.text(
+            "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE NOT i.indisvalid AND c.relname = ANY(:names)"
+        ),
+        {'names': [name for name, _, _, _ in INDEXES]},
+    ).scalars().all()
+    for name in invalid:
+        op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        _drop_invalid_leftovers()
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
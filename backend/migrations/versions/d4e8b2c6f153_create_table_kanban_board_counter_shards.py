@@ -0,0 +1,36 @@
+"""Create kanban_board_counter_shards table
+
+Revision ID: d4e8b2c6f153
+Revises: c7d2f4a81e36
+Create Date: 2026-10-17 14:27:03.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e8b2c6f153'
+down_revision: Union[str, Sequence[str], None] = 'c7d2f4a81e36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'kanban_board_counter_shards',
+        sa.Column('board_id', sa.Integer(), nullable=False),
+        sa.Column('counter', sa.String(length=32), nullable=False),
+        sa.Column('shard', sa.SmallInteger(), nullable=False),
+        sa.Column('delta', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['board_id'], ['kanban_boards.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('board_id', 'counter', 'shard')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('kanban_board_counter_shards')
@@ -0,0 +1,114 @@
+"""Partition skill_usage_logs by month (RANGE on created_at)
+
+Revision ID: e5a1c9d3f7b4
+Revises: d4e8b2c6f153
+Create Date: 2026-10-17 16:05:41.209318
+
+A tabela é recriada como particionada: a original é renomeada, a nova é
+criada com `PARTITION BY RANGE (created_at)` e uma partição por mês (do mês
+do registro mais antigo até PARTITIONS_AHEAD meses à frente), os dados são
+copiados e a original é removida. A sequence de `id` é reaproveitada.
+
+Daqui em diante, `app.database.partitions` cria as partições futuras e remove
+as antigas (retenção). Os nomes seguem `skill_usage_logs_pYYYYMM`.
+
+A cópia segura um lock exclusivo em skill_usage_logs durante a migration:
+rode numa janela de manutenção se a tabela for grande.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a1c9d3f7b4'
+down_revision: Union[str, Sequence[str], None] = 'd4e8b2c6f153'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITIONS_AHEAD = 3
+
+COLUMNS = "id, material_id, user_id, created_at, metadata_log"
+
+
+def _columns() -> list:
+    return [
+        sa.Column('id', sa.Integer(), server_default=sa.text("nextval('skill_usage_logs_id_seq'::regclass)"), nullable=False),
+        sa.Column('material_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('metadata_log', sa.JSON(), nullable=True),
+        sa.ForeignKeyConstraint(['material_id'], ['skill_materials.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Tira a tabela atual do caminho sem perder a sequence do id
+    op.execute("ALTER SEQUENCE skill_usage_logs_id_seq OWNED BY NONE")
+    op.drop_index(op.f('ix_skill_usage_logs_id'), table_name='skill_usage_logs')
+    op.drop_index(op.f('ix_skill_usage_logs_material_id'), table_name='skill_usage_logs')
+    op.drop_index(op.f('ix_skill_usage_logs_user_id'), table_name='skill_usage_logs')
+    op.rename_table('skill_usage_logs', 'skill_usage_logs_legacy')
+    op.execute("ALTER TABLE skill_usage_logs_legacy RENAME CONSTRAINT skill_usage_logs_pkey TO skill_usage_logs_legacy_pkey")
+
+    # A chave de partição precisa fazer parte da PK
+    op.create_table(
+        'skill_usage_logs',
+        *_columns(),
+        sa.PrimaryKeyConstraint('id', 'created_at'),
+        postgresql_partition_by='RANGE (created_at)',
+    )
+    op.create_index(op.f('ix_skill_usage_logs_material_id'), 'skill_usage_logs', ['material_id'], unique=False)
+    op.create_index(op.f('ix_skill_usage_logs_user_id'), 'skill_usage_logs', ['user_id'], unique=False)
+
+    # Uma partição por mês, cobrindo os dados existentes e os próximos meses
+    op.execute(f"""
+        DO $$
+        DECLARE
+            month_start date;
+            last_month date;
+        BEGIN
+            SELECT date_trunc('month', coalesce(min(created_at), timezone('utc', now())))::date,
+                   date_trunc('month', greatest(
+                       coalesce(max(created_at), timezone('utc', now())),
+                       timezone('utc', now()) + interval '{PARTITIONS_AHEAD} months'
+                   ))::date
+              INTO month_start, last_month
+              FROM skill_usage_logs_legacy;
+            WHILE month_start <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE IF NOT EXISTS %I PARTITION OF skill_usage_logs FOR VALUES FROM (%L) TO (%L)',
+                    'skill_usage_logs_p' || to_char(month_start, 'YYYYMM'),
+                    month_start,
+                    (month_start + interval '1 month')::date
+                );
+                month_start := (month_start + interval '1 month')::date;
+            END LOOP;
+        END $$
+    """)
+
+    op.execute(f"INSERT INTO skill_usage_logs ({COLUMNS}) SELECT {COLUMNS} FROM skill_usage_logs_legacy")
+    op.drop_table('skill_usage_logs_legacy')
+    op.execute("ALTER SEQUENCE skill_usage_logs_id_seq OWNED BY skill_usage_logs.id")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER SEQUENCE skill_usage_logs_id_seq OWNED BY NONE")
+    op.create_table(
+        'skill_usage_logs_plain',
+        *_columns(),
+        sa.PrimaryKeyConstraint('id', name='skill_usage_logs_plain_pkey'),
+    )
+    op.execute(f"INSERT INTO skill_usage_logs_plain ({COLUMNS}) SELECT {COLUMNS} FROM skill_usage_logs")
+    # Remove a tabela particionada junto com todas as partições
+    op.drop_table('skill_usage_logs')
+    op.rename_table('skill_usage_logs_plain', 'skill_usage_logs')
+    op.execute("ALTER TABLE skill_usage_logs RENAME CONSTRAINT skill_usage_logs_plain_pkey TO skill_usage_logs_pkey")
+    op.create_index(op.f('ix_skill_usage_logs_id'), 'skill_usage_logs', ['id'], unique=False)
+    op.create_index(op.f('ix_skill_usage_logs_material_id'), 'skill_usage_logs', ['material_id'], unique=False)
+    op.create_index(op.f('ix_skill_usage_logs_user_id'), 'skill_usage_logs', ['user_id'], unique=False)
+    op.execute("ALTER SEQUENCE skill_usage_logs_id_seq OWNED BY skill_usage_logs.id")
@@ -0,0 +1,48 @@
+"""Create storage_objects table
+
+Revision ID: f2b7d5e9a4c1
+Revises: e5a1c9d3f7b4
+Create Date: 2026-10-17 18:42:10.734512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b7d5e9a4c1'
+down_revision: Union[str, Sequence[str], None] = 'e5a1c9d3f7b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'storage_objects',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('workspace_id', sa.Integer(), nullable=False),
+        sa.Column('file_hash', sa.String(length=64), nullable=False),
+        sa.Column('storage_key', sa.String(length=1000), nullable=False),
+        sa.Column('bucket', sa.String(length=255), nullable=False),
+        sa.Column('url', sa.String(length=2000), nullable=True),
+        sa.Column('provider', sa.String(length=10), nullable=False),
+        sa.Column('file_size', sa.BigInteger(), nullable=False),
+        sa.Column('content_type', sa.String(length=100), nullable=True),
+        sa.Column('ref_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['workspace_id'], ['workspaces.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('storage_key'),
+        sa.UniqueConstraint('workspace_id', 'file_hash', name='uq_storage_objects_workspace_id_file_hash')
+    )
+    op.create_index(op.f('ix_storage_objects_id'), 'storage_objects', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_storage_objects_id'), table_name='storage_objects')
+    op.drop_table('storage_objects')
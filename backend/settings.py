@@ -22,16 +22,60 @@ class Settings(BaseSettings):
     SECRET_KEY: str = Field(default="CHANGE_ME_IN_PROD", description="Chave secreta para JWT")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    AUTH_STATELESS_TOKENS: bool = Field(
+        default=False,
+        description="Confia no principal assinado no JWT até a expiração (sem consulta ao banco)"
+    )
+    TOKEN_DENYLIST_SYNC_SECONDS: int = Field(default=30, description="Intervalo de sincronização da denylist entre workers")
+    TOKEN_DENYLIST_CAPACITY: int = Field(default=10000, description="Capacidade nominal do bloom filter da denylist")
+    PASSWORD_HASH_MAX_CONCURRENCY: int = Field(default=4, description="Máximo de hashes de senha simultâneos fora do event loop")
+
+    # Cache de principal (usuário autenticado)
+    PRINCIPAL_CACHE_ENABLED: bool = Field(default=True, description="Habilita o cache de usuário autenticado")
+    PRINCIPAL_CACHE_TTL_SECONDS: int = Field(default=60, description="TTL das entradas do cache de principal")
+    PRINCIPAL_CACHE_MAXSIZE: int = Field(default=10000, description="Número máximo de principais em cache (LRU)")
 
     # Google OAuth
     GOOGLE_CLIENT_ID: Optional[str] = Field(default=None, description="Client ID do Google")
     GOOGLE_CLIENT_SECRET: Optional[str] = Field(default=None, description="Client Secret do Google")
+    GOOGLE_JWKS_URL: str = Field(
+        default="https://www.googleapis.com/oauth2/v3/certs",
+        description="Endpoint JWKS com as chaves públicas do Google"
+    )
+    GOOGLE_JWKS_FILE: Optional[str] = Field(default=None, description="Arquivo JWKS local (substitui o endpoint do Google)")
 
     # PostgreSQL
     POSTGRES_URL: Optional[str] = Field(
         default="",
         description='URL de conexão com PostgreSQL'
     )
+    POSTGRES_REPLICA_URL: Optional[str] = Field(
+        default=None,
+        description='URL da réplica de leitura (endpoints GET somente leitura)'
+    )
+    READ_YOUR_WRITES_SECONDS: int = Field(
+        default=5,
+        description="Janela em que as leituras de um cliente vão ao primário após uma escrita (cookie/header)"
+    )
+    DB_STATEMENT_CACHE_MODE: Literal['auto', 'direct', 'pooler', 'disabled'] = Field(
+        default='auto',
+        description="Cache de prepared statements do asyncpg: 'direct' liga o cache, 'pooler' usa nomes "
+                    "seguros para PgBouncer em modo transação, 'auto' detecta pela URL"
+    )
+    DB_STATEMENT_CACHE_SIZE: int = Field(default=100, description="Statements em cache por conexão (modo direct)")
+    DB_POOLER_PORTS: List[int] = Field(default=[6432, 6543], description="Portas tratadas como pooler no modo auto")
+    DB_POOL_WARMUP_CONNECTIONS: int = Field(
+        default=5,
+        description="Conexões abertas por engine no startup, antes de reportar pronto (0 desliga, mas o banco ainda é verificado; limitado ao pool_size)"
+    )
+    DB_WARMUP_TIMEOUT_SECONDS: int = Field(
+        default=30,
+        description="Tempo tentando aquecer os pools a cada retry_interval; depois disso as falhas viram erro e as tentativas se espaçam (o processo só fica pronto com o banco acessível)"
+    )
+    DB_POOLER_PREPARED_CACHE_SIZE: int = Field(
+        default=0,
+        description="Cache do SQLAlchemy atrás do pooler (>0 apenas se o pooler suportar prepared statements)"
+    )
 
     # AWS S3
     AWS_ACCESS_KEY_ID: Optional[str] = Field(default=None, description="AWS Access Key ID")
@@ -47,6 +91,107 @@ class Settings(BaseSettings):
     # Storage Provider (s3 ou gcs)
     STORAGE_PROVIDER: str = Field(default="gcs", description="Provedor de storage: 's3' ou 'gcs'")
 
+    # Storage assíncrono (SDKs síncronos rodando num executor dedicado)
+    STORAGE_EXECUTOR_WORKERS: int = Field(
+        default=16,
+        description="Threads do executor de storage (também o máximo de chamadas ao SDK em andamento)"
+    )
+    STORAGE_PART_SIZE_BYTES: int = Field(
+        default=8 * 1024 * 1024,
+        description="Tamanho das partes lidas/enviadas em uploads e hashes (mínimo 5 MiB, exigência do S3)"
+    )
+    STORAGE_MULTIPART_THRESHOLD_BYTES: int = Field(
+        default=8 * 1024 * 1024,
+        description="Arquivos a partir deste tamanho usam multipart (S3) ou upload resumable (GCS)"
+    )
+    STORAGE_DOWNLOAD_CHUNK_BYTES: int = Field(
+        default=1024 * 1024,
+        description="Tamanho dos pedaços lidos do storage e enviados ao cliente em downloads por streaming"
+    )
+    SIGNED_URL_CACHE_ENABLED: bool = Field(default=True, description="Habilita o cache em memória de URLs pré-assinadas")
+    SIGNED_URL_CACHE_MAXSIZE: int = Field(default=10000, description="Número máximo de URLs pré-assinadas em cache (LRU)")
+    SIGNED_URL_TTL_SECONDS: int = Field(
+        default=3600,
+        description="Validade mínima restante de toda URL pré-assinada entregue"
+    )
+    SIGNED_URL_BUCKET_SECONDS: int = Field(
+        default=900,
+        description="Janela de expiração: URLs assinadas na mesma janela são reaproveitadas e expiram juntas"
+    )
+    STORAGE_UPLOAD_TIMEOUT_SECONDS: float = Field(default=120.0, description="Timeout de upload")
+    STORAGE_DOWNLOAD_TIMEOUT_SECONDS: float = Field(default=60.0, description="Timeout de download")
+    STORAGE_DELETE_TIMEOUT_SECONDS: float = Field(default=10.0, description="Timeout de remoção")
+    STORAGE_SIGN_TIMEOUT_SECONDS: float = Field(default=5.0, description="Timeout da geração de URL assinada")
+    STORAGE_METADATA_TIMEOUT_SECONDS: float = Field(
+        default=10.0,
+        description="Timeout das demais operações (existência, metadados, listagem, cópia)"
+    )
+    STORAGE_UNREFERENCED_TTL_HOURS: int = Field(
+        default=24,
+        description="Horas até um upload deduplicado nunca vinculado (sem referências) ser coletado"
+    )
+    STORAGE_GC_INTERVAL_SECONDS: int = Field(
+        default=3600,
+        description="Intervalo da coleta de uploads sem referências (0 desliga)"
+    )
+
+    # Profiler de queries por requisição
+    QUERY_PROFILER_ENABLED: bool = Field(default=True, description="Conta statements e tempo de banco por requisição (Server-Timing)")
+    QUERY_PROFILER_N_PLUS_ONE_THRESHOLD: int = Field(
+        default=5,
+        description="Repetições do mesmo statement numa requisição para logar possível N+1"
+    )
+
+    # Log de queries lentas
+    SLOW_QUERY_THRESHOLD_MS: int = Field(default=500, description="Statements acima deste tempo são logados (0 desliga)")
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = Field(
+        default=0.05,
+        description="Fração dos SELECTs lentos reexecutados com EXPLAIN (ANALYZE, BUFFERS)"
+    )
+    SLOW_QUERY_EXPLAIN_TIMEOUT_MS: int = Field(default=10000, description="statement_timeout da conexão de EXPLAIN")
+    SLOW_QUERY_MAX_PLANS: int = Field(default=100, description="Planos capturados mantidos em memória")
+
+    # Cache de queries de repositório (read-through, invalidado por tags)
+    QUERY_CACHE_ENABLED: bool = Field(default=False, description="Habilita o cache de leituras de repositório")
+    QUERY_CACHE_MAXSIZE: int = Field(default=10000, description="Entradas na camada local (LRU)")
+    QUERY_CACHE_LOCAL_TTL_SECONDS: int = Field(
+        default=5,
+        description="TTL da camada local; limita a defasagem entre workers"
+    )
+    QUERY_CACHE_SHARED_TTL_SECONDS: int = Field(default=300, description="TTL da camada compartilhada")
+    QUERY_CACHE_REDIS_URL: Optional[str] = Field(
+        default=None,
+        description="Redis da camada compartilhada (requer o pacote 'redis'; None = só camada local)"
+    )
+
+    # Contadores desnormalizados dos quadros Kanban
+    KANBAN_COUNTER_SHARDS: int = Field(
+        default=0,
+        description="Shards por contador de quadro (0 = UPDATE atômico direto na linha do quadro)"
+    )
+    KANBAN_COUNTER_FOLD_SECONDS: int = Field(default=10, description="Intervalo do fold dos shards nos quadros (0 desliga)")
+    KANBAN_COUNTER_RECONCILE_SECONDS: int = Field(
+        default=3600,
+        description="Intervalo da reconciliação de columns_count a partir de kanban_columns (0 desliga)"
+    )
+
+    # Tabelas particionadas por mês (skill_usage_logs)
+    PARTITION_MONTHS_AHEAD: int = Field(default=3, description="Meses futuros com partição já criada")
+    PARTITION_MAINTENANCE_SECONDS: int = Field(
+        default=21600,
+        description="Intervalo da manutenção das partições: criação antecipada e retenção (0 desliga)"
+    )
+    SKILL_USAGE_LOG_RETENTION_MONTHS: int = Field(
+        default=12,
+        description="Meses de skill_usage_logs mantidos além do atual; partições mais antigas são removidas (0 = guarda tudo)"
+    )
+
+    # Métricas internas
+    INTERNAL_METRICS_TOKEN: Optional[str] = Field(
+        default=None,
+        description="Token exigido no header X-Metrics-Token para /api/internal/* (None = endpoints desativados)"
+    )
+
     #Log
     LOG_LEVEL: Literal['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'] = Field(
         default='INFO',
@@ -0,0 +1,225 @@
+"""
+Index advisor: sugere índices a partir das estatísticas do Postgres.
+
+Lê, do banco apontado por `--url` (padrão: POSTGRES_URL):
+
+    - pg_stat_statements: statements mais caros (tempo total); os predicados
+      do WHERE e o ORDER BY de cada um viram um índice candidato
+      (colunas de igualdade primeiro, depois a de intervalo/ordenação)
+    - pg_stat_user_tables: tabelas com muitos seq scans sobre muitas linhas
+    - pg_index / pg_stat_user_indexes: índices existentes (candidatos já
+      cobertos por um prefixo são descartados) e índices nunca usados
+
+É uma heurística sobre o SQL gerado pelo SQLAlchemy (colunas qualificadas por
+tabela/alias): confira o plano com EXPLAIN antes de aplicar. As sugestões saem
+como `CREATE INDEX CONCURRENTLY`, prontas para uma migration no estilo de
+`c7d2f4a81e36_add_composite_and_partial_indexes`.
+
+Requer a extensão pg_stat_statements (Postgres 13+) para as sugestões por
+statement; sem ela, só as seções de tabelas e índices são geradas.
+
+Uso (a partir de backend/):
+    python -m tools.index_advisor
+    python -m tools.index_advisor --top 100 --min-rows 5000
+"""
+import argparse
+import asyncio
+import re
+from dataclasses import dataclass, field
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from settings import settings
+
+MAX_IDENTIFIER = 63
+
+_FROM_ALIAS = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(?!ON\b|WHERE\b|JOIN\b|LEFT\b|INNER\b)(\w+))?", re.IGNORECASE)
+_PREDICATE = re.compile(
+    r"\b(\w+)\.(\w+)\s*(=\s*ANY\b|<>|!=|<=|>=|=|<|>|\bIN\b|\bIS\b|\bBETWEEN\b|\bLIKE\b|\bILIKE\b)",
+    re.IGNORECASE,
+)
+_COLUMN = re.compile(r"\b(\w+)\.(\w+)\b")
+_WHERE = re.compile(r"\bWHERE\b(.*?)(?:\bGROUP BY\b|\bORDER BY\b|\bLIMIT\b|\bOFFSET\b|\bFOR UPDATE\b|$)", re.IGNORECASE | re.DOTALL)
+_ORDER_BY = re.compile(r"\bORDER BY\b(.*?)(?:\bLIMIT\b|\bOFFSET\b|\bFOR UPDATE\b|$)", re.IGNORECASE | re.DOTALL)
+_EQUALITY = {"=", "IN", "IS", "= ANY"}
+
+TOP_STATEMENTS = text("""
+    SELECT query, calls, total_exec_time, mean_exec_time
+    FROM pg_stat_statements
+    WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+      AND query ~* '^\\s*(SELECT|WITH|UPDATE|DELETE)'
+    ORDER BY total_exec_time DESC
+    LIMIT :top
+""")
+
+TABLE_STATS = text("""
+    SELECT relname, seq_scan, seq_tup_read, coalesce(idx_scan, 0) AS idx_scan, n_live_tup
+    FROM pg_stat_user_tables
+    WHERE schemaname = current_schema()
+""")
+
+EXISTING_INDEXES = text("""
+    SELECT t.relname AS table_name,
+           i.relname AS index_name,
+           array_agg(a.attname ORDER BY k.n) AS columns,
+           ix.indisunique OR ix.indisprimary AS is_constraint,
+           pg_get_expr(ix.indpred, ix.indrelid) AS predicate,
+           coalesce(s.idx_scan, 0) AS idx_scan,
+           pg_relation_size(i.oid) AS size_bytes
+    FROM pg_index ix
+    JOIN pg_class t ON t.oid = ix.indrelid
+    JOIN pg_class i ON i.oid = ix.indexrelid
+    JOIN pg_namespace ns ON ns.oid = t.relnamespace
+    CROSS JOIN LATERAL unnest(ix.indkey) WITH ORDINALITY AS k(attnum, n)
+    JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum = k.attnum
+    LEFT JOIN pg_stat_user_indexes s ON s.indexrelid = ix.indexrelid
+    WHERE ns.nspname = current_schema()
+    GROUP BY t.relname, i.relname, i.oid, ix.indisunique, ix.indisprimary, ix.indpred, ix.indrelid, s.idx_scan
+""")
+
+
+@dataclass
+class Predicates:
+    """Colunas de uma tabela usadas num statement."""
+
+    equality: list[str] = field(default_factory=list)
+    range: list[str] = field(default_factory=list)
+    order: list[str] = field(default_factory=list)
+
+    def candidate(self) -> tuple[str, ...]:
+        """Colunas do índice: igualdade, depois um intervalo ou as de ordenação."""
+        columns = list(self.equality)
+        tail = self.range[:1] if self.range else self.order
+        columns += [column for column in tail if column not in columns]
+        return tuple(columns)
+
+
+@dataclass
+class Suggestion:
+    table: str
+    columns: tuple[str, ...]
+    calls: int = 0
+    total_ms: float = 0.0
+    examples: list[str] = field(default_factory=list)
+
+    @property
+    def name(self) -> str:
+        return f"ix_{self.table}_{'_'.join(self.columns)}"[:MAX_IDENTIFIER]
+
+    def ddl(self) -> str:
+        return f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {self.name} ON {self.table} ({', '.join(self.columns)});"
+
+
+def _add(items: list[str], value: str) -> None:
+    if value not in items:
+        items.append(value)
+
+
+def extract_predicates(statement: str) -> dict[str, Predicates]:
+    """Colunas filtradas/ordenadas por tabela (aliases resolvidos pelo FROM/JOIN)."""
+    aliases = {}
+    for table, alias in _FROM_ALIAS.findall(statement):
+        aliases[table] = table
+        if alias:
+            aliases[alias] = table
+
+    result: dict[str, Predicates] = {}
+
+    def predicates_for(qualifier: str):
+        table = aliases.get(qualifier)
+        return result.setdefault(table, Predicates()) if table else None
+
+    for where in _WHERE.findall(statement):
+        for qualifier, column, operator in _PREDICATE.findall(where):
+            predicates = predicates_for(qualifier)
+            if predicates is None:
+                continue
+            operator = " ".join(operator.upper().split())
+            _add(predicates.equality if operator in _EQUALITY else predicates.range, column)
+    for order in _ORDER_BY.findall(statement):
+        for qualifier, column in _COLUMN.findall(order):
+            predicates = predicates_for(qualifier)
+            if predicates is not None:
+                _add(predicates.order, column)
+
+    for predicates in result.values():
+        predicates.range = [column for column in predicates.range if column not in predicates.equality]
+        predicates.order = [column for column in predicates.order if column not in predicates.equality]
+    return {table: predicates for table, predicates in result.items() if predicates.equality or predicates.range}
+
+
+def is_covered(columns: tuple[str, ...], existing: list[tuple[str, ...]]) -> bool:
+    """Um índice existente (não parcial) começa pelas mesmas colunas?"""
+    return any(index[: len(columns)] == columns for index in existing)
+
+
+def _shorten(statement: str, size: int = 160) -> str:
+    flat = " ".join(statement.split())
+    return flat if len(flat) <= size else f"{flat[:size]}..."
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=settings.POSTGRES_URL)
+    parser.add_argument("--top", type=int, default=50, help="Statements mais caros analisados")
+    parser.add_argument("--min-rows", type=int, default=1000, help="Ignora tabelas menores que isto")
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.url)
+    try:
+        async with engine.connect() as conn:
+            tables = {row.relname: row for row in (await conn.execute(TABLE_STATS)).all()}
+            indexes = (await conn.execute(EXISTING_INDEXES)).all()
+            has_statements = (
+                await conn.scalar(text("SELECT count(*) FROM pg_extension WHERE extname = 'pg_stat_statements'"))
+            ) > 0
+            statements = (await conn.execute(TOP_STATEMENTS, {"top": args.top})).all() if has_statements else []
+    finally:
+        await engine.dispose()
+
+    existing: dict[str, list[tuple[str, ...]]] = {}
+    for index in indexes:
+        if index.predicate is None:
+            existing.setdefault(index.table_name, []).append(tuple(index.columns))
+
+    print("== Tabelas com seq scans frequentes ==")
+    for row in sorted(tables.values(), key=lambda row: row.seq_tup_read, reverse=True):
+        if row.n_live_tup < args.min_rows or row.seq_scan <= row.idx_scan:
+            continue
+        print(
+            f"{row.relname:<28} seq_scan={row.seq_scan:<8} idx_scan={row.idx_scan:<8} "
+            f"linhas/seq_scan={row.seq_tup_read // max(row.seq_scan, 1):<10} linhas={row.n_live_tup}"
+        )
+
+    print("\n== Índices sugeridos ==")
+    if not has_statements:
+        print("pg_stat_statements não está instalada (CREATE EXTENSION pg_stat_statements)")
+    suggestions: dict[tuple[str, tuple[str, ...]], Suggestion] = {}
+    for row in statements:
+        for table, predicates in extract_predicates(row.query).items():
+            stats = tables.get(table)
+            columns = predicates.candidate()
+            if not columns or stats is None or stats.n_live_tup < args.min_rows:
+                continue
+            if is_covered(columns, existing.get(table, [])):
+                continue
+            suggestion = suggestions.setdefault((table, columns), Suggestion(table, columns))
+            suggestion.calls += row.calls
+            suggestion.total_ms += row.total_exec_time
+            if len(suggestion.examples) < 2:
+                suggestion.examples.append(_shorten(row.query))
+    for suggestion in sorted(suggestions.values(), key=lambda s: s.total_ms, reverse=True):
+        print(f"-- {suggestion.calls} chamadas, {suggestion.total_ms:.0f} ms no total")
+        for example in suggestion.examples:
+            print(f"--   {example}")
+        print(suggestion.ddl())
+
+    print("\n== Índices nunca usados (desde o último reset das estatísticas) ==")
+    for index in sorted(indexes, key=lambda index: index.size_bytes, reverse=True):
+        if index.idx_scan == 0 and not index.is_constraint:
+            print(f"{index.index_name:<52} {index.table_name:<24} {index.size_bytes // 1024} KiB")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())